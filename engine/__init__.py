@@ -6,6 +6,12 @@ from engine.move_generator import MoveGenerator
 from engine.game_event import GameEvent
 from engine.game_event_notifier import GameEventNotifier
 from engine.move import Move
+from engine.move_record import MoveRecord
+from engine.bitboard import Bitboard
+from engine.bitboard_move_generator import BitboardMoveGenerator
+from engine.transposition_table import TranspositionTable
+from engine.attack_map import AttackMap
 
 __all__ = ['ChessGame', 'Board', 'GameEngine', 'GameStatus', 'MoveGenerator', 'GameEvent',
-           'GameEventNotifier', 'Move']
+           'GameEventNotifier', 'Move', 'MoveRecord',
+           'Bitboard', 'BitboardMoveGenerator', 'TranspositionTable', 'AttackMap']
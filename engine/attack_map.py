@@ -0,0 +1,136 @@
+from engine.bitboard import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, WHITE, BLACK, rook_attacks, bishop_attacks, \
+    squares
+from pieces.piece import LINEAR_DIRECTIONS, DIAGONAL_DIRECTIONS
+from utils.type import PieceType, TeamType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from engine import Board
+
+
+def is_square_attacked(board: 'Board', x: int, y: int, team: TeamType) -> bool:
+    """
+    Checks if a square is attacked by a team, looking outwards from the square for attackers.
+
+    This answers a single question about a position without building its attack map, which is cheaper for
+    positions that are only asked once (e.g. the King safety test after a trial move).
+
+    Args:
+        board (Board): The chess board.
+        x (int): The x-coordinate of the square.
+        y (int): The y-coordinate of the square.
+        team (TeamType): The attacking team.
+
+    Returns:
+        bool: True if a piece of the team attacks the square, False otherwise.
+    """
+    square = y * 8 + x
+    for target in squares(KNIGHT_ATTACKS[square]):
+        piece = board.piece_at(target % 8, target // 8)
+        if piece is not None and piece.team == team and piece.type == PieceType.KNIGHT:
+            return True
+    for target in squares(KING_ATTACKS[square]):
+        piece = board.piece_at(target % 8, target // 8)
+        if piece is not None and piece.team == team and piece.type == PieceType.KING:
+            return True
+
+    # A pawn attacks the square from the square its own capture would come from, one rank behind
+    pawn_y = y + 1 if team == TeamType.ALLY else y - 1
+    for pawn_x in (x - 1, x + 1):
+        piece = board.piece_at(pawn_x, pawn_y)
+        if piece is not None and piece.team == team and piece.type == PieceType.PAWN:
+            return True
+
+    for directions, slider_type in ((LINEAR_DIRECTIONS, PieceType.ROOK), (DIAGONAL_DIRECTIONS, PieceType.BISHOP)):
+        for dx, dy in directions:
+            nx, ny = x + dx, y + dy
+            while 0 <= nx < 8 and 0 <= ny < 8:
+                piece = board.piece_at(nx, ny)
+                if piece is not None:
+                    if piece.team == team and piece.type in (slider_type, PieceType.QUEEN):
+                        return True
+                    break
+                nx, ny = nx + dx, ny + dy
+    return False
+
+
+class AttackMap:
+    """
+    A class to represent the squares attacked by one team, along with how many of its pieces attack each one.
+
+    Sliding attacks pass through the enemy King, as if it wasn't on the board. A King can't escape a slider
+    by stepping back along the slider's line, so this makes the map answer King move legality as well as check
+    and castling legality: a square is safe for the enemy King if and only if it isn't attacked.
+
+    Attributes:
+        team (TeamType): The attacking team.
+        attacked (int): The mask of attacked squares (bit ``y * 8 + x``).
+        counts (list[int]): The number of pieces attacking each square, indexed by ``y * 8 + x``.
+    """
+
+    def __init__(self, board: 'Board', team: TeamType):
+        """
+        Computes the attack map of a team on the given board.
+
+        Args:
+            board (Board): The chess board.
+            team (TeamType): The attacking team.
+        """
+        self.team = team
+        self.attacked = 0
+        self.counts = [0] * 64
+
+        enemy_king = board.get_king(TeamType.OPPONENT if team == TeamType.ALLY else TeamType.ALLY)
+        occupied = 0
+        for piece in board.pieces:
+            if piece is not enemy_king:
+                occupied |= 1 << (piece.y * 8 + piece.x)
+
+        pawn_attacks = PAWN_ATTACKS[WHITE if team == TeamType.ALLY else BLACK]
+        counts = self.counts
+        for piece in board.pieces:
+            if piece.team != team:
+                continue
+            square = piece.y * 8 + piece.x
+            piece_type = piece.type
+            if piece_type == PieceType.PAWN:
+                mask = pawn_attacks[square]
+            elif piece_type == PieceType.KNIGHT:
+                mask = KNIGHT_ATTACKS[square]
+            elif piece_type == PieceType.BISHOP:
+                mask = bishop_attacks(square, occupied)
+            elif piece_type == PieceType.ROOK:
+                mask = rook_attacks(square, occupied)
+            elif piece_type == PieceType.QUEEN:
+                mask = bishop_attacks(square, occupied) | rook_attacks(square, occupied)
+            else:
+                mask = KING_ATTACKS[square]
+            self.attacked |= mask
+            for target in squares(mask):
+                counts[target] += 1
+
+    def is_attacked(self, x: int, y: int) -> bool:
+        """
+        Checks if a square is attacked by the team.
+
+        Args:
+            x (int): The x-coordinate of the square.
+            y (int): The y-coordinate of the square.
+
+        Returns:
+            bool: True if at least one piece of the team attacks the square, False otherwise.
+        """
+        return bool(self.attacked >> (y * 8 + x) & 1)
+
+    def attackers(self, x: int, y: int) -> int:
+        """
+        Returns how many pieces of the team attack a square.
+
+        Args:
+            x (int): The x-coordinate of the square.
+            y (int): The y-coordinate of the square.
+
+        Returns:
+            int: The number of attacking pieces.
+        """
+        return self.counts[y * 8 + x]
@@ -0,0 +1,397 @@
+from pieces import Piece, Pawn, King, Rook
+from utils.type import PieceType, TeamType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from engine import ChessGame, Board
+
+# Squares are indexed the same way as ``Board`` does it: ``y * 8 + x``, so square 0 is a8 and square 63 is h1.
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+PIECE_KINDS = {
+    PieceType.PAWN: PAWN,
+    PieceType.KNIGHT: KNIGHT,
+    PieceType.BISHOP: BISHOP,
+    PieceType.ROOK: ROOK,
+    PieceType.QUEEN: QUEEN,
+    PieceType.KING: KING
+}
+"""Maps each PieceType to its index within a color's six piece sets."""
+
+WHITE_KING_SIDE, WHITE_QUEEN_SIDE, BLACK_KING_SIDE, BLACK_QUEEN_SIDE = 1, 2, 4, 8
+"""Castling right flags, in the same order as the FEN castling field (KQkq)."""
+
+
+def _leaper_attacks(offsets: tuple[tuple[int, int], ...]) -> list[int]:
+    """
+    Builds the attack masks of a piece that jumps by fixed offsets (knight, king) from every square.
+
+    Args:
+        offsets (tuple[tuple[int, int], ...]): The (dx, dy) jumps of the piece.
+
+    Returns:
+        list[int]: A 64-entry list of attack masks.
+    """
+    table = []
+    for square in range(64):
+        x, y = square % 8, square // 8
+        mask = 0
+        for dx, dy in offsets:
+            if 0 <= x + dx < 8 and 0 <= y + dy < 8:
+                mask |= 1 << ((y + dy) * 8 + x + dx)
+        table.append(mask)
+    return table
+
+
+KNIGHT_ATTACKS = _leaper_attacks(((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)))
+KING_ATTACKS = _leaper_attacks(((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)))
+PAWN_ATTACKS = (_leaper_attacks(((-1, -1), (1, -1))),  # White pawns capture towards y = 0
+                _leaper_attacks(((-1, 1), (1, 1))))  # Black pawns capture towards y = 7
+
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+"""The (dx, dy) steps of the sliding pieces. The first four are linear, the last four diagonal."""
+
+LINEAR, DIAGONAL = (0, 1, 2, 3), (4, 5, 6, 7)
+POSITIVE = tuple(dy * 8 + dx > 0 for dx, dy in DIRECTIONS)
+"""Whether each direction moves towards higher square indices (decides which end of a ray is nearest)."""
+
+
+def _rays() -> list[list[int]]:
+    """
+    Builds the ray masks from every square to the edge of the board, in every sliding direction.
+
+    Returns:
+        list[list[int]]: ``rays[direction][square]`` masks.
+    """
+    rays = []
+    for dx, dy in DIRECTIONS:
+        table = []
+        for square in range(64):
+            x, y = square % 8 + dx, square // 8 + dy
+            mask = 0
+            while 0 <= x < 8 and 0 <= y < 8:
+                mask |= 1 << (y * 8 + x)
+                x += dx
+                y += dy
+            table.append(mask)
+        rays.append(table)
+    return rays
+
+
+RAYS = _rays()
+
+
+def _between() -> list[list[int]]:
+    """
+    Builds the masks of the squares strictly between every two squares on a common line.
+
+    Returns:
+        list[list[int]]: ``between[from_square][to_square]`` masks, empty if the squares don't share a line.
+    """
+    between = [[0] * 64 for _ in range(64)]
+    for direction in range(len(DIRECTIONS)):
+        for square in range(64):
+            ray = RAYS[direction][square]
+            for target in squares(ray):
+                # The ray from the square, minus the ray beyond the target and the target itself
+                between[square][target] = ray & ~RAYS[direction][target] & ~(1 << target)
+    return between
+
+
+def ray_attacks(square: int, occupied: int, direction: int) -> int:
+    """
+    Computes the squares attacked along one ray, up to and including the first occupied square.
+
+    Args:
+        square (int): The square the ray starts from.
+        occupied (int): The mask of occupied squares.
+        direction (int): The index of the direction in ``DIRECTIONS``.
+
+    Returns:
+        int: The mask of attacked squares.
+    """
+    ray = RAYS[direction][square]
+    blockers = ray & occupied
+    if blockers:
+        if POSITIVE[direction]:
+            blocker = (blockers & -blockers).bit_length() - 1
+        else:
+            blocker = blockers.bit_length() - 1
+        ray ^= RAYS[direction][blocker]
+    return ray
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    """Returns the mask of squares attacked by a rook on the given square."""
+    return ray_attacks(square, occupied, 0) | ray_attacks(square, occupied, 1) | \
+        ray_attacks(square, occupied, 2) | ray_attacks(square, occupied, 3)
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    """Returns the mask of squares attacked by a bishop on the given square."""
+    return ray_attacks(square, occupied, 4) | ray_attacks(square, occupied, 5) | \
+        ray_attacks(square, occupied, 6) | ray_attacks(square, occupied, 7)
+
+
+def piece_attacks(color: int, kind: int, square: int, occupied: int) -> int:
+    """
+    Returns the mask of squares attacked by a piece.
+
+    Args:
+        color (int): The color of the piece (WHITE or BLACK), which only matters for pawns.
+        kind (int): The kind of the piece, e.g. KNIGHT.
+        square (int): The square index of the piece.
+        occupied (int): The occupancy that blocks sliding pieces.
+
+    Returns:
+        int: The mask of the attacked squares.
+    """
+    if kind == KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    if kind == KING:
+        return KING_ATTACKS[square]
+    if kind == PAWN:
+        return PAWN_ATTACKS[color][square]
+    if kind == BISHOP:
+        return bishop_attacks(square, occupied)
+    if kind == ROOK:
+        return rook_attacks(square, occupied)
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+def squares(mask: int):
+    """
+    Iterates over the squares set in a mask, from the lowest index to the highest.
+
+    Args:
+        mask (int): The bitboard mask.
+
+    Yields:
+        int: The index of each set square.
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+BETWEEN = _between()
+
+
+def piece_set_index(piece: Piece) -> int:
+    """
+    Returns the index of a piece's piece set, ``color * 6 + kind``.
+
+    Args:
+        piece (Piece): The piece.
+
+    Returns:
+        int: The index of the piece set.
+    """
+    return (WHITE if piece.is_white else BLACK) * 6 + PIECE_KINDS[piece.type]
+
+
+def castling_rights(board: 'Board') -> int:
+    """
+    Derives the castling rights of a position from the ``has_moved`` flags of its kings and rooks:
+    a side may castle with an unmoved rook in its corner as long as its king hasn't moved either.
+
+    Args:
+        board (Board): The chess board.
+
+    Returns:
+        int: The castling rights, as a combination of the castling right flags.
+    """
+    rights = 0
+    for flag, king_square, rook_x in ((WHITE_KING_SIDE, (4, 7), 7), (WHITE_QUEEN_SIDE, (4, 7), 0),
+                                      (BLACK_KING_SIDE, (4, 0), 7), (BLACK_QUEEN_SIDE, (4, 0), 0)):
+        king = board.piece_at(*king_square)
+        rook = board.piece_at(rook_x, king_square[1])
+        if isinstance(king, King) and not king.has_moved and king.is_white == (king_square[1] == 7) and \
+                isinstance(rook, Rook) and not rook.has_moved:
+            rights |= flag
+    return rights
+
+
+class Bitboard:
+    """
+    A class used to represent a chess position as bitboards: one 64-bit integer per piece set.
+
+    This is an alternative representation of the position held by ``Board``, used by
+    ``BitboardMoveGenerator`` to generate moves with integer bit operations instead of calling
+    methods on Piece objects.
+
+    Attributes:
+        pieces (list[int]): Twelve piece set masks, indexed by ``color * 6 + kind``.
+        occupancy (list[int]): The masks of the squares occupied by white and by black pieces.
+        white_to_move (bool): True if it is white's turn to move, False otherwise.
+        castling (int): The castling rights, as a combination of the castling right flags.
+        en_passant (int): The square a pawn can be captured "en passant" on, or -1 if there is none.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty Bitboard with white to move and no castling or en passant rights.
+        """
+        self.pieces = [0] * 12
+        self.occupancy = [0, 0]
+        self.white_to_move = True
+        self.castling = 0
+        self.en_passant = -1
+
+    @classmethod
+    def from_game(cls, chess_game: 'ChessGame', team: TeamType) -> 'Bitboard':
+        """
+        Builds the bitboards of a chess game's current position.
+
+        The piece sets are copied from the ones the board keeps up to date as pieces move. Castling rights are
+        derived from the ``has_moved`` flags of the kings and rooks, and the en passant square from the
+        engine's last move, exactly as the Piece classes decide them.
+
+        Args:
+            chess_game (ChessGame): The chess game being played.
+            team (TeamType): The team to move.
+
+        Returns:
+            Bitboard: The bitboards of the position.
+        """
+        bitboard = cls()
+        board = chess_game.board
+        pieces = bitboard.pieces = list(board.piece_sets)
+        bitboard.occupancy = [pieces[0] | pieces[1] | pieces[2] | pieces[3] | pieces[4] | pieces[5],
+                              pieces[6] | pieces[7] | pieces[8] | pieces[9] | pieces[10] | pieces[11]]
+
+        white_team = team == TeamType.ALLY
+        bitboard.white_to_move = white_team
+
+        bitboard.castling = castling_rights(board)
+
+        last_piece, last_start, last_end = chess_game.engine.last_move
+        if isinstance(last_piece, Pawn) and last_piece.is_white != white_team and \
+                abs(last_end[1] - last_start[1]) == 2:
+            bitboard.en_passant = (last_start[1] + last_end[1]) // 2 * 8 + last_end[0]
+        return bitboard
+
+    @property
+    def occupied(self) -> int:
+        """Returns the mask of all occupied squares."""
+        return self.occupancy[WHITE] | self.occupancy[BLACK]
+
+    def piece_on(self, square: int) -> tuple[int, int] or None:
+        """
+        Returns the piece standing on a square.
+
+        Args:
+            square (int): The square index.
+
+        Returns:
+            tuple[int, int] or None: The (color, kind) of the piece, or None if the square is empty.
+        """
+        bit = 1 << square
+        for index, mask in enumerate(self.pieces):
+            if mask & bit:
+                return divmod(index, 6)
+        return None
+
+    def king_square(self, color: int) -> int:
+        """
+        Returns the square of a color's king.
+
+        Args:
+            color (int): WHITE or BLACK.
+
+        Returns:
+            int: The square index of the king, or -1 if there is no king.
+        """
+        return self.pieces[color * 6 + KING].bit_length() - 1
+
+    def attackers(self, square: int, by_color: int, occupied: int = None) -> int:
+        """
+        Finds the pieces of the given color attacking a square.
+
+        Args:
+            square (int): The square index.
+            by_color (int): The color of the attacking pieces (WHITE or BLACK).
+            occupied (int): The occupancy to use for sliding attacks. Defaults to the current occupancy.
+
+        Returns:
+            int: The mask of the squares of the attacking pieces.
+        """
+        if occupied is None:
+            occupied = self.occupied
+        pieces = self.pieces
+        them = by_color * 6
+        return KNIGHT_ATTACKS[square] & pieces[them + KNIGHT] | \
+            KING_ATTACKS[square] & pieces[them + KING] | \
+            PAWN_ATTACKS[1 - by_color][square] & pieces[them + PAWN] | \
+            bishop_attacks(square, occupied) & (pieces[them + BISHOP] | pieces[them + QUEEN]) | \
+            rook_attacks(square, occupied) & (pieces[them + ROOK] | pieces[them + QUEEN])
+
+    def pins(self, color: int) -> dict[int, int]:
+        """
+        Finds the pieces of the given color pinned to their king.
+
+        Args:
+            color (int): WHITE or BLACK.
+
+        Returns:
+            dict[int, int]: The mask of the squares each pinned piece may still move to (the squares between its
+            king and the pinning piece, and the pinning piece's own square), keyed by the pinned piece's square.
+        """
+        king_square = self.king_square(color)
+        if king_square < 0:
+            return {}
+        pieces = self.pieces
+        them = (1 - color) * 6
+        own = self.occupancy[color]
+        enemy = self.occupancy[1 - color]
+        # Enemy sliders that would attack the king if none of its own pieces were in the way
+        snipers = rook_attacks(king_square, enemy) & (pieces[them + ROOK] | pieces[them + QUEEN]) | \
+            bishop_attacks(king_square, enemy) & (pieces[them + BISHOP] | pieces[them + QUEEN])
+        pins = {}
+        for sniper in squares(snipers):
+            line = BETWEEN[king_square][sniper]
+            blockers = line & own
+            if blockers and not blockers & (blockers - 1):  # Exactly one of the king's own pieces in the way
+                pins[blockers.bit_length() - 1] = line | 1 << sniper
+        return pins
+
+    def is_square_attacked(self, square: int, by_color: int, occupied: int = None, pieces: list[int] = None) -> bool:
+        """
+        Checks if a square is attacked by any piece of the given color.
+
+        Args:
+            square (int): The square index.
+            by_color (int): The color of the attacking pieces (WHITE or BLACK).
+            occupied (int): The occupancy to use for sliding attacks. Defaults to the current occupancy.
+            pieces (list[int]): The piece sets to use. Defaults to the current piece sets.
+
+        Returns:
+            bool: True if the square is attacked, False otherwise.
+        """
+        if occupied is None:
+            occupied = self.occupied
+        if pieces is None:
+            pieces = self.pieces
+        them = by_color * 6
+        if KNIGHT_ATTACKS[square] & pieces[them + KNIGHT] or \
+                KING_ATTACKS[square] & pieces[them + KING] or \
+                PAWN_ATTACKS[1 - by_color][square] & pieces[them + PAWN]:
+            return True
+        if bishop_attacks(square, occupied) & (pieces[them + BISHOP] | pieces[them + QUEEN]):
+            return True
+        return bool(rook_attacks(square, occupied) & (pieces[them + ROOK] | pieces[them + QUEEN]))
+
+    def is_in_check(self, color: int) -> bool:
+        """
+        Checks if the king of the given color is attacked.
+
+        Args:
+            color (int): WHITE or BLACK.
+
+        Returns:
+            bool: True if the king is in check, False otherwise.
+        """
+        king_square = self.king_square(color)
+        return king_square >= 0 and self.is_square_attacked(king_square, 1 - color)
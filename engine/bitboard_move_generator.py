@@ -0,0 +1,154 @@
+from engine.bitboard import (Bitboard, WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
+                             WHITE_KING_SIDE, WHITE_QUEEN_SIDE, BLACK_KING_SIDE, BLACK_QUEEN_SIDE,
+                             PAWN_ATTACKS, BETWEEN, piece_attacks, squares)
+
+# (castling flag, king square, squares that must be empty, squares the king crosses, king target square)
+CASTLING_MOVES = {
+    WHITE: ((WHITE_KING_SIDE, 60, (61, 62), (61, 62), 62),
+            (WHITE_QUEEN_SIDE, 60, (59, 58, 57), (59, 58), 58)),
+    BLACK: ((BLACK_KING_SIDE, 4, (5, 6), (5, 6), 6),
+            (BLACK_QUEEN_SIDE, 4, (3, 2, 1), (3, 2), 2))
+}
+
+
+class BitboardMoveGenerator:
+    """
+    A class to generate legal moves from a ``Bitboard`` position.
+
+    It follows the same rules as the Piece classes and ``MoveGenerator``, and produces the same moves,
+    but works on 64-bit piece set masks and precomputed attack tables instead of Piece objects.
+    Moves are (from_square, to_square) tuples of square indices (``y * 8 + x``); a promotion appears once,
+    as in ``MoveGenerator``.
+    """
+
+    def pseudo_legal_moves(self, bitboard: Bitboard) -> list[tuple[int, int]]:
+        """
+        Generates the moves of the side to move according to the movement rules of its pieces,
+        without checking whether they leave its king in check.
+
+        Args:
+            bitboard (Bitboard): The position.
+
+        Returns:
+            list[tuple[int, int]]: The (from_square, to_square) moves.
+        """
+        color = WHITE if bitboard.white_to_move else BLACK
+        us = color * 6
+        own = bitboard.occupancy[color]
+        enemy = bitboard.occupancy[1 - color]
+        occupied = own | enemy
+        pieces = bitboard.pieces
+        moves = []
+
+        # Pawns
+        step, start_rank = (-8, 6) if color == WHITE else (8, 1)
+        for square in squares(pieces[us + PAWN]):
+            target = square + step
+            if 0 <= target < 64 and not occupied >> target & 1:
+                moves.append((square, target))
+                double = target + step
+                if square // 8 == start_rank and not occupied >> double & 1:
+                    moves.append((square, double))
+            targets = PAWN_ATTACKS[color][square] & enemy
+            if bitboard.en_passant >= 0:
+                targets |= PAWN_ATTACKS[color][square] & (1 << bitboard.en_passant)
+            for target in squares(targets):
+                moves.append((square, target))
+
+        # Knights, bishops, rooks, queens and king
+        for kind in (KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            for square in squares(pieces[us + kind]):
+                targets = piece_attacks(color, kind, square, occupied) & ~own
+                moves.extend((square, target) for target in squares(targets))
+
+        # Castling
+        for flag, king_square, empty, crossed, target in CASTLING_MOVES[color]:
+            if bitboard.castling & flag and pieces[us + KING] >> king_square & 1 and \
+                    not any(occupied >> square & 1 for square in empty) and \
+                    not bitboard.is_square_attacked(king_square, 1 - color) and \
+                    not any(bitboard.is_square_attacked(square, 1 - color) for square in crossed):
+                moves.append((king_square, target))
+        return moves
+
+    def legal_moves(self, bitboard: Bitboard) -> list[tuple[int, int]]:
+        """
+        Generates the legal moves of the side to move.
+
+        King safety is worked out once for the position, as ``MoveGenerator`` does it: the pieces giving check
+        and the pieces pinned to the king. A king move must land on a square the enemy doesn't attack, a move
+        out of check must capture the checking piece or block its line, and a pinned piece may only move along
+        its pin. Only en passant captures, which take a piece off a square the capturing pawn doesn't move to,
+        are still verified with ``is_legal``.
+
+        Args:
+            bitboard (Bitboard): The position.
+
+        Returns:
+            list[tuple[int, int]]: The (from_square, to_square) moves.
+        """
+        moves = self.pseudo_legal_moves(bitboard)
+        color = WHITE if bitboard.white_to_move else BLACK
+        king_square = bitboard.king_square(color)
+        if king_square < 0:
+            return moves
+
+        checkers = bitboard.attackers(king_square, 1 - color)
+        if not checkers:
+            check_mask = ~0
+        elif checkers & (checkers - 1):
+            check_mask = 0  # Only the king can answer a double check
+        else:
+            checker = checkers.bit_length() - 1
+            check_mask = checkers | BETWEEN[king_square][checker]
+        pins = bitboard.pins(color)
+        pawns = bitboard.pieces[color * 6 + PAWN]
+        # The king doesn't shield the squares behind it from the sliders attacking it
+        occupied_without_king = bitboard.occupied & ~(1 << king_square)
+
+        legal_moves = []
+        for from_square, to_square in moves:
+            if from_square == king_square:
+                legal = not bitboard.is_square_attacked(to_square, 1 - color, occupied=occupied_without_king)
+            elif to_square == bitboard.en_passant and pawns >> from_square & 1:
+                legal = self.is_legal(bitboard, from_square, to_square)
+            else:
+                legal = check_mask >> to_square & 1 and (from_square not in pins or pins[from_square] >> to_square & 1)
+            if legal:
+                legal_moves.append((from_square, to_square))
+        return legal_moves
+
+    @staticmethod
+    def is_legal(bitboard: Bitboard, from_square: int, to_square: int) -> bool:
+        """
+        Checks that a pseudo-legal move does not leave the mover's king in check.
+
+        The move is applied to copies of the piece sets, so the position itself is left unchanged.
+
+        Args:
+            bitboard (Bitboard): The position.
+            from_square (int): The square the piece moves from.
+            to_square (int): The square the piece moves to.
+
+        Returns:
+            bool: True if the move is legal, False otherwise.
+        """
+        color = WHITE if bitboard.white_to_move else BLACK
+        them = (1 - color) * 6
+        pieces = list(bitboard.pieces)
+        from_bit, to_bit = 1 << from_square, 1 << to_square
+
+        moved = next(kind for kind in range(6) if pieces[color * 6 + kind] & from_bit)
+        pieces[color * 6 + moved] ^= from_bit | to_bit
+        for kind in range(6):
+            pieces[them + kind] &= ~to_bit
+
+        # A pawn moving diagonally to the en passant square captures the pawn beside it
+        if moved == PAWN and to_square == bitboard.en_passant:
+            victim = to_square + (8 if color == WHITE else -8)
+            pieces[them + PAWN] &= ~(1 << victim)
+
+        occupied = 0
+        for mask in pieces:
+            occupied |= mask
+        king_square = pieces[color * 6 + KING].bit_length() - 1
+        return not bitboard.is_square_attacked(king_square, 1 - color, occupied=occupied, pieces=pieces)
@@ -1,5 +1,12 @@
-from utils.type import TeamType
+from utils.type import TeamType, PieceType
 from pieces import *
+from engine.zobrist import piece_key, piece_keys
+from engine.evaluation import Evaluation
+from engine.bitboard import castling_rights, piece_set_index, WHITE_KING_SIDE, WHITE_QUEEN_SIDE, BLACK_KING_SIDE, \
+    BLACK_QUEEN_SIDE
+
+FEN_PIECE_CLASSES = {'p': Pawn, 'n': Knight, 'b': Bishop, 'r': Rook, 'q': Queen, 'k': King}
+"""The piece class of each (lowercase) FEN piece letter."""
 
 
 class Board:
@@ -10,6 +17,21 @@ class Board:
         pieces (list): A list of Piece objects representing the current state of the chess board.
                        Each object stores information about the type of the piece, its location on 
                        the board, the team it belongs to, and its color.
+        _squares (list): A 64-entry index of the pieces by square (``y * 8 + x``), kept in sync with
+                         ``pieces`` so that ``piece_at`` is a constant time lookup.
+        _shadowed (list): Pieces whose square has temporarily been taken by another piece (e.g. while a
+                          capturing piece is moved onto its square, before the captured piece is removed).
+        _kings (dict): The king of each team, keyed by TeamType.
+        zobrist_key (int): The 64-bit Zobrist key of the position. The board keeps the pieces' part of the key
+                           up to date as pieces are added, removed and moved; the game engine adds the side to
+                           move, castling rights and en passant file as moves are made.
+        piece_counts (dict[tuple[bool, PieceType], int]): The number of pieces of each (is_white, PieceType) on the
+                                                          board, kept up to date as pieces are added and removed.
+        evaluation (Evaluation): The material and piece-square table evaluation of the position, kept up to
+                                 date as pieces are added, removed and moved.
+        piece_sets (list[int]): The twelve piece set masks of the bitboard backend, indexed by
+                                ``color * 6 + kind`` (see ``engine.bitboard``), kept up to date as pieces are
+                                added, removed and moved.
     """
 
     def __init__(self):
@@ -18,6 +40,13 @@ class Board:
         to populate the board with chess pieces in their starting positions.
         """
         self._pieces = []
+        self._squares = [None] * 64
+        self._shadowed = []
+        self._kings = {}
+        self.zobrist_key = 0
+        self.piece_counts = self._empty_piece_counts()
+        self.evaluation = Evaluation()
+        self.piece_sets = [0] * 12
         self._initialize_board()
 
     def __getitem__(self, index: int) -> Piece:
@@ -71,9 +100,8 @@ class Board:
             Piece or None: If there's a piece at the given position, it returns the Piece object.
                            If there's no piece at the position, it returns None.
         """
-        for piece in self.pieces:
-            if piece.x == x and piece.y == y:
-                return piece
+        if 0 <= x < 8 and 0 <= y < 8:
+            return self._squares[y * 8 + x]
         return None
 
     def get_king(self, team: TeamType) -> King:
@@ -86,18 +114,22 @@ class Board:
         Returns:
             King: The king of the given team.
         """
-        for piece in self.pieces:
-            if isinstance(piece, King) and piece.team == team:
-                return piece
+        return self._kings.get(team)
 
-    def add(self, piece: Piece):
+    def add(self, piece: Piece, index: int = None):
         """
         Adds a piece to the board.
 
         Args:
             piece (Piece): The piece to be added to the board.
+            index (int): The position in the piece list to insert the piece at. Defaults to None,
+                         which appends the piece to the end of the list.
         """
-        self.pieces.append(piece)
+        if index is None:
+            self.pieces.append(piece)
+        else:
+            self.pieces.insert(index, piece)
+        self._place(piece)
 
     def remove(self, piece: Piece):
         """
@@ -107,59 +139,189 @@ class Board:
             piece (Piece): The piece to be removed from the board.
         """
         self.pieces.remove(piece)
+        square = piece.y * 8 + piece.x
+        if self._squares[square] is piece:
+            self._squares[square] = self._unshadow(square)
+        elif piece in self._shadowed:
+            self._shadowed.remove(piece)
+        if self._kings.get(piece.team) is piece:
+            del self._kings[piece.team]
+        self.zobrist_key ^= piece_key(piece)
+        self.piece_counts[(piece.is_white, piece.type)] -= 1
+        self.evaluation.remove(piece, square)
+        self.piece_sets[piece_set_index(piece)] ^= 1 << square
+        piece._board = None
+
+    def _place(self, piece: Piece):
+        """
+        Registers a piece that has just been put on the board in the square index.
 
-    def fen(self):
+        Args:
+            piece (Piece): The piece that was put on the board.
         """
-        Returns the Forsyth-Edwards Notation (FEN) representation of the current board state.
+        piece._board = self
+        square = piece.y * 8 + piece.x
+        occupant = self._squares[square]
+        if occupant is not None and occupant is not piece:
+            self._shadowed.append(occupant)
+        self._squares[square] = piece
+        if isinstance(piece, King):
+            self._kings[piece.team] = piece
+        self.zobrist_key ^= piece_key(piece)
+        self.piece_counts[(piece.is_white, piece.type)] += 1
+        self.evaluation.add(piece, square)
+        self.piece_sets[piece_set_index(piece)] ^= 1 << square
+
+    def _relocate(self, piece: Piece, old_x: int, old_y: int):
+        """
+        Updates the square index after a piece's coordinates have changed.
+        This is called by the ``Piece.x`` and ``Piece.y`` setters.
 
-        Note: For the purposes of this method, it is assumed that the board state reflects the
-        starting position of a game. Therefore, it is always white's turn, all castling options
-        are available, there's no en passant target square, the halfmove clock is at zero,
-        and it is the first full move.
+        Args:
+            piece (Piece): The piece that moved.
+            old_x (int): The x-coordinate the piece moved from.
+            old_y (int): The y-coordinate the piece moved from.
+        """
+        old_square = old_y * 8 + old_x
+        if self._squares[old_square] is piece:
+            self._squares[old_square] = self._unshadow(old_square)
+        square = piece.y * 8 + piece.x
+        occupant = self._squares[square]
+        if occupant is not None and occupant is not piece:
+            self._shadowed.append(occupant)
+        self._squares[square] = piece
+        keys = piece_keys(piece)
+        self.zobrist_key ^= keys[old_square] ^ keys[square]
+        self.evaluation.move(piece, old_square, square)
+        self.piece_sets[piece_set_index(piece)] ^= 1 << old_square ^ 1 << square
+
+    def _unshadow(self, square: int) -> Piece or None:
+        """
+        Takes back a shadowed piece standing on the given square, if there is one.
+
+        Args:
+            square (int): The square index (``y * 8 + x``).
 
         Returns:
-            str: The FEN representation of the current board state.
+            Piece or None: The shadowed piece on the square, or None if there isn't one.
+        """
+        for index, piece in enumerate(self._shadowed):
+            if piece.y * 8 + piece.x == square:
+                return self._shadowed.pop(index)
+        return None
+
+    def placement_fen(self) -> str:
         """
-        fen_parts = []
+        Returns the piece placement field of the Forsyth-Edwards Notation (FEN) of the board, from the 8th rank
+        (y = 0) down to the 1st rank (y = 7). This is the quick way to describe just the pieces of a position.
 
-        # 1. Piece placement
-        for y in range(7, -1, -1):  # 8 to 1
+        Returns:
+            str: The piece placement, e.g. 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR'.
+        """
+        ranks = []
+        for y in range(8):
             empty_squares = 0
             fen_rank = ''
-            for x in range(8):  # a to h
-                piece = self.piece_at(x, y)
-                if piece:
-                    if empty_squares:
-                        fen_rank += str(empty_squares)
-                        empty_squares = 0
-
-                    fen_rank += piece.symbol
-                else:
+            for piece in self._squares[y * 8:y * 8 + 8]:
+                if piece is None:
                     empty_squares += 1
-
+                    continue
+                if empty_squares:
+                    fen_rank += str(empty_squares)
+                    empty_squares = 0
+                fen_rank += piece.symbol
             if empty_squares:
                 fen_rank += str(empty_squares)
+            ranks.append(fen_rank)
+        return '/'.join(ranks)
 
-            fen_parts.append(fen_rank)
-
-        fen_string = '/'.join(fen_parts)
+    def fen(self, white_to_move: bool = True, en_passant: str = '-', halfmove_clock: int = 0,
+            fullmove_number: int = 1) -> str:
+        """
+        Returns the Forsyth-Edwards Notation (FEN) representation of the current board state.
 
-        # 2. Active color
-        fen_string += ' w'  # Assuming it's always white's turn
+        The castling field is derived from the ``has_moved`` flags of the kings and rooks. The board doesn't know
+        whose turn it is, the en passant square or the clocks, so they are passed in; ``ChessGame.fen`` fills them
+        in from the live game.
 
-        # 3. Castling availability
-        fen_string += ' KQkq'  # Assuming all sides can castle
+        Args:
+            white_to_move (bool): Whether it is white's turn. Defaults to True.
+            en_passant (str): The en passant target square (e.g. 'e3'), or '-' if there is none. Defaults to '-'.
+            halfmove_clock (int): The number of plies since the last capture or pawn move. Defaults to 0.
+            fullmove_number (int): The number of the current full move. Defaults to 1.
 
-        # 4. En passant target square
-        fen_string += ' -'  # Assuming there's no en passant target square
+        Returns:
+            str: The FEN representation of the current board state.
+        """
+        rights = castling_rights(self)
+        castling = ''.join(symbol for flag, symbol in ((WHITE_KING_SIDE, 'K'), (WHITE_QUEEN_SIDE, 'Q'),
+                                                        (BLACK_KING_SIDE, 'k'), (BLACK_QUEEN_SIDE, 'q'))
+                           if rights & flag) or '-'
+        return f"{self.placement_fen()} {'w' if white_to_move else 'b'} {castling} {en_passant} " \
+               f"{halfmove_clock} {fullmove_number}"
+
+    def set_placement(self, placement: str):
+        """
+        Replaces all the pieces on the board with the ones described by the piece placement field of a FEN string.
 
-        # 5. Half-move clock
-        fen_string += ' 0'  # Assuming no half-move
+        Pawns that are off their starting rank are marked as moved; every other piece is marked as not moved
+        (``ChessGame.load_fen`` sets the flags of kings and rooks from the castling rights).
 
-        # 6. Full-move number
-        fen_string += ' 1'  # Assuming it's the first move
+        Args:
+            placement (str): The piece placement, e.g. 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR'.
 
-        return fen_string
+        Raises:
+            ValueError: If the placement is malformed.
+        """
+        ranks = placement.split('/')
+        if len(ranks) != 8:
+            raise ValueError(f"A FEN piece placement needs 8 ranks, got {len(ranks)}: '{placement}'")
+
+        pieces = []
+        for y, rank in enumerate(ranks):
+            x = 0
+            for symbol in rank:
+                if symbol.isdigit():
+                    x += int(symbol)
+                    continue
+                piece_class = FEN_PIECE_CLASSES.get(symbol.lower())
+                if piece_class is None or x >= 8:
+                    raise ValueError(f"Invalid FEN piece placement: '{placement}'")
+                is_white = symbol.isupper()
+                piece = piece_class(x=x, y=y, team=TeamType.ALLY if is_white else TeamType.OPPONENT,
+                                    is_white=is_white)
+                if isinstance(piece, Pawn):
+                    piece.has_moved = y != (6 if is_white else 1)
+                pieces.append(piece)
+                x += 1
+            if x != 8:
+                raise ValueError(f"Rank {8 - y} of the FEN piece placement doesn't have 8 squares: '{placement}'")
+
+        self._clear()
+        for piece in pieces:
+            self.add(piece)
+
+    def _clear(self):
+        """
+        Takes every piece off the board at once.
+        """
+        for piece in self._pieces:
+            piece._board = None
+        self._pieces = []
+        self._squares = [None] * 64
+        self._shadowed = []
+        self._kings = {}
+        self.zobrist_key = 0
+        self.piece_counts = self._empty_piece_counts()
+        self.evaluation = Evaluation()
+        self.piece_sets = [0] * 12
+
+    @staticmethod
+    def _empty_piece_counts() -> dict[tuple[bool, PieceType], int]:
+        """
+        Returns piece counts of an empty board: zero for every (is_white, PieceType).
+        """
+        return {(is_white, piece_type): 0 for is_white in (True, False) for piece_type in PieceType}
 
     def _initialize_board(self):
         """
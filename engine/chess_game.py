@@ -6,17 +6,23 @@ from engine.move import Move
 from pieces import Piece, Queen
 from pieces.king import King
 from pieces.pawn import Pawn
+from pieces.rook import Rook
 from players import Player
 from utils.type import TeamType, PieceType
 
 from engine.game_event_notifier import GameEventNotifier
-from engine.game_event import GameEvent
+from engine.game_event import GameEvent, GAME_OVER_EVENTS
 from engine.board import Board
 from engine.game_engine import GameEngine
 from engine.game_status import GameStatus
 from engine.move_generator import MoveGenerator
+from engine.zobrist import position_key
 
-from ui import ChessUI
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+"""The FEN of the standard starting position."""
+
+CASTLING_SQUARES = {'K': ((4, 7), (7, 7)), 'Q': ((4, 7), (0, 7)), 'k': ((4, 0), (7, 0)), 'q': ((4, 0), (0, 0))}
+"""The (x, y) squares of the king and the rook of each FEN castling right."""
 
 
 class ChessGame:
@@ -26,21 +32,41 @@ class ChessGame:
 
     Attributes:
         players (list[Player]): The list of active players.
+        headless (bool): Whether the game runs without a user interface, sound or console output.
         _board (Board): The current game board.
         _event (GameEvent): The current game event.
         _move_generator (MoveGenerator): Generator for possible moves.
         _engine (GameEngine): Engine to handle game rules.
         _status (GameStatus): The status of the current game.
+        start_fen (str): The FEN of the position the game started from.
+        move_history (list[Move]): The moves played through ``make_move`` since the game started, in order.
     """
 
-    def __init__(self):
+    def __init__(self, headless: bool = False, players: Optional[list[Player]] = None, fen: Optional[str] = None,
+                 sound: bool = True):
         """
         Initializes a Game with two players, a board, and a game engine.
         One player is human and the other is AI.
         A game event notifier is also set up for event handling.
+
+        A headless game only builds the board, engine, status and move generator: it has no user interface,
+        never loads tkinter or pygame, and doesn't print its moves. This is how the engine is run from
+        scripts, benchmarks and worker processes.
+
+        Args:
+            headless (bool): If True, the game is set up without a user interface. Defaults to False,
+                             which opens the game window and blocks until it is closed.
+            players (list[Player], optional): The white and black players, in that order. Defaults to a human
+                                              player against a computer player.
+            fen (str, optional): The position to start from, in Forsyth-Edwards Notation. Defaults to None,
+                                 which starts from the standard starting position.
+            sound (bool): Whether the user interface plays sound effects. Defaults to True. Headless games never
+                          play sound.
         """
-        self.players = [Player(name="player 1", team=TeamType.ALLY),
-                        Player(name="player 2", team=TeamType.OPPONENT, is_human=False)]
+        if players is None:
+            players = [Player(name="player 1", team=TeamType.ALLY),
+                       Player(name="player 2", team=TeamType.OPPONENT, is_human=False)]
+        self.players = players
         self.current_player = self.players[0]
         self.state = GameEvent.ONGOING
         self._board = Board()
@@ -49,9 +75,19 @@ class ChessGame:
         self._engine = GameEngine(self)
         self._status = GameStatus(self)
         self._game_event_notifier = GameEventNotifier()
+        self.start_fen = START_FEN
+        self.move_history = []
+        if fen is not None:
+            self.load_fen(fen)
 
-        self.ui = ChessUI(self)
-        self.ui.run()
+        self.headless = headless
+        self.ui = None
+        if not headless:
+            # The user interface (and with it tkinter and pygame) is only imported when it is needed
+            from ui import ChessUI
+
+            self.ui = ChessUI(self, sound=sound)
+            self.ui.run()
 
     @property
     def board(self) -> Board:
@@ -123,6 +159,106 @@ class ChessGame:
         """
         return self._status
 
+    @classmethod
+    def from_fen(cls, fen: str, players: Optional[list[Player]] = None) -> ChessGame:
+        """
+        Creates a game without a user interface, set up at the position described by a FEN string.
+
+        Args:
+            fen (str): The position in Forsyth-Edwards Notation.
+            players (list[Player], optional): The white and black players, in that order. Defaults to a human
+                                              player against a computer player.
+
+        Returns:
+            ChessGame: The chess game.
+        """
+        return cls(headless=True, players=players, fen=fen)
+
+    def load_fen(self, fen: str):
+        """
+        Replaces the position of the game with the one described by a FEN string.
+
+        Castling rights are expressed through the ``has_moved`` flags of the kings and rooks, the en passant
+        target square through the engine's last move (a pawn that has just moved two squares), and the
+        clocks through the engine's halfmove clock and fullmove number, which is how the game keeps track
+        of them. The position history used for repetitions and the move history start over from the loaded
+        position.
+
+        Args:
+            fen (str): The position in Forsyth-Edwards Notation. The clocks may be left out.
+
+        Raises:
+            ValueError: If the FEN string is malformed or describes castling rights or an en passant square
+                        that the pieces don't allow.
+        """
+        fields = fen.split()
+        if len(fields) not in (4, 6) or fields[1] not in ('w', 'b'):
+            raise ValueError(f"Invalid FEN: '{fen}'")
+        placement, active_color, castling, en_passant = fields[:4]
+        board = self.board
+        board.set_placement(placement)
+        if board.get_king(TeamType.ALLY) is None or board.get_king(TeamType.OPPONENT) is None:
+            raise ValueError(f"A FEN position needs a king on each side: '{fen}'")
+
+        # Kings and rooks that can still castle have not moved yet
+        for piece in board.pieces:
+            if isinstance(piece, (King, Rook)):
+                piece.has_moved = True
+        for right in castling.replace('-', ''):
+            king_square, rook_square = CASTLING_SQUARES.get(right, (None, None))
+            king = board.piece_at(*king_square) if king_square else None
+            rook = board.piece_at(*rook_square) if rook_square else None
+            if not isinstance(king, King) or not isinstance(rook, Rook) or \
+                    king.is_white != right.isupper() or rook.is_white != right.isupper():
+                raise ValueError(f"Invalid castling right '{right}' in FEN: '{fen}'")
+            king.has_moved = rook.has_moved = False
+
+        white_to_move = active_color == 'w'
+        self.current_player = next(player for player in self.players
+                                   if (player.team == TeamType.ALLY) == white_to_move)
+
+        # The en passant square is behind a pawn of the other side which has just moved two squares
+        last_move = Move(None, (-1, -1), (-1, -1))
+        if en_passant != '-':
+            target_rank = '6' if white_to_move else '3'
+            if len(en_passant) != 2 or en_passant[0] not in 'abcdefgh' or en_passant[1] != target_rank:
+                raise ValueError(f"Invalid en passant square '{en_passant}' in FEN: '{fen}'")
+            x, y = ord(en_passant[0]) - ord('a'), 8 - int(en_passant[1])
+            direction = 1 if white_to_move else -1
+            pawn = board.piece_at(x, y + direction)
+            if not isinstance(pawn, Pawn) or pawn.is_white == white_to_move:
+                raise ValueError(f"No pawn can be captured en passant on '{en_passant}' in FEN: '{fen}'")
+            # The pawn has just crossed the en passant square from its starting square, so both are empty
+            if board.piece_at(x, y) is not None or board.piece_at(x, y - direction) is not None:
+                raise ValueError(f"No pawn can have just moved past '{en_passant}' in FEN: '{fen}'")
+            last_move = Move(pawn, (x, y - direction), (x, y + direction))
+        self.engine.last_move = last_move
+        self.engine.halfmove_clock = int(fields[4]) if len(fields) == 6 else 0
+        self.engine.fullmove_number = int(fields[5]) if len(fields) == 6 else 1
+
+        self.state = GameEvent.ONGOING
+        self.event = None
+        self.start_fen = fen
+        self.move_history = []
+        board.zobrist_key = position_key(board, last_move, white_to_move)
+        self.status.reset()
+
+    def fen(self) -> str:
+        """
+        Returns the Forsyth-Edwards Notation (FEN) of the current position, including whose turn it is,
+        the castling rights, the en passant target square and the clocks.
+
+        Returns:
+            str: The FEN representation of the game.
+        """
+        white_to_move = self.current_player.team == TeamType.ALLY
+        en_passant = '-'
+        last_move = self.engine.last_move
+        if last_move.is_double_pawn_push and last_move.piece.is_white != white_to_move:
+            (x, start_y), (_, end_y) = last_move.start_position, last_move.end_position
+            en_passant = f"{chr(x + 97)}{8 - (start_y + end_y) // 2}"
+        return self.board.fen(white_to_move, en_passant, self.engine.halfmove_clock, self.engine.fullmove_number)
+
     def make_move(self, piece: Piece, new_x: int, new_y: int, promotion_piece: Piece = None) -> bool:
         """
         Makes a move in the game. If the move is legal and successful, the turn is passed to the other player.
@@ -151,8 +287,10 @@ class ChessGame:
 
         if move_successful:
             self.update_game_state(piece, original_x, original_y, new_x, new_y, promotion_piece)
-            print(repr(self.engine.last_move))
-            self.ui.update()  # Refresh the UI board after each move
+            self.move_history.append(self.engine.last_move)
+            if not self.headless:
+                print(repr(self.engine.last_move))
+                self.ui.update()  # Refresh the UI board after each move
 
         return move_successful
 
@@ -185,7 +323,7 @@ class ChessGame:
             is_checkmate=GameEvent.CHECKMATE in events,
             promotion=promotion_piece
         )
-        if GameEvent.CHECKMATE in events or GameEvent.STALEMATE in events:
+        if events[0] in GAME_OVER_EVENTS:
             self.state = events[0]
 
         return events
@@ -194,24 +332,68 @@ class ChessGame:
         """
         Ends the current player's turn and passes the turn to the other player.
         If the next player is an AI, the AI makes its move before the turn is passed back to the human player.
+
+        With a user interface, the AI thinks in the background (see ``ChessUI.start_ai_turn``) and the window
+        stays responsive: the move is played through ``play_ai_move`` once it is found. Without one, the AI
+        moves right away, and computer players keep taking turns until a human player is to move or the game
+        is over.
         """
-        self.current_player = self.players[1] if self.current_player == self.players[0] else self.players[0]
-        if not self.current_player.is_human:
-            move = self.current_player.ai_choose_move(self)
-
-            if move != (None, -1, -1, None):
-                cpu_piece, cpu_x, cpu_y, cpu_promotion_piece = move
-                self.make_move(piece=cpu_piece,
-                               new_x=cpu_x,
-                               new_y=cpu_y,
-                               promotion_piece=cpu_promotion_piece)
-                self.next_turn()  # switch turn back to the human player after AI makes a move
+        self.switch_player()
+        if self.current_player.is_human or self.is_game_over():
+            self.announce_result()
+        elif self.ui is not None:
+            self.ui.start_ai_turn()
+        else:
+            while self.play_ai_move(self.current_player.ai_choose_move(self)):
+                self.switch_player()
+                if self.current_player.is_human or self.is_game_over():
+                    break
+            self.announce_result()
+
+    def play_ai_move(self, move: tuple[Piece, int, int, Piece]) -> bool:
+        """
+        Plays a move chosen by a computer player.
+
+        The move may have been chosen on a copy of the game (as the user interface does, so that the computer
+        can think in the background): the piece to move is looked up on this game's board by its position.
+
+        Args:
+            move (tuple[Piece, int, int, Piece]): The move returned by ``ai_choose_move``.
+
+        Returns:
+            bool: True if the move was played, False if there was no move to play or it was illegal.
+        """
+        piece, new_x, new_y, promotion_piece = move
+        if piece is None:
+            return False
+        piece = self.board.piece_at(piece.x, piece.y)
+        return piece is not None and self.make_move(piece, new_x, new_y, promotion_piece)
+
+    def announce_result(self):
+        """
+        Prints the result of the game if it is over (except in headless games, which print nothing).
+        """
+        if self.is_game_over() and not self.headless:
+            winner = self.get_winner()
+            if winner is not None:
+                print(f"{winner.name} wins!")
             else:
-                if self.is_game_over():
-                    print(f"{self.get_winner().name} wins!")
+                print(f"Draw ({self.state.value.replace('_', ' ')})")
+
+    def switch_player(self):
+        """
+        Passes the turn to the other player, without any further turn handling.
+        """
+        self.current_player = self.players[1] if self.current_player == self.players[0] else self.players[0]
 
     def is_game_over(self) -> bool:
-        return self.state == GameEvent.CHECKMATE or self.state == GameEvent.STALEMATE
+        """
+        Checks if the game has ended, by checkmate or by any kind of draw.
+
+        Returns:
+            bool: True if the game is over, False otherwise.
+        """
+        return self.state in GAME_OVER_EVENTS
 
     def get_winner(self) -> Optional[Player]:
         """
@@ -226,7 +408,9 @@ class ChessGame:
 
     def copy(self) -> ChessGame:
         """
-        Creates a copy of the current game.
+        Creates a copy of the current game, without a user interface. The copy shares the players of the game
+        (which may hold processes, memory maps or a large transposition table), so that a player can think on
+        the copy while the game itself is left untouched.
 
         Returns:
             ChessGame: A copy of the current game.
@@ -235,11 +419,12 @@ class ChessGame:
         ui_temp = self.ui
         self.ui = None
 
-        # Copy the game
-        copied_game = copy.deepcopy(self)
+        # Copy the game, keeping the same players
+        copied_game = copy.deepcopy(self, memo={id(player): player for player in self.players})
 
         # The copied game does not have a UI object
         self.ui = ui_temp
+        copied_game.headless = True
         return copied_game
 
     def get_state(self, team: TeamType) -> list[GameEvent]:
@@ -254,12 +439,19 @@ class ChessGame:
         """
         enemy_team = TeamType.OPPONENT if team == TeamType.ALLY else TeamType.ALLY
         events = []
-        if self.status.is_in_checkmate(enemy_team):  # Check if this team checkmated the opponent
+        # Check and the opponent's legal moves are worked out once per position and cached,
+        # so asking for the state again in the same ply is free
+        analysis = self.status.analyze(enemy_team)
+        if analysis.is_checkmate:  # Check if this team checkmated the opponent
             events.append(GameEvent.CHECKMATE)
-        elif self.status.is_in_check(enemy_team):  # Check if this team checked the opponent
-            events.append(GameEvent.CHECK)
-        elif self.status.is_in_stalemate(enemy_team):  # Check if this team stalemated the opponent
+        elif analysis.is_stalemate:  # Check if this team stalemated the opponent
             events.append(GameEvent.STALEMATE)
+        else:
+            draw = self.status.draw_event()  # Check if the game is drawn by repetition, fifty moves or material
+            if draw is not None:
+                events.append(draw)
+            if analysis.is_in_check:  # Check if this team checked the opponent
+                events.append(GameEvent.CHECK)
 
         if self.event == GameEvent.CAPTURE:  # Check if this team captured a piece
             events.append(self.event)
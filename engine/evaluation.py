@@ -0,0 +1,195 @@
+from pieces import Piece
+from utils.type import PieceType
+
+# Piece-square tables, from white's point of view, indexed like the board (``y * 8 + x``): the first row is
+# the 8th rank. Black pieces use the vertically mirrored square.
+_PAWN_TABLE = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0
+)
+_PAWN_ENDGAME_TABLE = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    80, 80, 80, 80, 80, 80, 80, 80,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    30, 30, 30, 30, 30, 30, 30, 30,
+    15, 15, 15, 15, 15, 15, 15, 15,
+    5, 5, 5, 5, 5, 5, 5, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0
+)
+_KNIGHT_TABLE = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50
+)
+_BISHOP_TABLE = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20
+)
+_ROOK_TABLE = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0
+)
+_QUEEN_TABLE = (
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20
+)
+_KING_TABLE = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20
+)
+_KING_ENDGAME_TABLE = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50
+)
+
+# (middlegame value, endgame value, middlegame table, endgame table, game phase weight) of each piece type
+_PIECE_TERMS = {
+    PieceType.PAWN: (100, 120, _PAWN_TABLE, _PAWN_ENDGAME_TABLE, 0),
+    PieceType.KNIGHT: (320, 300, _KNIGHT_TABLE, _KNIGHT_TABLE, 1),
+    PieceType.BISHOP: (330, 320, _BISHOP_TABLE, _BISHOP_TABLE, 1),
+    PieceType.ROOK: (500, 530, _ROOK_TABLE, _ROOK_TABLE, 2),
+    PieceType.QUEEN: (900, 920, _QUEEN_TABLE, _QUEEN_TABLE, 4),
+    PieceType.KING: (0, 0, _KING_TABLE, _KING_ENDGAME_TABLE, 0)
+}
+
+MAX_PHASE = 24
+"""The game phase of the starting position: 4 minor pieces, 4 rooks and 2 queens on the board."""
+
+
+def _square_scores(is_white: bool, value: int, table: tuple[int, ...]) -> tuple[int, ...]:
+    """
+    Combines a piece value with its piece-square table into signed scores (positive for white) per square.
+    """
+    sign = 1 if is_white else -1
+    return tuple(sign * (value + table[square if is_white else (7 - square // 8) * 8 + square % 8])
+                 for square in range(64))
+
+
+MIDDLEGAME_SCORES = {(is_white, piece_type): _square_scores(is_white, terms[0], terms[2])
+                     for piece_type, terms in _PIECE_TERMS.items() for is_white in (True, False)}
+"""The middlegame score of each (is_white, PieceType) on each square, material included."""
+
+ENDGAME_SCORES = {(is_white, piece_type): _square_scores(is_white, terms[1], terms[3])
+                  for piece_type, terms in _PIECE_TERMS.items() for is_white in (True, False)}
+"""The endgame score of each (is_white, PieceType) on each square, material included."""
+
+PHASE_WEIGHTS = {piece_type: terms[4] for piece_type, terms in _PIECE_TERMS.items()}
+"""How much each piece type counts towards the game phase."""
+
+
+class Evaluation:
+    """
+    A class to keep a static evaluation of the position up to date as pieces move.
+
+    The evaluation is the material plus piece-square table score of every piece, tapered between a
+    middlegame and an endgame score by how much material is left on the board. The board reports every
+    piece it adds, removes or moves, so the sums are always current (including captures, castling and
+    promotions) and reading the score is constant time.
+
+    Attributes:
+        middlegame (int): The middlegame score, in centipawns (positive is good for white).
+        endgame (int): The endgame score, in centipawns (positive is good for white).
+        phase (int): The game phase, from MAX_PHASE (all pieces on the board) down to 0 (only kings and pawns).
+    """
+
+    def __init__(self):
+        """
+        Initializes an Evaluation of an empty board.
+        """
+        self.middlegame = 0
+        self.endgame = 0
+        self.phase = 0
+
+    @property
+    def score(self) -> int:
+        """
+        Returns the tapered evaluation of the position.
+
+        Returns:
+            int: The score in centipawns, positive if white is better.
+        """
+        phase = min(self.phase, MAX_PHASE)
+        return (self.middlegame * phase + self.endgame * (MAX_PHASE - phase)) // MAX_PHASE
+
+    def add(self, piece: Piece, square: int):
+        """
+        Accounts for a piece put on the board.
+
+        Args:
+            piece (Piece): The piece.
+            square (int): The square the piece was put on (``y * 8 + x``).
+        """
+        key = (piece.is_white, piece.type)
+        self.middlegame += MIDDLEGAME_SCORES[key][square]
+        self.endgame += ENDGAME_SCORES[key][square]
+        self.phase += PHASE_WEIGHTS[piece.type]
+
+    def remove(self, piece: Piece, square: int):
+        """
+        Accounts for a piece taken off the board.
+
+        Args:
+            piece (Piece): The piece.
+            square (int): The square the piece was taken from (``y * 8 + x``).
+        """
+        key = (piece.is_white, piece.type)
+        self.middlegame -= MIDDLEGAME_SCORES[key][square]
+        self.endgame -= ENDGAME_SCORES[key][square]
+        self.phase -= PHASE_WEIGHTS[piece.type]
+
+    def move(self, piece: Piece, from_square: int, to_square: int):
+        """
+        Accounts for a piece moving from one square to another.
+
+        Args:
+            piece (Piece): The piece.
+            from_square (int): The square the piece moved from (``y * 8 + x``).
+            to_square (int): The square the piece moved to (``y * 8 + x``).
+        """
+        key = (piece.is_white, piece.type)
+        middlegame_scores = MIDDLEGAME_SCORES[key]
+        endgame_scores = ENDGAME_SCORES[key]
+        self.middlegame += middlegame_scores[to_square] - middlegame_scores[from_square]
+        self.endgame += endgame_scores[to_square] - endgame_scores[from_square]
@@ -1,8 +1,10 @@
-from dataclasses import replace
 from pieces import Piece, Pawn, King, Rook
 from utils import TeamType
 from engine.move import Move
+from engine.move_record import MoveRecord
 from engine.game_event import GameEvent
+from engine.bitboard import castling_rights
+from engine.zobrist import CASTLING_KEYS, SIDE_KEY, en_passant_key, position_key
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -18,6 +20,8 @@ class GameEngine:
         game (ChessGame): A ChessGame object representing the chess game.
         board (Board): A Board object representing the current chess board.
         last_move (Move): A Move object used to represent the last move played on the board.
+        halfmove_clock (int): The number of plies since the last capture or pawn move (for the fifty-move rule).
+        fullmove_number (int): The number of the current full move, starting at 1 and incremented after black moves.
     """
 
     def __init__(self, chess_game: 'ChessGame'):
@@ -30,6 +34,10 @@ class GameEngine:
         self.game = chess_game
         self.board = chess_game.board
         self.last_move = Move(None, (-1, -1), (-1, -1))  # Initialize with an empty move
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.board.zobrist_key = position_key(self.board, self.last_move,
+                                              white_to_move=chess_game.current_player.team == TeamType.ALLY)
 
     @property
     def last_move(self) -> Move:
@@ -49,9 +57,9 @@ class GameEngine:
         is made.
 
         Args:
-            move (Move): A Move object representing the last move.
+            move (Move): A Move object representing the last move. Moves are immutable, so it is stored as is.
         """
-        self._last_move = replace(move)
+        self._last_move = move
 
     def move_piece(self, piece: Piece, new_x: int, new_y: int, promotion_piece: Piece = None) -> bool:
         """
@@ -72,36 +80,122 @@ class GameEngine:
         # Do not proceed with non-legal moves
         if not piece.legal_move(px=piece.x, py=piece.y, x=new_x, y=new_y, chess_game=self.game):
             return False
+
+        # A pawn reaching the last rank must be promoted
+        if self.is_promotion(piece, new_y) and promotion_piece is None:
+            return False
+
+        self.make_move(piece, new_x, new_y, promotion_piece)
+        self.game.status.record_position()
+        return True
+
+    def make_move(self, piece: Piece, new_x: int, new_y: int, promotion_piece: Piece = None) -> MoveRecord:
+        """
+        Plays a move on the board without checking whether it is legal, and records how to take it back.
+
+        Captures (including "en passant"), the rook's move when castling, promotions and the ``has_moved``
+        flags are all stored in the returned record, so that ``unmake_move`` can restore the exact previous
+        position. A pawn reaching the last rank without a promotion piece is moved without being promoted.
+        The board's Zobrist key is updated for the side to move, castling rights and en passant file
+        (the board itself accounts for the pieces that moved).
+
+        Args:
+            piece (Piece): The piece to move.
+            new_x (int): The new x-coordinate for the piece.
+            new_y (int): The new y-coordinate for the piece.
+            promotion_piece (Piece): The piece to promote a pawn to. Defaults to None.
+
+        Returns:
+            MoveRecord: The record needed to take the move back.
+        """
+        record = MoveRecord(piece=piece,
+                            start_position=(piece.x, piece.y),
+                            end_position=(new_x, new_y),
+                            has_moved=piece.has_moved,
+                            last_move=self.last_move,
+                            event=self.game.event,
+                            zobrist_key=self.board.zobrist_key,
+                            halfmove_clock=self.halfmove_clock,
+                            fullmove_number=self.fullmove_number)
+        self.game.event = None
+        castling_key = CASTLING_KEYS[castling_rights(self.board)]
+        last_en_passant_key = en_passant_key(self.board, self.last_move)
+
         # Check if there's a piece at the new position
         other_piece = self.board.piece_at(x=new_x, y=new_y)
 
         # Handle special moves
-        self.handle_en_passant_capture(piece, new_x, new_y)
-        self.handle_castle_move(piece, new_x, new_y)
+        self.handle_en_passant_capture(piece, new_x, new_y, record)
+        self.handle_castle_move(piece, new_x, new_y, record)
 
-        # Attempt the move and store the original position
-        original_x, original_y = piece.x, piece.y
-        piece.x, piece.y = new_x, new_y
+        piece._set_position(new_x, new_y)
 
-        # Check for promotion
-        if isinstance(piece, Pawn) and (
-                (piece.team == TeamType.ALLY and new_y == 7) or (piece.team == TeamType.OPPONENT and new_y == 0)):
-            if promotion_piece is not None:
-                self.promote(piece, promotion_piece)
-                self.game.event = GameEvent.PROMOTION
-            else:
-                return False
-
-        # Move is legal, so finalize it
-        if other_piece is not None and piece.can_capture_or_occupy_square(x=original_x, y=original_y, board=self.board):
+        if other_piece is not None and other_piece.is_white != piece.is_white:
+            record.captured = other_piece
+            record.captured_index = self.board.pieces.index(other_piece)
             self.board.remove(other_piece)
             self.game.event = GameEvent.CAPTURE
 
+        # Check for promotion
+        if promotion_piece is not None and self.is_promotion(piece, new_y):
+            record.promotion = promotion_piece
+            record.piece_index = self.board.pieces.index(piece)
+            self.promote(piece, promotion_piece)
+            if self.game.event is None:
+                self.game.event = GameEvent.PROMOTION
+
         piece.has_moved = True
-        self.game.status.positions.append(self.board.fen())
-        return True
+        self.last_move = Move(piece, record.start_position, record.end_position)
+        self.halfmove_clock = 0 if isinstance(piece, Pawn) or record.captured is not None else self.halfmove_clock + 1
+        if not piece.is_white:
+            self.fullmove_number += 1
+        self.board.zobrist_key ^= SIDE_KEY ^ castling_key ^ CASTLING_KEYS[castling_rights(self.board)] ^ \
+            last_en_passant_key ^ en_passant_key(self.board, self.last_move)
+        return record
+
+    def unmake_move(self, record: MoveRecord):
+        """
+        Takes back a move played with ``make_move``, restoring the position exactly as it was before.
 
-    def handle_en_passant_capture(self, piece: Piece, new_x: int, new_y: int):
+        Args:
+            record (MoveRecord): The record returned by ``make_move``.
+        """
+        piece = record.piece
+        if record.promotion is not None:
+            self.board.remove(record.promotion)
+            self.board.add(piece, record.piece_index)
+
+        piece._set_position(*record.start_position)
+        piece.has_moved = record.has_moved
+
+        if record.captured is not None:
+            self.board.add(record.captured, record.captured_index)
+
+        if record.rook is not None:
+            record.rook._set_position(record.rook_start_x, record.rook.y)
+            record.rook.has_moved = record.rook_has_moved
+
+        self._last_move = record.last_move
+        self.halfmove_clock = record.halfmove_clock
+        self.fullmove_number = record.fullmove_number
+        self.game.event = record.event
+        self.board.zobrist_key = record.zobrist_key
+
+    @staticmethod
+    def is_promotion(piece: Piece, new_y: int) -> bool:
+        """
+        Checks if moving the given piece to the given rank promotes it.
+
+        Args:
+            piece (Piece): The piece to move.
+            new_y (int): The new y-coordinate for the piece.
+
+        Returns:
+            bool: True if the piece is a pawn reaching the last rank, False otherwise.
+        """
+        return isinstance(piece, Pawn) and new_y == (0 if piece.team == TeamType.ALLY else 7)
+
+    def handle_en_passant_capture(self, piece: Piece, new_x: int, new_y: int, record: MoveRecord = None):
         """
         Handles the special chess move "en passant".
         If the conditions for en passant are met, this function removes the opponent's last-moved pawn
@@ -110,13 +204,18 @@ class GameEngine:
             piece (Piece): The pawn that is capturing the opponent's pawn "en passant".
             new_x (int): The new x-coordinate for the piece.
             new_y (int): The new y-coordinate for the piece.
+            record (MoveRecord): The record of the move being made, which stores the captured pawn. Defaults to None.
         """
         if isinstance(self.last_move.piece, Pawn) and isinstance(piece, Pawn):
             if piece.en_passant(px=piece.x, py=piece.y, x=new_x, y=new_y, game_engine=self):
-                self.board.remove(self.last_move.piece)
+                captured = self.last_move.piece
+                if record is not None:
+                    record.captured = captured
+                    record.captured_index = self.board.pieces.index(captured)
+                self.board.remove(captured)
                 self.game.event = GameEvent.CAPTURE
 
-    def handle_castle_move(self, piece: Piece, new_x: int, new_y: int):
+    def handle_castle_move(self, piece: Piece, new_x: int, new_y: int, record: MoveRecord = None):
         """
         Handles the special chess move "castling".
         If the conditions for castling are met, this function moves the corresponding rook.
@@ -125,6 +224,7 @@ class GameEngine:
             piece (Piece): The king that is castling.
             new_x (int): The new x-coordinate for the piece.
             new_y (int): The new y-coordinate for the piece.
+            record (MoveRecord): The record of the move being made, which stores the rook's move. Defaults to None.
         """
         if isinstance(piece, King) and abs(new_x - piece.x) == 2:
             rook_x = 0 if new_x < piece.x else 7
@@ -137,7 +237,11 @@ class GameEngine:
                 else:
                     rook_new_x = 5
                     self.game.event = GameEvent.KING_SIDE_CASTLE
-                rook.x = rook_new_x
+                if record is not None:
+                    record.rook = rook
+                    record.rook_start_x = rook.x
+                    record.rook_has_moved = rook.has_moved
+                rook._set_position(rook_new_x, rook.y)
                 rook.has_moved = True
 
     def promote(self, piece: Pawn, promotion_piece: Piece):
@@ -149,6 +253,7 @@ class GameEngine:
             promotion_piece (Piece): The piece that the pawn should be promoted to.
         """
         self.board.remove(piece)
+        promotion_piece._set_position(piece.x, piece.y)
         self.board.add(promotion_piece)
 
     def promote_from_ui(self, piece: Pawn, promotion_piece: type[Piece]):
@@ -159,9 +264,19 @@ class GameEngine:
             piece (Pawn): The pawn to be promoted.
             promotion_piece (type[Piece]): The type of piece that the pawn should be promoted to.
         """
-        self.board.remove(piece)
+        # The pawn may already have been replaced by a default promotion piece when the move was made
+        self.board.remove(self.board.piece_at(piece.x, piece.y))
         new_piece = promotion_piece(x=piece.x,
                                     y=piece.y,
                                     team=piece.team,
                                     is_white=piece.is_white)
         self.board.add(new_piece)
+
+        # Record the piece actually chosen in the move history, in place of the default one
+        history = self.game.move_history
+        if history and history[-1] is self.last_move and self.last_move.promotion is not None:
+            move = self.last_move
+            self.last_move = history[-1] = Move(move.piece, move.start_position, move.end_position,
+                                                is_capture=move.is_capture, is_check=move.is_check,
+                                                is_checkmate=move.is_checkmate, is_stalemate=move.is_stalemate,
+                                                promotion=promotion_piece)
@@ -15,6 +15,9 @@ class GameEvent(Enum):
     STALEMATE: Represents a stalemate.
     CHECKMATE: Represents a checkmate.
     DRAW: Represents a player-decided draw.
+    THREEFOLD_REPETITION: Represents a draw by the same position occurring three times.
+    FIFTY_MOVE_RULE: Represents a draw by fifty moves of each side without a capture or a pawn move.
+    INSUFFICIENT_MATERIAL: Represents a draw because neither side has enough material left to checkmate.
     """
     ONGOING = 'ongoing'
     MOVE = 'move'
@@ -27,4 +30,15 @@ class GameEvent(Enum):
     STALEMATE = 'stalemate'
     CHECKMATE = 'checkmate'
     DRAW = 'draw'
+    THREEFOLD_REPETITION = 'threefold_repetition'
+    FIFTY_MOVE_RULE = 'fifty_move_rule'
+    INSUFFICIENT_MATERIAL = 'insufficient_material'
+
+
+DRAW_EVENTS = frozenset({GameEvent.STALEMATE, GameEvent.DRAW, GameEvent.THREEFOLD_REPETITION,
+                         GameEvent.FIFTY_MOVE_RULE, GameEvent.INSUFFICIENT_MATERIAL})
+"""The events that end a game in a draw."""
+
+GAME_OVER_EVENTS = DRAW_EVENTS | {GameEvent.CHECKMATE}
+"""The events that end a game."""
 
@@ -1,7 +1,10 @@
-from collections import Counter
 from pieces import Pawn
-from utils import TeamType
-from typing import TYPE_CHECKING
+from utils import TeamType, PieceType
+from engine.game_event import GameEvent
+from engine.bitboard import WHITE, BLACK
+from engine.attack_map import AttackMap
+from engine.position_analysis import PositionAnalysis
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from engine import ChessGame
@@ -10,12 +13,16 @@ if TYPE_CHECKING:
 class GameStatus:
     """
     A class to represent the status of a chess game. This class provides utility methods
-    to check game conditions like check and checkmate.
+    to check game conditions like check, checkmate and the draw rules.
 
     Attributes:
         game (ChessGame): The chess game being played.
         board (Board): The current chess board.
         move_generator (MoveGenerator): A generator for possible moves in the game.
+        position_counts (dict[int, int]): How many times each position occurred in the game, keyed by the
+                                          board's Zobrist key.
+        _position_cache (dict): The attack maps and analyses computed for the current position.
+        _position_cache_key (int): The Zobrist key of the position the cached values belong to.
     """
 
     def __init__(self, chess_game: 'ChessGame'):
@@ -28,7 +35,75 @@ class GameStatus:
         self.game = chess_game
         self.board = chess_game.board
         self.move_generator = chess_game.move_generator
-        self.positions = []
+        self.position_counts = {self.board.zobrist_key: 1}
+        self._position_cache = {}
+        self._position_cache_key = None
+
+    def reset(self):
+        """
+        Starts the position history over from the current position and forgets every cached analysis,
+        after the position has been replaced (e.g. by ``ChessGame.load_fen``).
+        """
+        self.position_counts = {self.board.zobrist_key: 1}
+        self._position_cache = {}
+        self._position_cache_key = None
+        self.move_generator.clear_cache()
+
+    def _cache(self) -> dict:
+        """
+        Returns the cache of the current position, emptying it first if the position has changed
+        (i.e. if the board's Zobrist key has changed since the cached values were computed).
+
+        Returns:
+            dict: The values computed for the current position.
+        """
+        key = self.board.zobrist_key
+        if key != self._position_cache_key:
+            self._position_cache = {}
+            self._position_cache_key = key
+        return self._position_cache
+
+    def attack_map(self, team: TeamType) -> AttackMap:
+        """
+        Returns the attack map of a team in the current position.
+
+        Attack maps are computed on demand and cached until the position changes (i.e. until the board's
+        Zobrist key changes), so the check, castling and King move tests of a position share one map.
+
+        Args:
+            team (TeamType): The attacking team.
+
+        Returns:
+            AttackMap: The squares attacked by the team.
+        """
+        cache = self._cache()
+        attack_map = cache.get(('attack_map', team))
+        if attack_map is None:
+            attack_map = cache[('attack_map', team)] = AttackMap(self.board, team)
+        return attack_map
+
+    def analyze(self, team: TeamType) -> PositionAnalysis:
+        """
+        Analyses the current position for a team: whether its King is in check and what its legal moves are.
+
+        The analysis is computed in a single pass and cached until the position changes, so every question
+        asked about a position after a move (check, checkmate, stalemate) shares one legal move generation.
+
+        Args:
+            team (TeamType): The team to analyse the position for.
+
+        Returns:
+            PositionAnalysis: The analysis of the position.
+        """
+        cache = self._cache()
+        analysis = cache.get(('analysis', team))
+        if analysis is None:
+            analysis = cache[('analysis', team)] = PositionAnalysis(
+                team=team,
+                is_in_check=self.is_in_check(team),
+                legal_moves=self.move_generator.team_legal_moves(team)
+            )
+        return analysis
 
     def is_in_check(self, team: TeamType) -> bool:
         """
@@ -40,63 +115,49 @@ class GameStatus:
         Returns:
             bool: True if the king is in check, False otherwise.
         """
-        king = self.board.get_king(team)
+        if self.move_generator.use_bitboards:
+            bitboard = self.move_generator.bitboard(team)
+            return bitboard.is_in_check(WHITE if team == TeamType.ALLY else BLACK)
 
-        # Check each enemy piece if they can reach the king's position
-        for piece in self.board.pieces:
-            if piece.team != team:
-                if piece.is_controlled_square(piece.x, piece.y, king.x, king.y, self.game):
-                    return True
-        return False
+        king = self.board.get_king(team)
+        enemy_team = TeamType.OPPONENT if team == TeamType.ALLY else TeamType.ALLY
+        return self.attack_map(enemy_team).is_attacked(king.x, king.y)
 
     def is_in_checkmate(self, team: TeamType) -> bool:
         """
         Checks if the king of a given team is in checkmate.
 
+        This reuses the analysis of the position if it has been made, and otherwise only looks for a single
+        legal move.
+
         Args:
             team (TeamType): The team of the king to check.
 
         Returns:
             bool: True if the king is in checkmate, False otherwise.
         """
-        # First, check if the king is in check
-        if not self.is_in_check(team):
-            return False
-
-        # Then, check if there are any legal moves left that would result in the king not being in check
-        for piece in self.board.pieces:
-            if piece.team == team:
-                if self.move_generator.piece_legal_moves(piece):
-                    return False
-
-        # If there are no such moves, the king is in checkmate
-        return True
+        analysis = self._cache().get(('analysis', team))
+        if analysis is not None:
+            return analysis.is_checkmate
+        return self.is_in_check(team) and not self.move_generator.has_any_legal_move(team)
 
     def is_in_stalemate(self, team: TeamType) -> bool:
         """
         Checks if the king of a given team is in stalemate.
 
+        This reuses the analysis of the position if it has been made, and otherwise only looks for a single
+        legal move.
+
         Args:
             team (TeamType): The team of the king to check.
 
         Returns:
             bool: True if the king is in stalemate, False otherwise.
         """
-        if self.is_threefold_repetition():
-            return True
-
-        # First, check if the king is NOT in check
-        if self.is_in_check(team):
-            return False
-
-        # Then, check if there are any legal moves left for any piece of the team
-        for piece in self.board.pieces:
-            if piece.team == team:
-                if self.move_generator.piece_legal_moves(piece):
-                    return False
-
-        # If there are no such moves and the king is not in check, it is stalemate
-        return True
+        analysis = self._cache().get(('analysis', team))
+        if analysis is not None:
+            return analysis.is_stalemate
+        return not self.is_in_check(team) and not self.move_generator.has_any_legal_move(team)
 
     def is_threefold_repetition(self) -> bool:
         """
@@ -105,8 +166,67 @@ class GameStatus:
         Returns:
             bool: True if the current position has occurred three times, False otherwise.
         """
-        positions_counter = Counter(self.positions)
-        return positions_counter[self.board.fen()] >= 3
+        return self.position_counts.get(self.board.zobrist_key, 0) >= 3
+
+    def is_fifty_move_rule(self) -> bool:
+        """
+        Checks if fifty moves of each side have been played without a capture or a pawn move.
+
+        Returns:
+            bool: True if the halfmove clock has reached 100 plies, False otherwise.
+        """
+        return self.game.engine.halfmove_clock >= 100
+
+    def is_insufficient_material(self) -> bool:
+        """
+        Checks if neither side has enough material left to checkmate: king against king, king and a minor piece
+        against king, or kings and bishops where all the bishops stand on squares of the same color.
+
+        This reads the board's piece counts, so it is constant time unless only kings and bishops are left.
+
+        Returns:
+            bool: True if the position is a draw by insufficient material, False otherwise.
+        """
+        counts = self.board.piece_counts
+        for is_white in (True, False):
+            if counts[(is_white, PieceType.PAWN)] or counts[(is_white, PieceType.ROOK)] or \
+                    counts[(is_white, PieceType.QUEEN)]:
+                return False
+
+        knights = counts[(True, PieceType.KNIGHT)] + counts[(False, PieceType.KNIGHT)]
+        bishops = counts[(True, PieceType.BISHOP)] + counts[(False, PieceType.BISHOP)]
+        if knights + bishops <= 1:
+            return True
+        if knights:
+            return False
+
+        square_colors = {(piece.x + piece.y) % 2 for piece in self.board.pieces if piece.type == PieceType.BISHOP}
+        return len(square_colors) == 1
+
+    def draw_event(self) -> Optional[GameEvent]:
+        """
+        Returns the draw rule that ends the game in the current position, if any. Stalemate is left out,
+        as it depends on the team to move (see ``is_in_stalemate``).
+
+        Returns:
+            Optional[GameEvent]: THREEFOLD_REPETITION, FIFTY_MOVE_RULE or INSUFFICIENT_MATERIAL, or None if none
+            of these rules applies.
+        """
+        if self.is_insufficient_material():
+            return GameEvent.INSUFFICIENT_MATERIAL
+        if self.is_threefold_repetition():
+            return GameEvent.THREEFOLD_REPETITION
+        if self.is_fifty_move_rule():
+            return GameEvent.FIFTY_MOVE_RULE
+        return None
+
+    def record_position(self):
+        """
+        Records an occurrence of the current position, for repetition detection.
+        This should be called every time a move is made in the game.
+        """
+        key = self.board.zobrist_key
+        self.position_counts[key] = self.position_counts.get(key, 0) + 1
 
     def was_pawn_recently_promoted(self) -> bool:
         """
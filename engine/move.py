@@ -1,13 +1,48 @@
 from typing import Iterator
-from dataclasses import dataclass
-from pieces import Piece, Pawn
+from pieces import Piece, Pawn, Knight, Bishop, Rook, Queen
+
+# A move is packed into 16 bits: the from square (bits 0-5), the to square (bits 6-11) and four flag bits
+# (bits 12-15). Squares are indexed like the board: ``y * 8 + x``.
+QUIET = 0
+DOUBLE_PAWN_PUSH = 1
+KING_SIDE_CASTLE = 2
+QUEEN_SIDE_CASTLE = 3
+CAPTURE = 4
+"""Flag bit set for every capture, promotions included."""
+PROMOTION = 8
+"""Flag bit set for every promotion. The two lowest flag bits then hold the promotion piece."""
+
+PROMOTION_PIECES = (Knight, Bishop, Rook, Queen)
+"""The promotion piece classes, in the order of their 2-bit code in a promotion move."""
+
+NULL_MOVE = 0
+"""The code of "no move" (a8 to a8 is never a real move)."""
+
+_CHECK, _CHECKMATE, _STALEMATE = 1, 2, 4
+
+
+def encode_move(from_square: int, to_square: int, flags: int = QUIET) -> int:
+    """
+    Packs a move into a 16-bit integer.
+
+    Args:
+        from_square (int): The square the piece moves from (``y * 8 + x``).
+        to_square (int): The square the piece moves to (``y * 8 + x``).
+        flags (int): The move flags (e.g. CAPTURE, or PROMOTION | CAPTURE | promotion piece code). Defaults to QUIET.
+
+    Returns:
+        int: The packed move.
+    """
+    return from_square | to_square << 6 | flags << 12
 
 
-@dataclass(frozen=True)
 class Move:
     """
     An immutable class used to represent a Move in Chess.
 
+    The move itself is stored as a single packed 16-bit integer (see ``encode_move``), next to the piece
+    that moved and the check, checkmate and stalemate annotations of the position it led to.
+
     Attributes:
         piece (Piece or None): The instance of the Piece class that has been moved. Is None if no Piece was moved.
 
@@ -16,17 +51,64 @@ class Move:
 
         end_position (tuple[int, int]): A tuple representing the end position of a piece's move on the board.
         It contains two integers: the x-coordinate (row index) and the y-coordinate (column index).
+
+        code (int): The packed 16-bit move.
     """
-    piece: Piece or None
-    start_position: tuple[int, int]
-    end_position: tuple[int, int]
-    is_capture: bool = False
-    is_king_side_castle: bool = False
-    is_queen_side_castle: bool = False
-    is_check: bool = False
-    is_checkmate: bool = False
-    is_stalemate: bool = False
-    promotion: Piece or None = None
+    __slots__ = ('_piece', '_code', '_annotations')
+
+    def __init__(self, piece: Piece or None, start_position: tuple[int, int], end_position: tuple[int, int],
+                 is_capture: bool = False, is_king_side_castle: bool = False, is_queen_side_castle: bool = False,
+                 is_check: bool = False, is_checkmate: bool = False, is_stalemate: bool = False,
+                 promotion: Piece or type[Piece] or None = None):
+        """
+        Initializes a Move.
+
+        Args:
+            piece (Piece or None): The piece that moved, or None for "no move".
+            start_position (tuple[int, int]): The (x, y) position the piece moved from.
+            end_position (tuple[int, int]): The (x, y) position the piece moved to.
+            is_capture (bool): Whether the move captured a piece. Defaults to False.
+            is_king_side_castle (bool): Whether the move castled king-side. Defaults to False.
+            is_queen_side_castle (bool): Whether the move castled queen-side. Defaults to False.
+            is_check (bool): Whether the move gave check. Defaults to False.
+            is_checkmate (bool): Whether the move gave checkmate. Defaults to False.
+            is_stalemate (bool): Whether the move stalemated the opponent. Defaults to False.
+            promotion (Piece or type[Piece] or None): The piece (or piece class) a pawn promoted to. Defaults to None.
+        """
+        self._piece = piece
+        if piece is None:
+            self._code = NULL_MOVE
+        else:
+            (x1, y1), (x2, y2) = start_position, end_position
+            flags = QUIET
+            if is_king_side_castle:
+                flags = KING_SIDE_CASTLE
+            elif is_queen_side_castle:
+                flags = QUEEN_SIDE_CASTLE
+            elif isinstance(piece, Pawn) and abs(y2 - y1) == 2:
+                flags = DOUBLE_PAWN_PUSH
+            if is_capture:
+                flags |= CAPTURE
+            if promotion is not None:
+                promotion_class = promotion if isinstance(promotion, type) else type(promotion)
+                flags |= PROMOTION | PROMOTION_PIECES.index(promotion_class)
+            self._code = encode_move(y1 * 8 + x1, y2 * 8 + x2, flags)
+        self._annotations = (_CHECK if is_check else 0) | (_CHECKMATE if is_checkmate else 0) | \
+            (_STALEMATE if is_stalemate else 0)
+
+    def __eq__(self, other) -> bool:
+        """
+        Compares two moves by the piece that moved, the packed move and the annotations.
+        """
+        if not isinstance(other, Move):
+            return NotImplemented
+        return self._piece is other._piece and self._code == other._code and self._annotations == other._annotations
+
+    def __hash__(self) -> int:
+        """
+        Hashes the move consistently with ``__eq__``.
+        """
+        return hash((id(self._piece), self._code, self._annotations))
 
     def __iter__(self) -> Iterator[Piece | None | tuple[int, int]]:
         """
@@ -36,6 +118,86 @@ class Move:
         yield self.start_position
         yield self.end_position
 
+    @property
+    def piece(self) -> Piece or None:
+        """Returns the piece that moved, or None for "no move"."""
+        return self._piece
+
+    @property
+    def code(self) -> int:
+        """Returns the packed 16-bit move."""
+        return self._code
+
+    @property
+    def flags(self) -> int:
+        """Returns the four flag bits of the move."""
+        return self._code >> 12
+
+    @property
+    def from_square(self) -> int:
+        """Returns the square the piece moved from (``y * 8 + x``)."""
+        return self._code & 63
+
+    @property
+    def to_square(self) -> int:
+        """Returns the square the piece moved to (``y * 8 + x``)."""
+        return self._code >> 6 & 63
+
+    @property
+    def start_position(self) -> tuple[int, int]:
+        """Returns the (x, y) position the piece moved from, or (-1, -1) for "no move"."""
+        if self._code == NULL_MOVE:
+            return -1, -1
+        return self._code & 7, self._code >> 3 & 7
+
+    @property
+    def end_position(self) -> tuple[int, int]:
+        """Returns the (x, y) position the piece moved to, or (-1, -1) for "no move"."""
+        if self._code == NULL_MOVE:
+            return -1, -1
+        return self._code >> 6 & 7, self._code >> 9 & 7
+
+    @property
+    def is_capture(self) -> bool:
+        """Returns True if the move captured a piece."""
+        return bool(self.flags & CAPTURE)
+
+    @property
+    def is_king_side_castle(self) -> bool:
+        """Returns True if the move castled king-side."""
+        return self.flags == KING_SIDE_CASTLE
+
+    @property
+    def is_queen_side_castle(self) -> bool:
+        """Returns True if the move castled queen-side."""
+        return self.flags == QUEEN_SIDE_CASTLE
+
+    @property
+    def is_double_pawn_push(self) -> bool:
+        """Returns True if the move pushed a pawn two squares forward."""
+        return self.flags == DOUBLE_PAWN_PUSH
+
+    @property
+    def promotion(self) -> type[Piece] or None:
+        """Returns the class of the piece a pawn promoted to, or None if the move didn't promote."""
+        flags = self.flags
+        return PROMOTION_PIECES[flags & 3] if flags & PROMOTION else None
+
+    @property
+    def is_check(self) -> bool:
+        """Returns True if the move gave check."""
+        return bool(self._annotations & _CHECK)
+
+    @property
+    def is_checkmate(self) -> bool:
+        """Returns True if the move gave checkmate."""
+        return bool(self._annotations & _CHECKMATE)
+
+    @property
+    def is_stalemate(self) -> bool:
+        """Returns True if the move stalemated the opponent."""
+        return bool(self._annotations & _STALEMATE)
+
     def __repr__(self):
         move_str = ""
         # Handle castling moves first
@@ -45,8 +207,10 @@ class Move:
             move_str += "0-0-0"
         else:
             # convert to chessboard representation
-            start_pos_str = chr(self.start_position[0] + 97) + str(8 - self.start_position[1])
-            end_pos_str = chr(self.end_position[0] + 97) + str(8 - self.end_position[1])
+            start_x, start_y = self.start_position
+            end_x, end_y = self.end_position
+            start_pos_str = chr(start_x + 97) + str(8 - start_y)
+            end_pos_str = chr(end_x + 97) + str(8 - end_y)
 
             # Capture representation
             capture_str = 'x' if self.is_capture else ''
@@ -58,8 +222,8 @@ class Move:
                 move_str += f"{piece_str}{capture_str}{end_pos_str}"
 
             # Handle promotions
-            if self.promotion:
-                move_str += f"={self.promotion.symbol.upper()}"
+            if self.flags & PROMOTION:
+                move_str += f"={'NBRQ'[self.flags & 3]}"
 
         # Handle check and checkmate
         if self.is_checkmate:
@@ -72,4 +236,3 @@ class Move:
             move_str += "(stalemate)"
 
         return move_str
-
@@ -1,5 +1,11 @@
-from pieces import Piece, Queen, Rook, Bishop, Knight
-from typing import TYPE_CHECKING
+from pieces import Piece, Queen, Rook, Bishop, Knight, King, Pawn
+from pieces.piece import LINEAR_DIRECTIONS, DIAGONAL_DIRECTIONS
+from pieces.knight import KNIGHT_OFFSETS
+from utils import TeamType, PieceType
+from engine.bitboard import Bitboard, WHITE, BLACK
+from engine.bitboard_move_generator import BitboardMoveGenerator
+from engine.attack_map import is_square_attacked
+from typing import TYPE_CHECKING, Iterator, Optional
 
 if TYPE_CHECKING:
     from engine import ChessGame
@@ -13,19 +19,46 @@ class MoveGenerator:
     It checks not only the rules of movement for the piece, but also whether the move would
     put the player's own king in check.
 
+    King safety is worked out once per position: the pieces giving check and the pieces pinned to their King.
+    A pinned piece may only move along its pin, and a move out of check must capture the checking piece or
+    block its line. Only en passant captures, which take a piece off a square the capturing pawn doesn't move
+    to, are still verified by playing them on the board.
+
     Attributes:
         game (ChessGame): The chess game being played.
-
+        use_bitboards (bool): Whether moves are generated with the bitboard backend instead of the Piece classes.
+        _king_safety (tuple): The cached checks and pins of the position ``_king_safety_key`` describes.
+        _king_safety_key (tuple[int, TeamType]): The Zobrist key and team of the cached checks and pins.
+        _bitboard_cache (tuple): The cached bitboards and legal moves of the position ``_bitboard_key`` describes,
+                                 with the bitboard backend.
+        _bitboard_key (tuple[int, TeamType]): The Zobrist key and team of the cached bitboards and moves.
     """
 
-    def __init__(self, chess_game: 'ChessGame'):
+    def __init__(self, chess_game: 'ChessGame', use_bitboards: bool = False):
         """
         Constructs a new MoveGenerator object with the given chess game.
 
         Args:
             chess_game (ChessGame): The chess game being played.
+            use_bitboards (bool): Whether to generate moves with the bitboard backend. Defaults to False.
         """
         self.game = chess_game
+        self.use_bitboards = use_bitboards
+        self._bitboard_generator = BitboardMoveGenerator()
+        self._king_safety = None
+        self._king_safety_key = None
+        self._bitboard_cache = None
+        self._bitboard_key = None
+
+    def clear_cache(self):
+        """
+        Forgets the cached checks, pins, bitboards and moves, after the position has been replaced rather than
+        changed by a move.
+        """
+        self._king_safety = None
+        self._king_safety_key = None
+        self._bitboard_cache = None
+        self._bitboard_key = None
 
     def piece_legal_moves(self, piece: Piece) -> list[tuple[int, int]]:
         """
@@ -37,24 +70,227 @@ class MoveGenerator:
         Returns:
             list[tuple[int, int]]: List of legal moves, each move is represented by a tuple (x, y).
         """
-        legal_moves = []
+        if self.use_bitboards:
+            return list(self._bitboard_moves(piece.team)[2].get(piece.y * 8 + piece.x, ()))
+
+        return list(self._iter_piece_legal_moves(piece))
+
+    def _iter_piece_legal_moves(self, piece: Piece, tactical_only: bool = False) -> Iterator[tuple[int, int]]:
+        """
+        Generates the legal moves of a piece one at a time, with the Piece classes.
+
+        Args:
+            piece (Piece): The piece to generate legal moves for.
+            tactical_only (bool): Whether to generate captures and promotions only (see ``is_tactical``), which
+                                  skips the legality test of every other move. Defaults to False.
+
+        Yields:
+            tuple[int, int]: The (x, y) destination of each legal move.
+        """
+        # A King is safe on any square the enemy doesn't attack (its castling moves are checked by King.can_castle)
+        if isinstance(piece, King):
+            enemy_team = TeamType.OPPONENT if piece.team == TeamType.ALLY else TeamType.ALLY
+            enemy_attacks = None
+            for x, y in piece.pseudo_legal_moves(self.game):
+                if tactical_only and not self.is_tactical(piece, x, y):
+                    continue
+                if enemy_attacks is None:
+                    enemy_attacks = self.game.status.attack_map(enemy_team)
+                if not enemy_attacks.is_attacked(x, y):
+                    yield x, y
+            return
+
+        num_checkers, check_squares, pins = self._checks_and_pins(piece.team)
+        if num_checkers > 1:  # Only the King can answer a double check
+            return
+        pin = pins.get(piece)
+
+        for x, y in piece.pseudo_legal_moves(self.game):
+            if tactical_only and not self.is_tactical(piece, x, y):
+                continue
+            if isinstance(piece, Pawn) and x != piece.x and self.game.board.piece_at(x, y) is None:
+                # En passant also removes the captured pawn from the King's lines, so it is played out
+                if self._move_protects_king(px=piece.x, py=piece.y, x=x, y=y):
+                    yield x, y
+            elif (pin is None or (x, y) in pin) and (check_squares is None or (x, y) in check_squares):
+                yield x, y
+
+    def iter_legal_moves(self, team: TeamType) -> Iterator[tuple[Piece, tuple[int, int]]]:
+        """
+        Generates the legal moves of a team lazily, so callers that only need some of them can stop early.
+
+        Moves that most often exist when any move does come first: King moves, then captures, then the
+        other moves. The position must not change while the moves are being iterated.
+
+        Args:
+            team (TeamType): The team to generate legal moves for.
+
+        Yields:
+            tuple[Piece, tuple[int, int]]: Each legal move, as the piece and the (x, y) position it moves to.
+        """
+        if self.use_bitboards:
+            yield from self.team_legal_moves(team)
+            return
+
+        board = self.game.board
+        king = board.get_king(team)
+        for move in self._iter_piece_legal_moves(king):
+            yield king, move
+
+        quiet_moves = []
+        for piece in list(board.pieces):
+            if piece.team != team or piece is king:
+                continue
+            for x, y in self._iter_piece_legal_moves(piece):
+                if board.piece_at(x, y) is not None:
+                    yield piece, (x, y)
+                else:
+                    quiet_moves.append((piece, (x, y)))
+        yield from quiet_moves
+
+    def tactical_moves(self, team: TeamType) -> list[tuple[Piece, tuple[int, int]]]:
+        """
+        Calculates the legal captures (en passant included) and promotions of a team, without working out
+        whether its other moves are legal.
+
+        Args:
+            team (TeamType): The team to calculate the moves for.
+
+        Returns:
+            list[tuple[Piece, tuple[int, int]]]: The moves, as the piece and the (x, y) position it moves to.
+        """
+        if self.use_bitboards:
+            return [(piece, (x, y)) for piece, (x, y) in self._bitboard_moves(team)[1] if self.is_tactical(piece, x, y)]
+
+        return [(piece, move) for piece in list(self.game.board.pieces) if piece.team == team
+                for move in self._iter_piece_legal_moves(piece, tactical_only=True)]
+
+    def is_tactical(self, piece: Piece, x: int, y: int) -> bool:
+        """
+        Checks if a move is a capture (including "en passant") or a promotion.
+
+        Args:
+            piece (Piece): The piece to move.
+            x (int): The x-coordinate of the move destination.
+            y (int): The y-coordinate of the move destination.
+
+        Returns:
+            bool: True if the move is a capture or a promotion, False otherwise.
+        """
+        if self.game.board.piece_at(x, y) is not None:
+            return True
+        # A pawn moving sideways captures en passant, and a pawn reaching the last rank promotes
+        return isinstance(piece, Pawn) and (x != piece.x or y in (0, 7))
+
+    def is_in_check(self, team: TeamType) -> bool:
+        """
+        Checks if a team's King is in check, from the checks and pins the move generation works out anyway.
+
+        Args:
+            team (TeamType): The team of the King to check.
+
+        Returns:
+            bool: True if the King is in check, False otherwise.
+        """
+        if self.use_bitboards:
+            return self.bitboard(team).is_in_check(WHITE if team == TeamType.ALLY else BLACK)
+        return self._checks_and_pins(team)[0] > 0
 
-        # Generate all possible moves for the piece
-        for i in range(8):
-            for j in range(8):
-                # If the move is legal and either the king is not in check or the move protects the king
-                if piece.legal_move(px=piece.x, py=piece.y, x=i, y=j, chess_game=self.game) and \
-                        self._move_protects_king(px=piece.x, py=piece.y, x=i, y=j):
-                    legal_moves.append((i, j))
+    def has_any_legal_move(self, team: TeamType) -> bool:
+        """
+        Checks if a team has at least one legal move, stopping at the first one found.
 
-        return legal_moves
+        Args:
+            team (TeamType): The team to check.
+
+        Returns:
+            bool: True if the team can move, False otherwise.
+        """
+        return next(self.iter_legal_moves(team), None) is not None
+
+    def _checks_and_pins(self, team: TeamType) -> tuple[int, Optional[set], dict]:
+        """
+        Finds the enemy pieces giving check to a team's King and the team's pieces pinned to it.
+
+        The result is cached until the position changes, so all the pieces of a team share one computation.
+
+        Args:
+            team (TeamType): The team whose King to look at.
+
+        Returns:
+            tuple[int, Optional[set], dict]: The number of checking pieces; the (x, y) squares a non-King move
+            must land on to answer the check (the checking piece and the squares between it and the King),
+            or None if the King isn't in check; and the (x, y) squares each pinned piece may move to (its pin
+            line up to and including the pinning piece), keyed by the pinned piece.
+        """
+        key = (self.game.board.zobrist_key, team)
+        if key != self._king_safety_key:
+            self._king_safety = self._find_checks_and_pins(team)
+            self._king_safety_key = key
+        return self._king_safety
+
+    def _find_checks_and_pins(self, team: TeamType) -> tuple[int, Optional[set], dict]:
+        """
+        Looks outwards from a team's King for checking and pinning pieces.
+
+        Args:
+            team (TeamType): The team whose King to look at.
+
+        Returns:
+            tuple[int, Optional[set], dict]: See ``_checks_and_pins``.
+        """
+        board = self.game.board
+        king = board.get_king(team)
+        kx, ky = king.x, king.y
+        num_checkers, check_squares, pins = 0, None, {}
+
+        def add_checker(squares: set):
+            nonlocal num_checkers, check_squares
+            num_checkers += 1
+            check_squares = squares if check_squares is None else check_squares & squares
+
+        for dx, dy in KNIGHT_OFFSETS:
+            piece = board.piece_at(kx + dx, ky + dy)
+            if piece is not None and piece.team != team and piece.type == PieceType.KNIGHT:
+                add_checker({(piece.x, piece.y)})
+
+        # Enemy pawns attack the King from the rank in front of it
+        pawn_y = ky - 1 if team == TeamType.ALLY else ky + 1
+        for pawn_x in (kx - 1, kx + 1):
+            piece = board.piece_at(pawn_x, pawn_y)
+            if piece is not None and piece.team != team and piece.type == PieceType.PAWN:
+                add_checker({(piece.x, piece.y)})
+
+        for directions, slider_type in ((LINEAR_DIRECTIONS, PieceType.ROOK), (DIAGONAL_DIRECTIONS, PieceType.BISHOP)):
+            for dx, dy in directions:
+                line, blocker = set(), None
+                x, y = kx + dx, ky + dy
+                while 0 <= x < 8 and 0 <= y < 8:
+                    line.add((x, y))
+                    piece = board.piece_at(x, y)
+                    if piece is not None:
+                        if piece.team == team:
+                            if blocker is not None:  # Two of the team's pieces shield the King
+                                break
+                            blocker = piece
+                        else:
+                            if piece.type in (slider_type, PieceType.QUEEN):
+                                if blocker is None:
+                                    add_checker(line)
+                                else:
+                                    pins[blocker] = line
+                            break
+                    x, y = x + dx, y + dy
+        return num_checkers, check_squares, pins
 
     def _move_protects_king(self, px: int, py: int, x: int, y: int) -> bool:
         """
         Checks if a proposed move would result in the current player's King being in check.
 
-        The method creates a temporary copy of the chess game, makes the proposed move in this copied game state,
-        and then checks if the resulting board would put the King in check. The real chess game remains unaffected.
+        The method plays the proposed move in place with ``GameEngine.make_move``, checks if the resulting
+        board would put the King in check (looking outwards from the King, rather than building attack maps of a
+        position that is only looked at once), and then takes the move back with ``GameEngine.unmake_move``,
+        so the real chess game is left unchanged.
 
         Args:
             px (int): The current x-coordinate of the piece that is proposed to be moved.
@@ -65,10 +301,14 @@ class MoveGenerator:
         Returns:
             bool: True if the proposed move would not result in the King being in check, False otherwise.
         """
-        temp_game = self.game.copy()
-        temp_piece = temp_game.board.piece_at(x=px, y=py)
-        temp_game.engine.move_piece(piece=temp_piece, new_x=x, new_y=y)
-        return not temp_game.status.is_in_check(temp_piece.team)
+        engine = self.game.engine
+        piece = self.game.board.piece_at(x=px, y=py)
+        record = engine.make_move(piece=piece, new_x=x, new_y=y)
+        king = self.game.board.get_king(piece.team)
+        enemy_team = TeamType.OPPONENT if piece.team == TeamType.ALLY else TeamType.ALLY
+        in_check = is_square_attacked(self.game.board, king.x, king.y, enemy_team)
+        engine.unmake_move(record)
+        return not in_check
 
     def current_team_legal_moves(self) -> list[tuple[Piece, tuple[int, int]]]:
         """
@@ -79,5 +319,62 @@ class MoveGenerator:
             where the first element is the piece and the second element is a tuple (x, y) representing
             the new position.
         """
-        return [(piece, move) for piece in self.game.board.pieces if piece.team == self.game.current_player.team
+        return self.team_legal_moves(self.game.current_player.team)
+
+    def team_legal_moves(self, team: TeamType) -> list[tuple[Piece, tuple[int, int]]]:
+        """
+        Calculates all legal moves for a team.
+
+        Args:
+            team (TeamType): The team to calculate legal moves for.
+
+        Returns:
+            list[tuple[Piece, tuple[int, int]]]: List of legal moves, each move is represented by a tuple
+            where the first element is the piece and the second element is a tuple (x, y) representing
+            the new position.
+        """
+        if self.use_bitboards:
+            return list(self._bitboard_moves(team)[1])
+
+        return [(piece, move) for piece in self.game.board.pieces if piece.team == team
                 for move in self.piece_legal_moves(piece)]
+
+    def bitboard(self, team: TeamType) -> Bitboard:
+        """
+        Returns the bitboards of the current position, with the given team to move.
+
+        Args:
+            team (TeamType): The team to move.
+
+        Returns:
+            Bitboard: The bitboards of the position. They are cached with the position's moves and must not be
+            changed.
+        """
+        return self._bitboard_moves(team)[0]
+
+    def _bitboard_moves(self, team: TeamType) -> tuple[Bitboard, list[tuple[Piece, tuple[int, int]]], dict]:
+        """
+        Generates the legal moves of a team with the bitboard backend.
+
+        The bitboards and moves are cached until the position changes, so all the pieces of a team, and the
+        check test of the position, share one generation.
+
+        Args:
+            team (TeamType): The team to generate moves for.
+
+        Returns:
+            tuple[Bitboard, list, dict]: The bitboards of the position; the legal moves, as (piece, (x, y))
+            tuples; and the (x, y) destinations of the moves of each piece, keyed by its square (``y * 8 + x``).
+        """
+        key = (self.game.board.zobrist_key, team)
+        if key != self._bitboard_key:
+            board = self.game.board
+            bitboard = Bitboard.from_game(self.game, team)
+            moves, moves_by_square = [], {}
+            for from_square, to_square in self._bitboard_generator.legal_moves(bitboard):
+                move = (to_square % 8, to_square // 8)
+                moves.append((board.piece_at(from_square % 8, from_square // 8), move))
+                moves_by_square.setdefault(from_square, []).append(move)
+            self._bitboard_cache = (bitboard, moves, moves_by_square)
+            self._bitboard_key = key
+        return self._bitboard_cache
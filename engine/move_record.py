@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from typing import Optional
+from pieces import Piece, Rook
+from engine.move import Move
+from engine.game_event import GameEvent
+
+
+@dataclass
+class MoveRecord:
+    """
+    A class used to represent everything needed to take back a move made with ``GameEngine.make_move``.
+
+    Attributes:
+        piece (Piece): The piece that was moved.
+        start_position (tuple[int, int]): The (x, y) position the piece moved from.
+        end_position (tuple[int, int]): The (x, y) position the piece moved to.
+        has_moved (bool): The piece's ``has_moved`` flag before the move.
+        last_move (Move): The engine's last move before the move.
+        event (GameEvent or None): The game's event before the move.
+        zobrist_key (int): The board's Zobrist key before the move.
+        halfmove_clock (int): The engine's halfmove clock before the move.
+        fullmove_number (int): The engine's fullmove number before the move.
+        captured (Piece or None): The piece that was captured, including a pawn captured "en passant".
+        captured_index (int): The position of the captured piece in the board's piece list.
+        rook (Rook or None): The rook that was moved along with the king when castling.
+        rook_start_x (int): The x-coordinate the castling rook moved from.
+        rook_has_moved (bool): The castling rook's ``has_moved`` flag before the move.
+        promotion (Piece or None): The piece the moved pawn was promoted to.
+        piece_index (int): The position of the promoted pawn in the board's piece list.
+    """
+    piece: Piece
+    start_position: tuple[int, int]
+    end_position: tuple[int, int]
+    has_moved: bool
+    last_move: Move
+    event: Optional[GameEvent] = None
+    zobrist_key: int = 0
+    halfmove_clock: int = 0
+    fullmove_number: int = 1
+    captured: Optional[Piece] = None
+    captured_index: int = -1
+    rook: Optional[Rook] = None
+    rook_start_x: int = -1
+    rook_has_moved: bool = False
+    promotion: Optional[Piece] = None
+    piece_index: int = -1
@@ -0,0 +1,272 @@
+"""
+Opening book stored in a memory-mapped binary file.
+
+The file uses the Polyglot book layout: a sequence of 16-byte big-endian records (position key, move,
+weight, learn data), sorted by position key. A lookup is a binary search over the memory-mapped file, so
+opening a book costs nothing up front, and only the pages actually searched are ever read into memory,
+however large the book is.
+
+The position keys are this engine's own Zobrist keys (``Board.zobrist_key``), not the Polyglot ones, so
+books built here are not interchangeable with Polyglot books. Moves are encoded like Polyglot moves
+(castling included, written as the king capturing its own rook).
+
+Books are built from PGN files, e.g. the games written by self-play runs:
+```
+python -m engine.self_play --games 1000 --white search:depth=3 --black search:depth=3 --pgn games.pgn
+python -m engine.opening_book games.pgn --output book.bin --plies 16
+```
+"""
+import argparse
+import mmap
+import os
+import random
+import struct
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING
+
+from engine.move import Move
+from engine.pgn import read_games, replay
+from pieces import Piece, Knight, Bishop, Rook, Queen
+from utils.type import PieceType
+
+if TYPE_CHECKING:
+    from engine import ChessGame
+
+ENTRY = struct.Struct('>QHHI')
+"""The layout of a book entry: position key, move, weight and learn data, big-endian (16 bytes)."""
+
+BOOK_PROMOTIONS = (None, Knight, Bishop, Rook, Queen)
+"""The promotion pieces, in the order of their code in a book move."""
+
+MAX_WEIGHT = 0xFFFF
+"""The largest weight a book entry can hold."""
+
+
+@dataclass(frozen=True)
+class BookEntry:
+    """
+    A move of an opening book.
+
+    Attributes:
+        key (int): The Zobrist key of the position the move is played from.
+        move (int): The move, encoded with ``encode_book_move``.
+        weight (int): How often the move should be chosen, relative to the other moves of the position.
+        learn (int): Learn data, unused by this engine and kept as 0.
+    """
+    key: int
+    move: int
+    weight: int
+    learn: int = 0
+
+
+def encode_book_move(move: Move) -> int:
+    """
+    Encodes a move in the Polyglot book format: the to file and row in bits 0-5, the from file and row in bits
+    6-11 and the promotion piece in bits 12-14. Rows count from the 1st rank, and castling moves are encoded
+    as the king moving to its rook's square.
+
+    Args:
+        move (Move): The move.
+
+    Returns:
+        int: The 16-bit book move.
+    """
+    (from_x, from_y), (to_x, to_y) = move.start_position, move.end_position
+    if move.is_king_side_castle:
+        to_x = 7
+    elif move.is_queen_side_castle:
+        to_x = 0
+    return to_x | (7 - to_y) << 3 | from_x << 6 | (7 - from_y) << 9 | BOOK_PROMOTIONS.index(move.promotion) << 12
+
+
+def decode_book_move(chess_game: 'ChessGame', book_move: int) -> Optional[tuple[Piece, int, int, Optional[type[Piece]]]]:
+    """
+    Decodes a book move in the current position of a game, and checks that it is legal there (different
+    positions can share a key).
+
+    Args:
+        chess_game (ChessGame): The chess game being played.
+        book_move (int): The 16-bit book move.
+
+    Returns:
+        tuple or None: The move as (piece, x, y, promotion class or None), or None if it isn't a legal move of
+        the player to move.
+    """
+    to_x, to_y = book_move & 7, 7 - (book_move >> 3 & 7)
+    from_x, from_y = book_move >> 6 & 7, 7 - (book_move >> 9 & 7)
+    promotion = book_move >> 12 & 7
+    piece = chess_game.board.piece_at(from_x, from_y)
+    if piece is None or piece.team != chess_game.current_player.team or promotion >= len(BOOK_PROMOTIONS):
+        return None
+    if piece.type == PieceType.KING and from_x == 4 and to_x in (0, 7) and to_y == from_y:
+        to_x = 6 if to_x == 7 else 2  # Castling, written as the king taking its own rook
+    if (to_x, to_y) not in chess_game.move_generator.piece_legal_moves(piece):
+        return None
+    return piece, to_x, to_y, BOOK_PROMOTIONS[promotion]
+
+
+class OpeningBook:
+    """
+    A read-only opening book, searched in place in its memory-mapped file.
+
+    Attributes:
+        path (str): The path of the book file.
+        num_entries (int): The number of entries in the book.
+    """
+
+    def __init__(self, path: str or os.PathLike):
+        """
+        Opens an opening book.
+
+        Args:
+            path (str or os.PathLike): The path of the book file.
+
+        Raises:
+            ValueError: If the file size isn't a whole number of entries.
+        """
+        self.path = os.fspath(path)
+        with open(self.path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size % ENTRY.size:
+                raise ValueError(f"Invalid opening book '{self.path}': its size isn't a multiple of {ENTRY.size} bytes")
+            # An empty file can't be mapped, and has nothing to search anyway
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.num_entries = size // ENTRY.size
+
+    def __getstate__(self) -> dict:
+        """
+        Pickles (and copies) the book as its path: the copy maps the file again.
+        """
+        return {'path': self.path}
+
+    def __setstate__(self, state: dict):
+        """
+        Restores a pickled book by opening its file.
+        """
+        self.__init__(state['path'])
+
+    def __enter__(self) -> 'OpeningBook':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Unmaps the book file.
+        """
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b''
+        self.num_entries = 0
+
+    def entries(self, key: int) -> list[BookEntry]:
+        """
+        Returns the book entries of a position.
+
+        Args:
+            key (int): The Zobrist key of the position.
+
+        Returns:
+            list[BookEntry]: The entries of the position, in book order (which is usually by decreasing weight).
+        """
+        data = self._data
+        low, high = 0, self.num_entries
+        while low < high:  # Find the first entry with a key not below the position's
+            middle = (low + high) // 2
+            if struct.unpack_from('>Q', data, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        entries = []
+        for index in range(low, self.num_entries):
+            entry = BookEntry(*ENTRY.unpack_from(data, index * ENTRY.size))
+            if entry.key != key:
+                break
+            entries.append(entry)
+        return entries
+
+    def choose_move(self, chess_game: 'ChessGame') -> Optional[tuple[Piece, int, int, Optional[type[Piece]]]]:
+        """
+        Picks a book move for the current position of a game, at random, in proportion to the move weights.
+
+        Args:
+            chess_game (ChessGame): The chess game being played.
+
+        Returns:
+            tuple or None: The move as (piece, x, y, promotion class or None), or None if the position isn't in
+            the book.
+        """
+        moves, weights = [], []
+        for entry in self.entries(chess_game.board.zobrist_key):
+            move = decode_book_move(chess_game, entry.move) if entry.weight > 0 else None
+            if move is not None:
+                moves.append(move)
+                weights.append(entry.weight)
+        if not moves:
+            return None
+        return random.choices(moves, weights=weights)[0]
+
+
+def build_book(pgn_paths: list[str], output: str, max_plies: int = 16, min_games: int = 1) -> int:
+    """
+    Builds an opening book from the games of PGN files.
+
+    Every move played in the first plies of a game is counted for the position it was played from: 2 points
+    when the player who played it went on to win, 1 for a draw or an unfinished game and none for a loss.
+    The points of each move become its weight, scaled down to fit an entry if needed. Moves that score nothing
+    are left out, so the book only suggests moves that did not lose.
+
+    Args:
+        pgn_paths (list[str]): The PGN files to read.
+        output (str): The path of the book file to write (overwritten).
+        max_plies (int): How many plies of each game go into the book. Defaults to 16.
+        min_games (int): The number of games a move must have been played in to be kept. Defaults to 1.
+
+    Returns:
+        int: The number of entries written.
+    """
+    points = defaultdict(int)
+    games = defaultdict(int)
+    for path in pgn_paths:
+        for pgn_game in read_games(path):
+            white_points = {'1-0': 2, '0-1': 0}.get(pgn_game.result, 1)
+            for ply, (chess_game, move) in enumerate(replay(pgn_game, validate=False)):
+                if ply >= max_plies:
+                    break
+                entry = (chess_game.board.zobrist_key, encode_book_move(move))
+                points[entry] += white_points if move.piece.is_white else 2 - white_points
+                games[entry] += 1
+
+    entries = [(key, move, score) for (key, move), score in points.items()
+               if score > 0 and games[(key, move)] >= min_games]
+    scale = max((score for _, _, score in entries), default=0) / MAX_WEIGHT
+    # Within a position, the most played moves come first, as in Polyglot books
+    entries.sort(key=lambda entry: (entry[0], -entry[2], entry[1]))
+    with open(output, 'wb') as file:
+        for key, move, score in entries:
+            weight = max(1, int(score / scale)) if scale > 1 else score
+            file.write(ENTRY.pack(key, move, weight, 0))
+    return len(entries)
+
+
+def main():
+    """
+    Command line entry point of the opening book builder.
+    """
+    parser = argparse.ArgumentParser(description="Build an opening book from PGN files.")
+    parser.add_argument('pgn', nargs='+', help="the PGN files to read")
+    parser.add_argument('--output', default='book.bin', help="the book file to write (default: book.bin)")
+    parser.add_argument('--plies', type=int, default=16, help="how many plies of each game to use (default: 16)")
+    parser.add_argument('--min-games', type=int, default=1,
+                        help="how many games a move must appear in to be kept (default: 1)")
+    args = parser.parse_args()
+
+    num_entries = build_book(args.pgn, args.output, args.plies, args.min_games)
+    print(f"{num_entries} entries -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
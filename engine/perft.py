@@ -0,0 +1,199 @@
+"""
+Perft (performance test) driver for the move generator.
+
+Perft counts the leaf nodes of the legal move tree to a fixed depth. Comparing the counts against known
+reference values catches move generation bugs (castling, en passant, promotion, pins), and the time it
+takes gives a nodes-per-second figure to track across optimizations.
+
+Usage (from the project root):
+```
+python -m engine.perft                      # run the reference suite
+python -m engine.perft --depth 3            # run the reference suite up to depth 3
+python -m engine.perft --fen "<fen>" --depth 2 --divide
+```
+"""
+import argparse
+import time
+from typing import Optional
+
+from engine.chess_game import ChessGame, START_FEN
+from pieces import Piece, Pawn, Knight, Bishop, Rook, Queen
+from utils.type import TeamType
+
+REFERENCE_POSITIONS: dict[str, tuple[str, list[int]]] = {
+    'start': (START_FEN, [20, 400, 8902, 197281, 4865609]),
+    'kiwipete': ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                 [48, 2039, 97862, 4085603]),
+    'en passant': ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', [14, 191, 2812, 43238, 674624]),
+    'promotion': ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', [6, 264, 9467, 422333]),
+    'promotion 2': ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', [44, 1486, 62379, 2103487]),
+    'middlegame': ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+                   [46, 2079, 89890, 3894594])
+}
+"""Reference positions (FEN, node counts from depth 1 upwards), from the Chess Programming Wiki perft results."""
+
+PROMOTION_PIECES = (Queen, Rook, Bishop, Knight)
+
+
+def _promotions(piece: Piece, x: int, y: int) -> list[Optional[Piece]]:
+    """
+    Returns the promotion choices of a move: one of each promotion piece if the move promotes, or [None].
+
+    Args:
+        piece (Piece): The piece to move.
+        x (int): The x-coordinate of the move destination.
+        y (int): The y-coordinate of the move destination.
+
+    Returns:
+        list[Optional[Piece]]: The pieces the move can promote to, or [None] if it doesn't promote.
+    """
+    if isinstance(piece, Pawn) and y == (0 if piece.team == TeamType.ALLY else 7):
+        return [piece_class(x=x, y=y, team=piece.team, is_white=piece.is_white) for piece_class in PROMOTION_PIECES]
+    return [None]
+
+
+def _move_name(piece: Piece, x: int, y: int, promotion_piece: Optional[Piece]) -> str:
+    """
+    Returns the move in long algebraic notation (e.g. 'e2e4', 'e7e8q'), as used by perft divide output.
+    """
+    name = f"{chr(piece.x + 97)}{8 - piece.y}{chr(x + 97)}{8 - y}"
+    if promotion_piece is not None:
+        name += promotion_piece.symbol.lower()
+    return name
+
+
+def perft(chess_game: ChessGame, depth: int) -> int:
+    """
+    Counts the leaf nodes of the legal move tree of the current position to the given depth.
+
+    Moves are generated with ``MoveGenerator.current_team_legal_moves`` and played with
+    ``GameEngine.make_move`` (the move application behind ``GameEngine.move_piece``), then taken back
+    with ``GameEngine.unmake_move``. Each promotion counts as four moves, one per promotion piece.
+
+    Args:
+        chess_game (ChessGame): The chess game, positioned at the root of the tree.
+        depth (int): The number of plies to search.
+
+    Returns:
+        int: The number of leaf nodes.
+    """
+    if depth == 0:
+        return 1
+
+    moves = chess_game.move_generator.current_team_legal_moves()
+    if depth == 1:
+        return sum(len(_promotions(piece, x, y)) for piece, (x, y) in moves)
+
+    engine = chess_game.engine
+    nodes = 0
+    for piece, (x, y) in moves:
+        for promotion_piece in _promotions(piece, x, y):
+            record = engine.make_move(piece, x, y, promotion_piece)
+            chess_game.switch_player()
+            nodes += perft(chess_game, depth - 1)
+            chess_game.switch_player()
+            engine.unmake_move(record)
+    return nodes
+
+
+def divide(chess_game: ChessGame, depth: int) -> dict[str, int]:
+    """
+    Counts the leaf nodes below each root move, which helps narrowing down a wrong perft count.
+
+    Args:
+        chess_game (ChessGame): The chess game, positioned at the root of the tree.
+        depth (int): The number of plies to search (at least 1).
+
+    Returns:
+        dict[str, int]: The node count of each root move, keyed by its long algebraic notation.
+    """
+    engine = chess_game.engine
+    subtotals = {}
+    for piece, (x, y) in chess_game.move_generator.current_team_legal_moves():
+        for promotion_piece in _promotions(piece, x, y):
+            name = _move_name(piece, x, y, promotion_piece)
+            record = engine.make_move(piece, x, y, promotion_piece)
+            chess_game.switch_player()
+            subtotals[name] = perft(chess_game, depth - 1)
+            chess_game.switch_player()
+            engine.unmake_move(record)
+    return subtotals
+
+
+def new_game(fen: str = START_FEN, use_bitboards: bool = False) -> ChessGame:
+    """
+    Creates a chess game without a user interface, set up at the given position.
+
+    Args:
+        fen (str): The position in Forsyth-Edwards Notation. Defaults to the starting position.
+        use_bitboards (bool): Whether to generate moves with the bitboard backend. Defaults to False.
+
+    Returns:
+        ChessGame: The chess game.
+    """
+    chess_game = ChessGame.from_fen(fen)
+    chess_game.move_generator.use_bitboards = use_bitboards
+    return chess_game
+
+
+def run_suite(max_depth: int = 2, use_bitboards: bool = False) -> bool:
+    """
+    Runs perft on every reference position up to the given depth, printing node counts,
+    whether they match the reference values, and the nodes searched per second.
+
+    Args:
+        max_depth (int): The deepest depth to search. Defaults to 2.
+        use_bitboards (bool): Whether to generate moves with the bitboard backend. Defaults to False.
+
+    Returns:
+        bool: True if every node count matched its reference value, False otherwise.
+    """
+    all_passed = True
+    total_nodes, total_time = 0, 0.0
+    for name, (fen, expected_counts) in REFERENCE_POSITIONS.items():
+        chess_game = new_game(fen, use_bitboards)
+        for depth, expected in enumerate(expected_counts[:max_depth], start=1):
+            start = time.perf_counter()
+            nodes = perft(chess_game, depth)
+            elapsed = time.perf_counter() - start
+            passed = nodes == expected
+            all_passed = all_passed and passed
+            total_nodes += nodes
+            total_time += elapsed
+            print(f"{name:<12} depth {depth}  nodes {nodes:>9}  expected {expected:>9}  "
+                  f"{'ok  ' if passed else 'FAIL'}  {elapsed:8.3f}s  {nodes / max(elapsed, 1e-9):>10.0f} nps")
+
+    print(f"total        {total_nodes} nodes in {total_time:.3f}s ({total_nodes / max(total_time, 1e-9):.0f} nps)")
+    return all_passed
+
+
+def main():
+    """
+    Command line entry point of the perft driver.
+    """
+    parser = argparse.ArgumentParser(description="Count and time move generation (perft).")
+    parser.add_argument('--depth', type=int, default=2, help="the depth to search (default: 2)")
+    parser.add_argument('--fen', help="search this position instead of running the reference suite")
+    parser.add_argument('--divide', action='store_true', help="print the node count below each root move")
+    parser.add_argument('--bitboards', action='store_true', help="generate moves with the bitboard backend")
+    args = parser.parse_args()
+
+    if args.fen is None and not args.divide:
+        raise SystemExit(0 if run_suite(args.depth, args.bitboards) else 1)
+
+    chess_game = new_game(args.fen or START_FEN, args.bitboards)
+    start = time.perf_counter()
+    if args.divide:
+        subtotals = divide(chess_game, args.depth)
+        for name, nodes in sorted(subtotals.items()):
+            print(f"{name}: {nodes}")
+        nodes = sum(subtotals.values())
+        print(f"\nmoves: {len(subtotals)}")
+    else:
+        nodes = perft(chess_game, args.depth)
+    elapsed = time.perf_counter() - start
+    print(f"nodes: {nodes}  time: {elapsed:.3f}s  nps: {nodes / max(elapsed, 1e-9):.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,386 @@
+"""
+Portable Game Notation (PGN) export and import.
+
+Games are written from the moves played through ``ChessGame.make_move`` (the game's move history), in
+standard algebraic notation (SAN) with proper disambiguation, check and checkmate marks.
+
+Games are read one at a time by a generator that consumes its input line by line, so game databases of any
+size can be processed without loading them into memory. Comments, annotation glyphs and variations are
+skipped. A game read from a PGN file can then be replayed through the engine, either with full legality
+checks and game state updates (``validate=True``) or with a fast replay that trusts the moves and only moves
+the pieces.
+
+Example:
+```
+with open('games.pgn', encoding='utf-8') as file:
+    for pgn_game in read_games(file):
+        for chess_game, move in replay(pgn_game, validate=False):
+            ...  # The position before each move, and the move played from it
+```
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+from engine.chess_game import ChessGame, START_FEN
+from engine.game_event import GameEvent, DRAW_EVENTS
+from engine.move import Move
+from pieces import Piece, King, Pawn, Knight, Bishop, Rook, Queen
+from utils.type import PieceType, TeamType
+
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+"""The game termination markers of PGN movetext."""
+
+SAN_PIECES = {'N': Knight, 'B': Bishop, 'R': Rook, 'Q': Queen, 'K': King}
+"""The piece classes of the SAN piece letters (pawns have no letter)."""
+
+_SAN_LETTERS = {piece_class: letter for letter, piece_class in SAN_PIECES.items()}
+
+# Draws a player has to claim: over the board the game goes on if nobody does, so recorded games can go past them
+_CLAIMABLE_DRAWS = (GameEvent.THREEFOLD_REPETITION, GameEvent.FIFTY_MOVE_RULE)
+
+_SAN = re.compile(r'([NBRQK])?([a-h])?([1-8])?x?([a-h])([1-8])(?:=?([NBRQ]))?')
+_TAG = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*]')
+_TOKEN = re.compile(r'\{[^}]*}|\{.*|;.*|[()]|[^\s(){};]+')
+_MOVE_NUMBER = re.compile(r'^\d+\.*')
+
+_LINE_LENGTH = 79
+
+
+@dataclass
+class PgnGame:
+    """
+    A game read from a PGN file.
+
+    Attributes:
+        headers (dict[str, str]): The tag pairs of the game, e.g. {'White': 'Carlsen, Magnus'}.
+        moves (list[str]): The moves of the main line, in SAN, without move numbers, comments or annotations.
+        result (str): The result of the game: '1-0', '0-1', '1/2-1/2', or '*' if it is unknown or unfinished.
+    """
+    headers: dict[str, str] = field(default_factory=dict)
+    moves: list[str] = field(default_factory=list)
+    result: str = '*'
+
+    @property
+    def fen(self) -> str:
+        """Returns the FEN of the position the game starts from."""
+        return self.headers.get('FEN', START_FEN)
+
+
+def game_result(chess_game: ChessGame) -> str:
+    """
+    Returns the result of a game in PGN notation.
+
+    Args:
+        chess_game (ChessGame): The chess game.
+
+    Returns:
+        str: '1-0' or '0-1' if a side has been checkmated, '1/2-1/2' if the game is drawn, '*' otherwise.
+    """
+    if chess_game.state == GameEvent.CHECKMATE:
+        return '1-0' if chess_game.get_winner().team == TeamType.ALLY else '0-1'
+    if chess_game.state in DRAW_EVENTS:
+        return '1/2-1/2'
+    return '*'
+
+
+def _square_name(x: int, y: int) -> str:
+    """
+    Returns the algebraic name of a square, e.g. 'e4'.
+    """
+    return f"{chr(x + 97)}{8 - y}"
+
+
+def _san(chess_game: ChessGame, piece: Piece, x: int, y: int, promotion: Optional[type[Piece]]) -> str:
+    """
+    Returns the SAN of a legal move in the current position of a game, without its check or checkmate mark.
+    """
+    if piece.type == PieceType.KING and abs(x - piece.x) == 2:
+        return 'O-O' if x > piece.x else 'O-O-O'
+
+    board = chess_game.board
+    is_capture = board.piece_at(x, y) is not None
+    if piece.type == PieceType.PAWN:
+        if x != piece.x:  # Pawns only change files when capturing, "en passant" included
+            san = f"{chr(piece.x + 97)}x{_square_name(x, y)}"
+        else:
+            san = _square_name(x, y)
+        if promotion is not None:
+            san += f"={_SAN_LETTERS[promotion]}"
+        return san
+
+    # Name the file, the rank, or both of the piece if another one of the same kind can also move there
+    rivals = [other for other in board.pieces
+              if other is not piece and other.type == piece.type and other.team == piece.team and
+              (x, y) in chess_game.move_generator.piece_legal_moves(other)]
+    disambiguation = ''
+    if rivals:
+        if all(other.x != piece.x for other in rivals):
+            disambiguation = chr(piece.x + 97)
+        elif all(other.y != piece.y for other in rivals):
+            disambiguation = str(8 - piece.y)
+        else:
+            disambiguation = _square_name(piece.x, piece.y)
+    return f"{_SAN_LETTERS[type(piece)]}{disambiguation}{'x' if is_capture else ''}{_square_name(x, y)}"
+
+
+def san_moves(chess_game: ChessGame) -> list[str]:
+    """
+    Returns the moves played in a game in standard algebraic notation, by replaying its move history from its
+    starting position.
+
+    Args:
+        chess_game (ChessGame): The chess game.
+
+    Returns:
+        list[str]: The moves in SAN, e.g. ['e4', 'e5', 'Nf3', 'Nc6', 'Bb5', 'a6'].
+    """
+    replay_game = ChessGame.from_fen(chess_game.start_fen)
+    sans = []
+    for move in chess_game.move_history:
+        (start_x, start_y), (x, y) = move.start_position, move.end_position
+        piece = replay_game.board.piece_at(start_x, start_y)
+        san = _san(replay_game, piece, x, y, move.promotion)
+        promotion_piece = None
+        if move.promotion is not None:
+            promotion_piece = move.promotion(x=x, y=y, team=piece.team, is_white=piece.is_white)
+        replay_game.make_move(piece, x, y, promotion_piece)
+        replay_game.switch_player()
+        last_move = replay_game.engine.last_move
+        sans.append(san + ('#' if last_move.is_checkmate else '+' if last_move.is_check else ''))
+    return sans
+
+
+def _escape(value: str) -> str:
+    """
+    Escapes the backslashes and quotes of a tag value.
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def write_game(chess_game: ChessGame, headers: Optional[dict[str, str]] = None) -> str:
+    """
+    Writes a game in PGN.
+
+    The Seven Tag Roster is always written, filled in from the game where possible (the player names and the
+    result) and with the PGN "unknown" values otherwise. Games that don't start from the standard starting
+    position also get the SetUp and FEN tags.
+
+    Args:
+        chess_game (ChessGame): The chess game.
+        headers (dict[str, str], optional): Tag pairs to add, or to use in place of the default ones.
+
+    Returns:
+        str: The game in PGN, ending with an empty line.
+    """
+    result = game_result(chess_game)
+    tags = {'Event': '?', 'Site': '?', 'Date': '????.??.??', 'Round': '?',
+            'White': chess_game.players[0].name, 'Black': chess_game.players[1].name, 'Result': result}
+    if chess_game.start_fen != START_FEN:
+        tags.update({'SetUp': '1', 'FEN': chess_game.start_fen})
+    tags.update(headers or {})
+    lines = [f'[{name} "{_escape(value)}"]' for name, value in tags.items()]
+    lines.append('')
+
+    # Number the moves from the starting position's fullmove number and side to move
+    fen_fields = chess_game.start_fen.split()
+    white_to_move = fen_fields[1] == 'w'
+    move_number = int(fen_fields[5]) if len(fen_fields) == 6 else 1
+    tokens = []  # Move numbers are kept on the same line as the move they number
+    for san in san_moves(chess_game):
+        if white_to_move:
+            tokens.append(f"{move_number}. {san}")
+        elif not tokens:
+            tokens.append(f"{move_number}... {san}")
+        else:
+            tokens.append(san)
+        if not white_to_move:
+            move_number += 1
+        white_to_move = not white_to_move
+    tokens.append(tags['Result'])
+
+    line = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > _LINE_LENGTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return '\n'.join(lines) + '\n\n'
+
+
+def read_games(source: str or os.PathLike or Iterable[str]) -> Iterator[PgnGame]:
+    """
+    Reads the games of a PGN file one at a time.
+
+    The input is consumed line by line, and only the game being read is held in memory.
+
+    Args:
+        source (str or os.PathLike or Iterable[str]): The path of the PGN file, or an open text file (or any
+                                                      iterable of lines).
+
+    Yields:
+        PgnGame: The games, in the order they appear in the input.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8', errors='replace') as file:
+            yield from read_games(file)
+        return
+
+    game = PgnGame()
+    in_comment = False
+    variation_depth = 0
+    for line in source:
+        if in_comment:  # Skip the rest of a multi-line comment
+            end = line.find('}')
+            if end < 0:
+                continue
+            line = line[end + 1:]
+            in_comment = False
+        elif line.startswith('%'):  # Escaped line
+            continue
+
+        if variation_depth == 0 and line.lstrip().startswith('['):
+            if game.moves:  # A new game starts, although the previous one had no termination marker
+                game.result = game.headers.get('Result', '*')
+                yield game
+                game = PgnGame()
+            for name, value in _TAG.findall(line):
+                game.headers[name] = re.sub(r'\\(.)', r'\1', value)
+            continue
+
+        for token in _TOKEN.findall(line):
+            first = token[0]
+            if first == '{':
+                in_comment = not token.endswith('}')
+            elif first == ';':
+                break
+            elif first == '(':
+                variation_depth += 1
+            elif first == ')':
+                variation_depth = max(variation_depth - 1, 0)
+            elif variation_depth > 0 or first == '$':
+                continue
+            elif token in RESULTS:
+                game.result = token
+                yield game
+                game = PgnGame()
+            else:
+                san = _MOVE_NUMBER.sub('', token).rstrip('!?')
+                if san:
+                    game.moves.append(san)
+
+    if game.moves or game.headers:
+        game.result = game.headers.get('Result', '*')
+        yield game
+
+
+def _resolve(chess_game: ChessGame, san: str, validate: bool) -> tuple[Piece, int, int, Optional[type[Piece]]]:
+    """
+    Finds the piece, destination and promotion of a SAN move in the current position of a game.
+
+    Raises:
+        ValueError: If the move is malformed, or no piece (or more than one) of the side to move can play it.
+    """
+    team = chess_game.current_player.team
+    board = chess_game.board
+    castle = san.rstrip('+#').replace('0', 'O')
+    if castle in ('O-O', 'O-O-O'):
+        king = board.get_king(team)
+        if king is None:
+            raise ValueError(f"Illegal move '{san}': no king to castle")
+        return king, 6 if castle == 'O-O' else 2, king.y, None
+
+    match = _SAN.match(san)
+    if match is None:
+        raise ValueError(f"Invalid SAN move: '{san}'")
+    letter, from_file, from_rank, to_file, to_rank, promotion = match.groups()
+    piece_class = SAN_PIECES[letter] if letter else Pawn
+    x, y = ord(to_file) - 97, 8 - int(to_rank)
+
+    candidates = [piece for piece in board.pieces
+                  if piece.team == team and type(piece) is piece_class and
+                  (from_file is None or piece.x == ord(from_file) - 97) and
+                  (from_rank is None or piece.y == 8 - int(from_rank))]
+    if validate:
+        candidates = [piece for piece in candidates if (x, y) in chess_game.move_generator.piece_legal_moves(piece)]
+    elif len(candidates) > 1:
+        candidates = [piece for piece in candidates if (x, y) in piece.pseudo_legal_moves(chess_game)]
+        if len(candidates) > 1:  # SAN only disambiguates between legal moves, so one of them may be pinned
+            candidates = [piece for piece in candidates
+                          if (x, y) in chess_game.move_generator.piece_legal_moves(piece)]
+    if len(candidates) != 1:
+        raise ValueError(f"{'Ambiguous' if candidates else 'Illegal'} move '{san}' in position "
+                         f"'{chess_game.fen()}'")
+    return candidates[0], x, y, SAN_PIECES[promotion] if promotion else None
+
+
+def replay(pgn_game: PgnGame, validate: bool = True) -> Iterator[tuple[ChessGame, Move]]:
+    """
+    Replays a game read from a PGN file.
+
+    With validation, every move goes through ``ChessGame.make_move``: it must be legal, and the game keeps its
+    state (check, checkmate, draws) and move history up to date. Without it, the moves are only matched to the
+    pieces that play them and made on the board (captures, castling, "en passant", promotions and the Zobrist
+    key included), which is several times faster for trusted input such as game databases.
+
+    Args:
+        pgn_game (PgnGame): The game to replay.
+        validate (bool): Whether to check the legality of every move and keep the game state up to date.
+                         Defaults to True.
+
+    Yields:
+        tuple[ChessGame, Move]: The game in the position before each move, and the move played from it. The
+        move is made once the consumer asks for the next item, so the game can be inspected (e.g. for its
+        Zobrist key) but should not be changed.
+
+    Raises:
+        ValueError: If the starting position or a move is invalid.
+    """
+    yield from _replay(ChessGame.from_fen(pgn_game.fen), pgn_game, validate)
+
+
+def _replay(chess_game: ChessGame, pgn_game: PgnGame, validate: bool) -> Iterator[tuple[ChessGame, Move]]:
+    """
+    Replays the moves of a game read from a PGN file on a game set up at its starting position (see ``replay``).
+    """
+    for san in pgn_game.moves:
+        piece, x, y, promotion = _resolve(chess_game, san, validate)
+        is_capture = chess_game.board.piece_at(x, y) is not None or (piece.type == PieceType.PAWN and x != piece.x)
+        yield chess_game, Move(piece, (piece.x, piece.y), (x, y), is_capture=is_capture,
+                               is_king_side_castle=piece.type == PieceType.KING and x - piece.x == 2,
+                               is_queen_side_castle=piece.type == PieceType.KING and piece.x - x == 2,
+                               promotion=promotion)
+
+        promotion_piece = None if promotion is None else promotion(x=x, y=y, team=piece.team, is_white=piece.is_white)
+        if validate:
+            if chess_game.state in _CLAIMABLE_DRAWS:
+                chess_game.state = GameEvent.ONGOING
+            if not chess_game.make_move(piece, x, y, promotion_piece):
+                raise ValueError(f"Illegal move '{san}' in position '{chess_game.fen()}'")
+        else:
+            chess_game.engine.make_move(piece, x, y, promotion_piece)
+        chess_game.switch_player()
+
+
+def replay_game(pgn_game: PgnGame, validate: bool = True) -> ChessGame:
+    """
+    Replays a game read from a PGN file to its final position.
+
+    Args:
+        pgn_game (PgnGame): The game to replay.
+        validate (bool): Whether to check the legality of every move and keep the game state up to date.
+                         Defaults to True.
+
+    Returns:
+        ChessGame: The game in its final position.
+
+    Raises:
+        ValueError: If the starting position or a move is invalid.
+    """
+    chess_game = ChessGame.from_fen(pgn_game.fen)
+    for _ in _replay(chess_game, pgn_game, validate):
+        pass
+    return chess_game
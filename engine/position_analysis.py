@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from pieces import Piece
+from utils.type import TeamType
+
+
+@dataclass(frozen=True)
+class PositionAnalysis:
+    """
+    An immutable class used to represent what a position means for one team: whether its King is in check
+    and which moves it can make. Checkmate and stalemate follow from these two facts.
+
+    Attributes:
+        team (TeamType): The team the position was analysed for.
+        is_in_check (bool): Whether the team's King is in check.
+        legal_moves (list[tuple[Piece, tuple[int, int]]]): The legal moves of the team, as (piece, (x, y)) pairs.
+    """
+    team: TeamType
+    is_in_check: bool
+    legal_moves: list[tuple[Piece, tuple[int, int]]]
+
+    @property
+    def is_checkmate(self) -> bool:
+        """Returns True if the team is in check and has no legal move."""
+        return self.is_in_check and not self.legal_moves
+
+    @property
+    def is_stalemate(self) -> bool:
+        """Returns True if the team isn't in check but has no legal move."""
+        return not self.is_in_check and not self.legal_moves
@@ -0,0 +1,190 @@
+"""
+Headless self-play runner.
+
+Plays many games between two computer players across a pool of worker processes, one game loop per worker,
+and streams one JSON line per finished game to disk: the result, how the game ended, the number of moves,
+the game in PGN and the time spent on each move. The games can also be collected in a PGN file.
+
+Players are given as specs: ``random`` for a player that picks random legal moves, or ``search`` for a
+SearchPlayer, with optional settings such as ``search:depth=3,time=0.5,nodes=20000,hash=16,book=book.bin``
+(``time=none`` removes the time limit, ``book`` names an opening book file and ``tb`` a tablebase
+directory). Each game is seeded with ``seed + game number``, so a run can be reproduced exactly as long as
+the players don't depend on the clock (i.e. search players limited by depth or nodes rather than time).
+
+Usage (from the project root):
+```
+python -m engine.self_play --games 100 --white random --black search:depth=2 --workers 4 --output games.jsonl
+python -m engine.self_play --games 100 --pgn games.pgn
+```
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+from engine.chess_game import ChessGame, START_FEN
+from engine.opening_book import OpeningBook
+from engine.pgn import game_result, write_game
+from engine.tablebase import Tablebases
+from players import Player, SearchPlayer
+from utils.type import TeamType
+
+
+def make_player(spec: str, name: str, team: TeamType) -> Player:
+    """
+    Creates a computer player from a player spec.
+
+    Args:
+        spec (str): The player spec, e.g. 'random' or 'search:depth=3,time=0.5'.
+        name (str): The name of the player.
+        team (TeamType): The team the player plays for.
+
+    Returns:
+        Player: The player.
+
+    Raises:
+        ValueError: If the spec names an unknown player type or setting.
+    """
+    kind, _, settings = spec.partition(':')
+    options = dict(setting.split('=', 1) for setting in settings.split(',') if setting)
+    if kind == 'random' and not options:
+        return Player(name=name, team=team, is_human=False)
+    if kind == 'search' and set(options) <= {'depth', 'time', 'nodes', 'hash', 'book', 'tb'}:
+        time_limit = options.get('time', '1.0')
+        opening_book = OpeningBook(options['book']) if 'book' in options else None
+        tablebases = Tablebases(options['tb']) if 'tb' in options else None
+        return SearchPlayer(name=name, team=team,
+                            max_depth=int(options.get('depth', 4)),
+                            time_limit=None if time_limit == 'none' else float(time_limit),
+                            node_limit=int(options['nodes']) if 'nodes' in options else None,
+                            hash_size_mb=float(options.get('hash', 16)),
+                            opening_book=opening_book,
+                            tablebases=tablebases)
+    raise ValueError(f"Invalid player spec: '{spec}'")
+
+
+def play_game(game_number: int, white: str, black: str, seed: int, max_plies: Optional[int] = None,
+              fen: str = START_FEN) -> dict:
+    """
+    Plays a single game between two computer players. This is the game loop each worker process runs.
+
+    Args:
+        game_number (int): The number of the game in the run.
+        white (str): The spec of the white player.
+        black (str): The spec of the black player.
+        seed (int): The seed of the random number generator for this game.
+        max_plies (int, optional): The number of plies after which the game is stopped unfinished. Defaults to
+                                   None (no cap).
+        fen (str): The position to start from. Defaults to the starting position.
+
+    Returns:
+        dict: The game record: its number, seed, players, result, termination, number of plies, the game in PGN
+        and the seconds spent on each move.
+    """
+    random.seed(seed)
+    players = [make_player(white, 'white', TeamType.ALLY), make_player(black, 'black', TeamType.OPPONENT)]
+    chess_game = ChessGame.from_fen(fen, players=players)
+
+    move_times = []
+    while not chess_game.is_game_over() and (max_plies is None or len(chess_game.move_history) < max_plies):
+        start = time.perf_counter()
+        piece, x, y, promotion_piece = chess_game.current_player.ai_choose_move(chess_game)
+        if piece is None:  # A player without moves is mated or stalemated, which make_move has reported
+            break
+        move_times.append(round(time.perf_counter() - start, 6))
+        if not chess_game.make_move(piece, x, y, promotion_piece):
+            raise RuntimeError(f"{chess_game.current_player.name} chose an illegal move in game {game_number}")
+        chess_game.switch_player()
+
+    if chess_game.is_game_over():
+        termination = chess_game.state.value
+    else:
+        termination = 'move cap'
+    return {
+        'game': game_number,
+        'seed': seed,
+        'white': white,
+        'black': black,
+        'fen': fen,
+        'result': game_result(chess_game),
+        'termination': termination,
+        'plies': len(chess_game.move_history),
+        'pgn': write_game(chess_game, {'Event': 'Self-play', 'Round': str(game_number + 1), 'White': white,
+                                       'Black': black, 'Termination': termination}),
+        'move_times': move_times
+    }
+
+
+def run(games: int, white: str, black: str, output: str, workers: Optional[int] = None, seed: int = 0,
+        max_plies: Optional[int] = None, fen: str = START_FEN, pgn_output: Optional[str] = None) -> dict[str, int]:
+    """
+    Plays a batch of games across a pool of worker processes, writing each game record to a JSON Lines file
+    (and optionally each game to a PGN file) as soon as its game finishes, so records come in the order games
+    finish, not in game order.
+
+    Args:
+        games (int): The number of games to play.
+        white (str): The spec of the white player.
+        black (str): The spec of the black player.
+        output (str): The path of the JSON Lines file to write (overwritten).
+        workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        seed (int): The seed of the first game; game n is seeded with ``seed + n``. Defaults to 0.
+        max_plies (int, optional): The number of plies after which a game is stopped unfinished. Defaults to
+                                   None (no cap).
+        fen (str): The position every game starts from. Defaults to the starting position.
+        pgn_output (str, optional): The path of a PGN file to also write the games to (overwritten). Defaults
+                                    to None.
+
+    Returns:
+        dict[str, int]: How many games ended with each result.
+    """
+    # Fail here rather than in every worker if a spec is wrong
+    make_player(white, 'white', TeamType.ALLY)
+    make_player(black, 'black', TeamType.OPPONENT)
+
+    results = {'1-0': 0, '0-1': 0, '1/2-1/2': 0, '*': 0}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor, \
+            open(output, 'w', encoding='utf-8') as file, \
+            open(pgn_output or os.devnull, 'w', encoding='utf-8') as pgn_file:
+        futures = [executor.submit(play_game, game_number, white, black, seed + game_number, max_plies, fen)
+                   for game_number in range(games)]
+        for future in as_completed(futures):
+            record = future.result()
+            file.write(json.dumps(record) + '\n')
+            file.flush()
+            pgn_file.write(record['pgn'])
+            pgn_file.flush()
+            results[record['result']] += 1
+    return results
+
+
+def main():
+    """
+    Command line entry point of the self-play runner.
+    """
+    parser = argparse.ArgumentParser(description="Play games between two computer players without a window.")
+    parser.add_argument('--games', type=int, default=10, help="the number of games to play (default: 10)")
+    parser.add_argument('--white', default='random', help="the white player spec (default: random)")
+    parser.add_argument('--black', default='random', help="the black player spec (default: random)")
+    parser.add_argument('--workers', type=int, help="the number of worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, default=0, help="the seed of the first game (default: 0)")
+    parser.add_argument('--max-plies', type=int, help="stop games unfinished after this many plies")
+    parser.add_argument('--fen', default=START_FEN, help="the position to start every game from")
+    parser.add_argument('--output', default='self_play.jsonl', help="the file to write (default: self_play.jsonl)")
+    parser.add_argument('--pgn', help="a PGN file to also write the games to")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run(args.games, args.white, args.black, args.output, args.workers, args.seed, args.max_plies, args.fen,
+                  args.pgn)
+    elapsed = time.perf_counter() - start
+    print(f"{args.games} games in {elapsed:.1f}s ({args.games / max(elapsed, 1e-9):.2f} games/s): "
+          f"white {results['1-0']}, black {results['0-1']}, draws {results['1/2-1/2']}, "
+          f"unfinished {results['*']}  -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,538 @@
+"""
+Endgame tablebases: perfect play for positions with few pieces, generated by retrograde analysis.
+
+A table covers one material signature, e.g. ``KQvK`` (white king and queen against the black king). It holds
+one byte per position: 0 for a draw, 255 for an illegal position, and otherwise the distance to mate in
+plies plus one. An odd distance is a win for the side to move, an even one a loss (a side that is checkmated
+is at distance 0). Positions are indexed by the side to move and the square of every piece, in signature
+order, so a table of n pieces has ``2 * 64 ** n`` entries. Positions where the colors are the other way
+around (e.g. a black queen against a lone white king) are looked up in the mirrored table.
+
+Tables are generated from the checkmates and stalemates of their signature, working backwards through the
+moves that lead to them. Captures and promotions lead to other tables, which are generated first. The moves of
+a position come from ``BitboardMoveGenerator.legal_moves`` and checks from ``Bitboard.is_in_check``, so the
+tables follow the same rules as the rest of the engine; only the moves that lead back to a position are worked
+out here, from the same attack tables. Castling and en passant captures are not part of endgame tables, so
+positions that still allow them are never probed.
+
+Generating the 3-piece tables takes a minute or so. The same code builds 4-piece tables, but those hold 33
+million positions each and take hours in Python.
+
+Usage (from the project root):
+```
+python -m engine.tablebase                                # KQvK, KRvK, KBvK, KNvK and KPvK
+python -m engine.tablebase KQvKR KPvKP --directory tablebases
+```
+"""
+import argparse
+import mmap
+import os
+import time
+from collections import defaultdict
+from typing import Iterator, Optional, TYPE_CHECKING
+
+from engine.bitboard import (Bitboard, WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, PIECE_KINDS,
+                             piece_attacks, squares, castling_rights)
+from engine.bitboard_move_generator import BitboardMoveGenerator
+from pieces import Piece, Knight, Bishop, Rook, Queen
+from utils.type import PieceType, TeamType
+
+if TYPE_CHECKING:
+    from engine import ChessGame
+
+DRAW = 0
+"""The table value of a drawn position."""
+
+ILLEGAL = 255
+"""The table value of a position that can't happen (pieces on the same square, the side not to move in check)."""
+
+MAX_PIECES = 4
+"""The largest number of pieces, kings included, a table can be generated for."""
+
+DEFAULT_SIGNATURES = ('KQvK', 'KRvK', 'KBvK', 'KNvK', 'KPvK')
+"""The tables generated when none are asked for: every 3-piece table."""
+
+_LETTERS = 'KQRBNP'
+_KIND_OF_LETTER = {'K': KING, 'Q': QUEEN, 'R': ROOK, 'B': BISHOP, 'N': KNIGHT, 'P': PAWN}
+_LETTER_OF_KIND = {kind: letter for letter, kind in _KIND_OF_LETTER.items()}
+_KIND_ORDER = {kind: _LETTERS.index(letter) for letter, kind in _KIND_OF_LETTER.items()}
+_PROMOTION_KINDS = (QUEEN, ROOK, BISHOP, KNIGHT)
+_PROMOTION_CLASSES = {QUEEN: Queen, ROOK: Rook, BISHOP: Bishop, KNIGHT: Knight}
+_MOVE_GENERATOR = BitboardMoveGenerator()
+
+
+def is_win(value: int) -> bool:
+    """
+    Checks if a table value is a win for the side to move.
+
+    Args:
+        value (int): The table value.
+
+    Returns:
+        bool: True if the side to move mates in an odd number of plies, False otherwise.
+    """
+    return value not in (DRAW, ILLEGAL) and (value - 1) % 2 == 1
+
+
+def is_loss(value: int) -> bool:
+    """
+    Checks if a table value is a loss for the side to move.
+
+    Args:
+        value (int): The table value.
+
+    Returns:
+        bool: True if the side to move is mated in an even number of plies (0 if it already is), False otherwise.
+    """
+    return value not in (DRAW, ILLEGAL) and (value - 1) % 2 == 0
+
+
+def _side_strength(side: str) -> tuple:
+    """
+    Orders the pieces of one side: more pieces first, then stronger pieces first.
+    """
+    return len(side), tuple(-_LETTERS.index(letter) for letter in side)
+
+
+def canonical_signature(white: str, black: str) -> tuple[str, bool]:
+    """
+    Returns the name of the table that covers a material balance, and whether the colors have to be swapped
+    to look it up: tables always have the stronger side as white.
+
+    Args:
+        white (str): The pieces of white, e.g. 'KQ' (in any order).
+        black (str): The pieces of black, e.g. 'K'.
+
+    Returns:
+        tuple[str, bool]: The table signature (e.g. 'KQvK') and whether white and black are swapped in it.
+    """
+    white = ''.join(sorted(white, key=_LETTERS.index))
+    black = ''.join(sorted(black, key=_LETTERS.index))
+    if _side_strength(black) > _side_strength(white):
+        return f"{black}v{white}", True
+    return f"{white}v{black}", False
+
+
+def parse_signature(signature: str) -> list[tuple[int, int]]:
+    """
+    Returns the pieces of a table, in index order.
+
+    Args:
+        signature (str): The table signature, e.g. 'KRvKP'.
+
+    Returns:
+        list[tuple[int, int]]: The (color, kind) of each piece.
+
+    Raises:
+        ValueError: If the signature isn't a canonical signature of at most MAX_PIECES pieces.
+    """
+    white, _, black = signature.partition('v')
+    if not white.startswith('K') or not black.startswith('K') or 'K' in white[1:] + black[1:] or \
+            any(letter not in _LETTERS for letter in white + black) or len(white + black) > MAX_PIECES or \
+            canonical_signature(white, black) != (signature, False):
+        raise ValueError(f"Invalid tablebase signature: '{signature}'")
+    return [(WHITE, _KIND_OF_LETTER[letter]) for letter in white] + \
+        [(BLACK, _KIND_OF_LETTER[letter]) for letter in black]
+
+
+def _bitboard(pieces: list[tuple[int, int]], positions: list[int], color_to_move: int) -> Bitboard:
+    """
+    Returns the bitboards of a table position, without castling rights or an en passant square.
+    """
+    bitboard = Bitboard()
+    for (color, kind), square in zip(pieces, positions):
+        bitboard.pieces[color * 6 + kind] |= 1 << square
+        bitboard.occupancy[color] |= 1 << square
+    bitboard.white_to_move = color_to_move == WHITE
+    return bitboard
+
+
+def _index(color_to_move: int, positions: list[int]) -> int:
+    """
+    Returns the table index of a position.
+    """
+    index = color_to_move
+    for square in positions:
+        index = index * 64 + square
+    return index
+
+
+def _decode(index: int, num_pieces: int) -> tuple[int, list[int]]:
+    """
+    Returns the color to move and the piece squares of a table index.
+    """
+    positions = [0] * num_pieces
+    for piece in range(num_pieces - 1, -1, -1):
+        index, positions[piece] = divmod(index, 64)
+    return index, positions
+
+
+def _table_value(tables, pieces: list[tuple[int, int, int]], color_to_move: int) -> int:
+    """
+    Looks up a position given as (color, kind, square) pieces in the table that covers it.
+
+    Args:
+        tables: The tables, a mapping from signature to table bytes.
+        pieces (list[tuple[int, int, int]]): The (color, kind, square) of every piece.
+        color_to_move (int): WHITE or BLACK.
+
+    Returns:
+        int: The table value, from the point of view of the color to move.
+
+    Raises:
+        KeyError: If the table isn't available.
+    """
+    white = ''.join(_LETTER_OF_KIND[kind] for color, kind, _ in pieces if color == WHITE)
+    black = ''.join(_LETTER_OF_KIND[kind] for color, kind, _ in pieces if color == BLACK)
+    signature, swapped = canonical_signature(white, black)
+    if signature == 'KvK':
+        return DRAW
+    if swapped:  # Mirror the board vertically and swap the colors
+        pieces = [(1 - color, kind, square ^ 56) for color, kind, square in pieces]
+        color_to_move = 1 - color_to_move
+    pieces = sorted(pieces, key=lambda piece: (piece[0], _KIND_ORDER[piece[1]]))
+    return tables[signature][_index(color_to_move, [square for _, _, square in pieces])]
+
+
+def _successors(pieces: list[tuple[int, int]], positions: list[int], bitboard: Bitboard) \
+        -> Iterator[tuple[int, int, int, Optional[int]]]:
+    """
+    Generates the legal moves of the side to move in a table position, with every promotion spelled out.
+
+    Yields:
+        tuple[int, int, int, Optional[int]]: The index of the moving piece, its target square, the index of the
+        captured piece (or -1) and the kind promoted to (or None).
+    """
+    for from_square, target in _MOVE_GENERATOR.legal_moves(bitboard):
+        moving = positions.index(from_square)
+        captured = positions.index(target) if bitboard.occupied >> target & 1 else -1
+        if pieces[moving][1] == PAWN and target // 8 in (0, 7):
+            for promotion in _PROMOTION_KINDS:
+                yield moving, target, captured, promotion
+        else:
+            yield moving, target, captured, None
+
+
+def _predecessors(pieces: list[tuple[int, int]], positions: list[int], color_to_move: int) -> Iterator[int]:
+    """
+    Generates the indexes of the positions of the same table that lead to a position in one move (moves that
+    didn't capture or promote). Some of them may be illegal positions.
+    """
+    mover = 1 - color_to_move
+    occupied = 0
+    for square in positions:
+        occupied |= 1 << square
+
+    for moving, (color, kind) in enumerate(pieces):
+        if color != mover:
+            continue
+        square = positions[moving]
+        if kind == PAWN:
+            step = 8 if color == WHITE else -8  # Back towards the pawn's own side
+            origins = 0
+            origin = square + step
+            if 0 <= origin < 64 and not occupied >> origin & 1:
+                origins |= 1 << origin
+                if square // 8 == (4 if color == WHITE else 3) and not occupied >> (origin + step) & 1:
+                    origins |= 1 << (origin + step)
+        else:
+            origins = piece_attacks(color, kind, square, occupied) & ~occupied
+        for origin in squares(origins):
+            previous = list(positions)
+            previous[moving] = origin
+            yield _index(mover, previous)
+
+
+def _children(signature: str) -> set[str]:
+    """
+    Returns the signatures of the tables that captures and promotions lead to from a table.
+    """
+    white, _, black = signature.partition('v')
+    children = set()
+    for is_white, side in ((True, white), (False, black)):
+        for position, letter in enumerate(side):
+            if letter == 'K':
+                continue
+            rest = side[:position] + side[position + 1:]
+            # The piece is captured, or the pawn promotes
+            for new_side in [rest] + ([rest + promotion for promotion in 'QRBN'] if letter == 'P' else []):
+                child, _ = canonical_signature(new_side, black) if is_white else canonical_signature(white, new_side)
+                if child != 'KvK':
+                    children.add(child)
+    return children
+
+
+def generate_table(signature: str, tables) -> bytearray:
+    """
+    Generates a table by retrograde analysis.
+
+    Every legal position first gets its number of moves. Checkmates are lost at distance 0, and captures and
+    promotions are scored from the tables they lead to. Then, distance by distance, the positions that lead to
+    a lost position are won one ply further, and the positions whose moves all lead to won positions are lost
+    one ply after the longest of them. The positions that are never reached this way are drawn.
+
+    Args:
+        signature (str): The table signature, e.g. 'KQvK'.
+        tables: The tables that captures and promotions lead to, a mapping from signature to table bytes.
+
+    Returns:
+        bytearray: The table.
+
+    Raises:
+        ValueError: If the signature is invalid.
+    """
+    pieces = parse_signature(signature)
+    num_pieces = len(pieces)
+    size = 2 * 64 ** num_pieces
+    values = bytearray(size)  # 0 (draw) until a position is decided
+    open_moves = bytearray(size)  # Moves not known to lose yet; a position is lost when none are left
+    loss_plies = bytearray(size)  # The longest loss among the moves known to lose
+    conversion_wins = defaultdict(list)  # Positions won by a capture or promotion, by distance
+    decided = defaultdict(list)  # Decided positions whose predecessors haven't been visited yet, by distance
+
+    for index in range(size):
+        color, positions = _decode(index, num_pieces)
+        if len(set(positions)) != num_pieces or \
+                any(kind == PAWN and positions[piece] // 8 in (0, 7) for piece, (_, kind) in enumerate(pieces)):
+            values[index] = ILLEGAL
+            continue
+        bitboard = _bitboard(pieces, positions, color)
+        if bitboard.is_in_check(1 - color):
+            values[index] = ILLEGAL
+            continue
+
+        moves = 0
+        best_win = None
+        longest_loss = -1
+        for moving, target, captured, promotion in _successors(pieces, positions, bitboard):
+            moves += 1
+            if captured < 0 and promotion is None:
+                open_moves[index] += 1
+                continue
+            # The move leaves the table: look its result up in the table it leads to
+            after = [(piece_color, promotion if piece == moving and promotion is not None else kind,
+                      target if piece == moving else positions[piece])
+                     for piece, (piece_color, kind) in enumerate(pieces) if piece != captured]
+            value = _table_value(tables, after, 1 - color)
+            if is_loss(value):  # The opponent is lost
+                best_win = value if best_win is None else min(best_win, value)
+            elif is_win(value):
+                longest_loss = max(longest_loss, value)
+            else:
+                open_moves[index] += 1
+
+        if moves == 0:
+            if bitboard.is_in_check(color):
+                values[index] = 1  # Checkmated
+                decided[0].append(index)
+            continue  # Stalemates are drawn
+        if best_win is not None:
+            conversion_wins[best_win].append(index)
+            open_moves[index] += 1  # The winning move never loses
+        loss_plies[index] = max(longest_loss, 0)
+        if open_moves[index] == 0:  # Every move leaves the table and loses
+            values[index] = longest_loss + 1
+            decided[longest_loss].append(index)
+
+    plies = 0
+    while decided or conversion_wins:
+        for index in conversion_wins.pop(plies, ()):
+            if values[index] == DRAW:
+                values[index] = plies + 1
+                decided[plies].append(index)
+        for index in decided.pop(plies, ()):
+            color, positions = _decode(index, num_pieces)
+            lost = plies % 2 == 0
+            for previous in _predecessors(pieces, positions, color):
+                if values[previous] != DRAW:  # Illegal or already decided
+                    continue
+                if lost:
+                    values[previous] = plies + 2
+                    decided[plies + 1].append(previous)
+                else:
+                    open_moves[previous] -= 1
+                    loss_plies[previous] = max(loss_plies[previous], plies + 1)
+                    if open_moves[previous] == 0:
+                        values[previous] = loss_plies[previous] + 1
+                        decided[loss_plies[previous]].append(previous)
+        plies += 1
+    return values
+
+
+def generate(signatures: list[str], directory: str, verbose: bool = False) -> list[str]:
+    """
+    Generates tables and writes them to a directory, along with the tables they depend on. Tables already in
+    the directory are reused.
+
+    Args:
+        signatures (list[str]): The signatures of the tables to generate.
+        directory (str): The directory to write the tables to (created if needed).
+        verbose (bool): Whether to print each table as it is generated. Defaults to False.
+
+    Returns:
+        list[str]: The signatures of the tables generated, dependencies included, in generation order.
+
+    Raises:
+        ValueError: If a signature is invalid.
+    """
+    os.makedirs(directory, exist_ok=True)
+    tables = {}
+    generated = []
+
+    def build(signature: str):
+        if signature in tables:
+            return
+        parse_signature(signature)
+        for child in sorted(_children(signature)):
+            build(child)
+        path = os.path.join(directory, f"{signature}.tb")
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                tables[signature] = file.read()
+            return
+        start = time.perf_counter()
+        table = generate_table(signature, tables)
+        with open(path, 'wb') as file:
+            file.write(table)
+        tables[signature] = table
+        generated.append(signature)
+        if verbose:
+            print(f"{signature:8} {len(table):>12} positions  {time.perf_counter() - start:.1f}s")
+
+    for signature in signatures:
+        build(signature)
+    return generated
+
+
+class Tablebases:
+    """
+    A set of tables, probed in place in their memory-mapped files.
+
+    Attributes:
+        directory (str): The directory the tables are read from.
+        max_pieces (int): The largest number of pieces of the tables found, or 0 if there are none.
+    """
+
+    def __init__(self, directory: str or os.PathLike):
+        """
+        Opens the tables of a directory.
+
+        Args:
+            directory (str or os.PathLike): The directory holding the ``<signature>.tb`` files.
+        """
+        self.directory = os.fspath(directory)
+        self._tables = {}
+        for name in os.listdir(self.directory):
+            signature, extension = os.path.splitext(name)
+            if extension != '.tb':
+                continue
+            pieces = parse_signature(signature)
+            with open(os.path.join(self.directory, name), 'rb') as file:
+                if os.fstat(file.fileno()).st_size != 2 * 64 ** len(pieces):
+                    raise ValueError(f"Invalid tablebase file '{name}': it has the wrong size")
+                self._tables[signature] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.max_pieces = max((len(signature) - 1 for signature in self._tables), default=0)
+
+    def __getstate__(self) -> dict:
+        """
+        Pickles (and copies) the tables as their directory: the copy maps the files again.
+        """
+        return {'directory': self.directory}
+
+    def __setstate__(self, state: dict):
+        """
+        Restores pickled tables by opening their directory.
+        """
+        self.__init__(state['directory'])
+
+    def close(self):
+        """
+        Unmaps the table files.
+        """
+        for table in self._tables.values():
+            table.close()
+        self._tables = {}
+        self.max_pieces = 0
+
+    def probe(self, chess_game: 'ChessGame') -> Optional[int]:
+        """
+        Looks up the current position of a game.
+
+        Args:
+            chess_game (ChessGame): The chess game being played.
+
+        Returns:
+            int or None: The table value of the position (see ``is_win`` and ``is_loss``), or None if the position
+            isn't covered by the tables.
+        """
+        board = chess_game.board
+        if len(board.pieces) > self.max_pieces or castling_rights(board) or \
+                chess_game.engine.last_move.is_double_pawn_push:
+            return None
+        pieces = [(WHITE if piece.is_white else BLACK, PIECE_KINDS[piece.type], piece.y * 8 + piece.x)
+                  for piece in board.pieces]
+        try:
+            value = _table_value(self._tables, pieces,
+                                 WHITE if chess_game.current_player.team == TeamType.ALLY else BLACK)
+        except KeyError:
+            return None
+        return None if value == ILLEGAL else value
+
+    def best_move(self, chess_game: 'ChessGame') -> Optional[tuple[Piece, int, int, Optional[type[Piece]]]]:
+        """
+        Picks the best move of the current position of a game from the tables: the fastest win, or else a
+        draw, or else the slowest loss.
+
+        Args:
+            chess_game (ChessGame): The chess game being played.
+
+        Returns:
+            tuple or None: The move as (piece, x, y, promotion class or None), or None if the position or one of
+            the positions its moves lead to isn't covered by the tables, or there is no legal move.
+        """
+        if self.probe(chess_game) is None:
+            return None
+        engine = chess_game.engine
+        best_move, best_rank = None, None
+        for piece, (x, y) in chess_game.move_generator.team_legal_moves(chess_game.current_player.team):
+            promotions = [None]
+            if piece.type == PieceType.PAWN and y in (0, 7):
+                promotions = list(_PROMOTION_CLASSES.values())
+            for promotion in promotions:
+                promotion_piece = promotion(x=x, y=y, team=piece.team, is_white=piece.is_white) if promotion else None
+                record = engine.make_move(piece, x, y, promotion_piece)
+                chess_game.switch_player()
+                value = self.probe(chess_game)
+                chess_game.switch_player()
+                engine.unmake_move(record)
+                if value is None:
+                    return None
+                # Rank the move for the player making it: quick wins first, then draws, then slow losses
+                if is_loss(value):
+                    rank = 1000 - value
+                elif is_win(value):
+                    rank = -1000 + value
+                else:
+                    rank = 0
+                if best_rank is None or rank > best_rank:
+                    best_move, best_rank = (piece, x, y, promotion), rank
+        return best_move
+
+
+def main():
+    """
+    Command line entry point of the tablebase generator.
+    """
+    parser = argparse.ArgumentParser(description="Generate endgame tablebases.")
+    parser.add_argument('signatures', nargs='*', default=list(DEFAULT_SIGNATURES),
+                        help="the tables to generate, e.g. KQvK KRvKP (default: every 3-piece table)")
+    parser.add_argument('--directory', default='tablebases', help="where to write the tables (default: tablebases)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    generated = generate(args.signatures, args.directory, verbose=True)
+    print(f"{len(generated)} tables generated in {time.perf_counter() - start:.1f}s -> {args.directory}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+from array import array
+from typing import Optional
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 1, 2, 3
+"""The bound types of a stored score: the exact score, or a lower/upper bound after an alpha-beta cutoff."""
+
+SLOT_WORDS = 2
+"""Each slot is two 64-bit words: the position key and the packed entry data."""
+
+BUCKET_WORDS = 2 * SLOT_WORDS
+"""Each bucket holds a depth-preferred slot followed by an always-replace slot."""
+
+_SCORE_OFFSET = 1 << 31
+_OCCUPIED = 1 << 63
+
+
+def pack_move(from_square: int, to_square: int, promotion: int = 0) -> int:
+    """
+    Packs a move into 15 bits: the from square, the to square and the promotion piece.
+
+    Args:
+        from_square (int): The square the piece moves from (``y * 8 + x``).
+        to_square (int): The square the piece moves to (``y * 8 + x``).
+        promotion (int): An index for the promotion piece, from 1 to 7, or 0 if the move doesn't promote.
+
+    Returns:
+        int: The packed move. 0 never encodes a real move, and stands for "no move".
+    """
+    return from_square | to_square << 6 | promotion << 12
+
+
+def unpack_move(move: int) -> tuple[int, int, int]:
+    """
+    Unpacks a move packed with ``pack_move``.
+
+    Args:
+        move (int): The packed move.
+
+    Returns:
+        tuple[int, int, int]: The from square, the to square and the promotion index.
+    """
+    return move & 63, move >> 6 & 63, move >> 12 & 7
+
+
+class TranspositionTable:
+    """
+    A fixed-size hash table of search results, keyed by the Zobrist key of a position.
+
+    The table is a single preallocated array of 64-bit words, so its memory use is set once, up front.
+    Positions map to a bucket of two slots: a depth-preferred slot, which keeps the deepest search of the
+    positions sharing the bucket, and an always-replace slot, which keeps the most recent one.
+
+    Each entry stores the search depth, the score, the bound type of the score and the best move. The key word
+    of a slot holds the position key XORed with the data word, so an entry whose two words were written by
+    different processes at the same time (see ``buffer``) doesn't match any key and is simply missed.
+
+    Attributes:
+        num_buckets (int): The number of buckets (a power of two).
+        hits (int): The number of probes that found their position.
+        misses (int): The number of probes that didn't find their position.
+        collisions (int): The number of misses where the bucket was holding other positions.
+    """
+
+    def __init__(self, size_mb: float = 16, buffer=None):
+        """
+        Initializes an empty TranspositionTable.
+
+        Args:
+            size_mb (float): The memory cap of the table, in megabytes. Defaults to 16.
+            buffer: An existing writable buffer to store the table in (e.g. shared memory), instead of allocating
+                    one. Its size is used instead of ``size_mb``. Defaults to None.
+        """
+        if buffer is None:
+            size_in_bytes = int(size_mb * 1024 * 1024)
+            self.num_buckets = self._buckets_that_fit(size_in_bytes)
+            self._words = array('Q', bytes(self.num_buckets * BUCKET_WORDS * 8))
+        else:
+            view = memoryview(buffer).cast('B')
+            self.num_buckets = self._buckets_that_fit(len(view))
+            self._words = view[:self.num_buckets * BUCKET_WORDS * 8].cast('Q')
+        self._mask = self.num_buckets - 1
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    @staticmethod
+    def _buckets_that_fit(size_in_bytes: int) -> int:
+        """
+        Returns the largest power of two number of buckets that fits in the given size.
+
+        Args:
+            size_in_bytes (int): The memory available, in bytes.
+
+        Returns:
+            int: The number of buckets.
+
+        Raises:
+            ValueError: If the size can't hold a single bucket.
+        """
+        buckets = size_in_bytes // (BUCKET_WORDS * 8)
+        if buckets < 1:
+            raise ValueError("The transposition table must be large enough to hold at least one bucket.")
+        return 1 << (buckets.bit_length() - 1)
+
+    @staticmethod
+    def bytes_needed(size_mb: float) -> int:
+        """
+        Returns the number of bytes a table of the given memory cap actually uses.
+
+        Args:
+            size_mb (float): The memory cap of the table, in megabytes.
+
+        Returns:
+            int: The size of the table, in bytes.
+        """
+        return TranspositionTable._buckets_that_fit(int(size_mb * 1024 * 1024)) * BUCKET_WORDS * 8
+
+    def probe(self, key: int) -> Optional[tuple[int, int, int, int]]:
+        """
+        Looks up the stored search result of a position.
+
+        Args:
+            key (int): The Zobrist key of the position.
+
+        Returns:
+            tuple[int, int, int, int] or None: The (depth, score, bound, packed move) of the position,
+            or None if it isn't stored.
+        """
+        words = self._words
+        index = (key & self._mask) * BUCKET_WORDS
+        for slot in (index, index + SLOT_WORDS):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                self.hits += 1
+                return data >> 32 & 0xFF, (data & 0xFFFFFFFF) - _SCORE_OFFSET, data >> 40 & 3, data >> 42 & 0xFFFF
+        self.misses += 1
+        if words[index + 1] or words[index + SLOT_WORDS + 1]:
+            self.collisions += 1
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: int = 0):
+        """
+        Stores the search result of a position.
+
+        The result replaces the depth-preferred slot if it is at least as deep as the result stored there
+        (or is for the same position), and the result it evicts moves to the always-replace slot.
+        Otherwise the result goes into the always-replace slot.
+
+        Args:
+            key (int): The Zobrist key of the position.
+            depth (int): The depth the position was searched to.
+            score (int): The score of the position.
+            bound (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            move (int): The best move, packed with ``pack_move``, or 0 if there is none.
+        """
+        words = self._words
+        index = (key & self._mask) * BUCKET_WORDS
+        depth = max(0, min(depth, 0xFF))
+        data = _OCCUPIED | (move & 0xFFFF) << 42 | bound << 40 | depth << 32 | (score + _SCORE_OFFSET) & 0xFFFFFFFF
+
+        preferred = words[index + 1]
+        if not preferred or words[index] ^ preferred == key:
+            words[index] = key ^ data
+            words[index + 1] = data
+        elif depth >= (preferred >> 32 & 0xFF):
+            words[index + SLOT_WORDS] = words[index]
+            words[index + SLOT_WORDS + 1] = preferred
+            words[index] = key ^ data
+            words[index + 1] = data
+        else:
+            words[index + SLOT_WORDS] = key ^ data
+            words[index + SLOT_WORDS + 1] = data
+
+    def clear(self):
+        """
+        Empties the table and resets its counters.
+        """
+        self._words[:] = array('Q', bytes(len(self._words) * 8))
+        self.hits = self.misses = self.collisions = 0
+
+    def hashfull(self, sample: int = 1000) -> int:
+        """
+        Estimates how full the table is by sampling its first slots.
+
+        Args:
+            sample (int): The number of slots to sample. Defaults to 1000.
+
+        Returns:
+            int: The estimated permille (0-1000) of slots in use.
+        """
+        slots = min(sample, self.num_buckets * 2)
+        used = sum(1 for slot in range(slots) if self._words[slot * SLOT_WORDS + 1])
+        return used * 1000 // slots
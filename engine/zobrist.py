@@ -0,0 +1,104 @@
+import random
+from engine.bitboard import Bitboard, PIECE_KINDS, PAWN, WHITE, BLACK, castling_rights
+from engine.bitboard_move_generator import BitboardMoveGenerator
+from engine.move import Move
+from pieces import Piece
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from engine import Board
+
+# The keys are drawn from a fixed seed, so that every process computes the same key for the same position
+_random = random.Random(0x2F9A61C4)
+
+PIECE_KEYS = [[_random.getrandbits(64) for _ in range(64)] for _ in range(12)]
+"""The key of each piece set (``color * 6 + kind``, white first) on each square (``y * 8 + x``)."""
+
+CASTLING_KEYS = [_random.getrandbits(64) for _ in range(16)]
+"""The key of each combination of castling right flags."""
+
+EN_PASSANT_KEYS = [_random.getrandbits(64) for _ in range(8)]
+"""The key of each file an en passant capture may happen on."""
+
+SIDE_KEY = _random.getrandbits(64)
+"""The key toggled in when black is to move."""
+
+
+def piece_keys(piece: Piece) -> list[int]:
+    """
+    Returns the keys of a piece's color and type, one per square.
+
+    Args:
+        piece (Piece): The piece.
+
+    Returns:
+        list[int]: The 64-bit keys, indexed by square (``y * 8 + x``).
+    """
+    return PIECE_KEYS[(0 if piece.is_white else 6) + PIECE_KINDS[piece.type]]
+
+
+def piece_key(piece: Piece) -> int:
+    """
+    Returns the key of a piece standing on its current square.
+
+    Args:
+        piece (Piece): The piece.
+
+    Returns:
+        int: The 64-bit key.
+    """
+    return piece_keys(piece)[piece.y * 8 + piece.x]
+
+
+def en_passant_key(board: 'Board', last_move: Move) -> int:
+    """
+    Returns the en passant part of a position's key, which is set after a pawn moved two squares, if an enemy
+    pawn beside it can legally capture it en passant. Otherwise the position is the same, as far as repetitions
+    go, as it would be had the pawn come from anywhere else, and the key must be the same too.
+
+    Args:
+        board (Board): The chess board, after the last move.
+        last_move (Move): The last move played.
+
+    Returns:
+        int: The 64-bit key of the en passant file, or 0 if there is no en passant capture possible.
+    """
+    if not last_move.is_double_pawn_push:
+        return 0
+    (x, start_y), (_, y) = last_move.start_position, last_move.end_position
+    color = BLACK if last_move.piece.is_white else WHITE
+    capturing_pawns = board.piece_sets[color * 6 + PAWN]
+    bitboard = None
+    for capture_x in (x - 1, x + 1):
+        from_square = y * 8 + capture_x
+        if 0 <= capture_x < 8 and capturing_pawns >> from_square & 1:
+            if bitboard is None:
+                bitboard = Bitboard()
+                bitboard.pieces = list(board.piece_sets)
+                bitboard.white_to_move = color == WHITE
+                bitboard.en_passant = (start_y + y) // 2 * 8 + x
+            if BitboardMoveGenerator.is_legal(bitboard, from_square, bitboard.en_passant):
+                return EN_PASSANT_KEYS[x]
+    return 0
+
+
+def position_key(board: 'Board', last_move: Move, white_to_move: bool) -> int:
+    """
+    Computes the key of a position from scratch. During a game the key is instead kept up to date
+    incrementally by the board and the game engine, in ``Board.zobrist_key``.
+
+    Args:
+        board (Board): The chess board.
+        last_move (Move): The last move played.
+        white_to_move (bool): True if it is white's turn to move, False otherwise.
+
+    Returns:
+        int: The 64-bit key.
+    """
+    key = 0
+    for piece in board.pieces:
+        key ^= piece_key(piece)
+    key ^= CASTLING_KEYS[castling_rights(board)] ^ en_passant_key(board, last_move)
+    if not white_to_move:
+        key ^= SIDE_KEY
+    return key
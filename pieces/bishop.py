@@ -1,4 +1,5 @@
 from pieces import Piece
+from pieces.piece import DIAGONAL_DIRECTIONS
 from utils.type import PieceType, TeamType
 from typing import TYPE_CHECKING
 
@@ -20,6 +21,7 @@ class Bishop(Piece):
         symbol (str): The character symbol representing the piece (e.g., 'B', 'b').
         type (PieceType): The type of the piece (BISHOP).
     """
+    __slots__ = ()
 
     def __init__(self, x: int, y: int, team: TeamType, is_white: bool):
         """
@@ -52,3 +54,15 @@ class Bishop(Piece):
             if self._path_is_clear(px, py, x, y, board=chess_game.board, direction='diagonal'):
                 return self.can_capture_or_occupy_square(x, y, board=chess_game.board)
         return False
+
+    def pseudo_legal_moves(self, chess_game: 'ChessGame') -> list[tuple[int, int]]:
+        """
+        Generates the squares the Bishop can move to by sliding diagonally.
+
+        Args:
+            chess_game (ChessGame): The chess game being played.
+
+        Returns:
+            list[tuple[int, int]]: The (x, y) destination squares.
+        """
+        return self._sliding_moves(chess_game.board, DIAGONAL_DIRECTIONS)
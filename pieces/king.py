@@ -6,6 +6,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from engine import ChessGame
 
+KING_OFFSETS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+"""The (dx, dy) steps of a King."""
+
 
 class King(Piece):
     """
@@ -22,6 +25,7 @@ class King(Piece):
         type (PieceType): The type of the piece (KING).
         has_moved (bool): Determines whether the King has already moved (at least once) or not.
     """
+    __slots__ = ()
 
     def __init__(self, x: int, y: int, team: TeamType, is_white: bool):
         """
@@ -82,21 +86,23 @@ class King(Piece):
         dy = abs(y - py)
 
         if dy == 0 and dx == 2:
+            enemy_attacks = chess_game.status.attack_map(
+                TeamType.OPPONENT if self.team == TeamType.ALLY else TeamType.ALLY)
+
             # Can't castle if the King has moved or is in check
-            if self.has_moved or chess_game.status.is_in_check(self.team):
+            if self.has_moved or enemy_attacks.is_attacked(px, py):
                 return False
 
             direction = 1 if x > px else -1  # Defines which rook to check
 
-            for i in range(1, 4 if direction == -1 else 3):  # Check 4 squares if queen-side, 3 if king-side
+            for i in range(1, 4 if direction == -1 else 3):  # Check 3 squares if queen-side, 2 if king-side
                 # Checks for pieces between the King and rook
                 if chess_game.board.piece_at(px + i * direction, py) is not None:
                     return False
 
                 # Verifies the King isn't crossing or landing on attacked squares
-                if any(other_piece.is_controlled_square(other_piece.x, other_piece.y, px + i * direction, py,
-                                                        chess_game)
-                    for other_piece in chess_game.board.pieces if other_piece.team != self.team):
+                # (the square next to the queen-side rook may be attacked, the King never crosses it)
+                if i <= 2 and enemy_attacks.is_attacked(px + i * direction, py):
                     return False
 
             rook_position = (7 if direction == 1 else 0, py)
@@ -107,3 +113,26 @@ class King(Piece):
                 return True
 
         return False
+
+    def pseudo_legal_moves(self, chess_game: 'ChessGame') -> list[tuple[int, int]]:
+        """
+        Generates the squares the King can step to, along with its castling destinations.
+
+        Args:
+            chess_game (ChessGame): The chess game being played.
+
+        Returns:
+            list[tuple[int, int]]: The (x, y) destination squares.
+        """
+        board = chess_game.board
+        moves = []
+        for dx, dy in KING_OFFSETS:
+            x, y = self.x + dx, self.y + dy
+            if 0 <= x < 8 and 0 <= y < 8 and self.can_capture_or_occupy_square(x, y, board=board):
+                moves.append((x, y))
+
+        if not self.has_moved:
+            for x in (self.x - 2, self.x + 2):
+                if 0 <= x < 8 and self.can_castle(self.x, self.y, x, self.y, chess_game):
+                    moves.append((x, self.y))
+        return moves
@@ -5,6 +5,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from engine import ChessGame
 
+KNIGHT_OFFSETS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+"""The (dx, dy) jumps of a Knight."""
+
 
 class Knight(Piece):
     """
@@ -20,6 +23,7 @@ class Knight(Piece):
         symbol (str): The character symbol representing the piece (e.g., 'N', 'n').
         type (PieceType): The type of the piece (KNIGHT).
     """
+    __slots__ = ()
 
     def __init__(self, x: int, y: int, team: TeamType, is_white: bool):
         """
@@ -52,3 +56,21 @@ class Knight(Piece):
         dy = abs(y - py)
         return ((dx == 2 and dy == 1) or (dx == 1 and dy == 2)) and \
             self.can_capture_or_occupy_square(x, y, board=chess_game.board)
+
+    def pseudo_legal_moves(self, chess_game: 'ChessGame') -> list[tuple[int, int]]:
+        """
+        Generates the squares the Knight can jump to.
+
+        Args:
+            chess_game (ChessGame): The chess game being played.
+
+        Returns:
+            list[tuple[int, int]]: The (x, y) destination squares.
+        """
+        board = chess_game.board
+        moves = []
+        for dx, dy in KNIGHT_OFFSETS:
+            x, y = self.x + dx, self.y + dy
+            if 0 <= x < 8 and 0 <= y < 8 and self.can_capture_or_occupy_square(x, y, board=board):
+                moves.append((x, y))
+        return moves
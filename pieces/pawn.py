@@ -20,6 +20,7 @@ class Pawn(Piece):
         symbol (str): The character symbol representing the piece (e.g., 'P', 'p').
         type (PieceType): The type of the piece (PAWN).
     """
+    __slots__ = ()
 
     def __init__(self, x: int, y: int, team: TeamType, is_white: bool):
         """
@@ -182,3 +183,35 @@ class Pawn(Piece):
         direction = -1 if self.team == TeamType.ALLY else 1
         return (abs(dx) == 1 and dy == direction) and \
             (board.piece_at(x, y) is not None and self.can_capture_or_occupy_square(x, y, board))
+
+    def pseudo_legal_moves(self, chess_game: 'ChessGame') -> list[tuple[int, int]]:
+        """
+        Generates the squares the pawn can move to: forward pushes, diagonal captures and "en passant".
+
+        Args:
+            chess_game (ChessGame): The chess game being played.
+
+        Returns:
+            list[tuple[int, int]]: The (x, y) destination squares.
+        """
+        board = chess_game.board
+        px, py = self.x, self.y
+        direction = -1 if self.team == TeamType.ALLY else 1
+        moves = []
+
+        y = py + direction
+        if not 0 <= y < 8:
+            return moves
+
+        if board.piece_at(px, y) is None:
+            moves.append((px, y))
+            is_in_starting_position = (py == 6 if self.team == TeamType.ALLY else py == 1)
+            if is_in_starting_position and board.piece_at(px, y + direction) is None:
+                moves.append((px, y + direction))
+
+        for x in (px - 1, px + 1):
+            if 0 <= x < 8:
+                if self._capturing(px, py, x, y, board=board) or \
+                        self.en_passant(px, py, x, y, game_engine=chess_game.engine):
+                    moves.append((x, y))
+        return moves
@@ -5,6 +5,22 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from engine import ChessGame, Board
 
+LINEAR_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+"""The (dx, dy) steps of a piece moving in a straight line (horizontally or vertically)."""
+
+DIAGONAL_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+"""The (dx, dy) steps of a piece moving diagonally."""
+
+PIECE_VALUES = {
+    PieceType.PAWN: 10,
+    PieceType.KNIGHT: 30,
+    PieceType.BISHOP: 30,
+    PieceType.ROOK: 50,
+    PieceType.QUEEN: 90,
+    PieceType.KING: 900
+}
+"""The material value of each piece type, for white (black pieces count negatively)."""
+
 
 class Piece(ABC):
     """
@@ -18,7 +34,9 @@ class Piece(ABC):
         symbol (str): The character symbol representing the piece (e.g., 'P', 'p', 'N', 'n').
         type (PieceType): The type of the piece (e.g., PAWN, KNIGHT).
         has_moved (bool): Determines whether the piece has already moved (at least once) or not.
+        board (Board or None): The board the piece has been placed on, or None if it is not on a board.
     """
+    __slots__ = ('_x', '_y', '_team', '_is_white', '_symbol', '_type', '_has_moved', '_board')
 
     def __init__(self, x: int, y: int, team: TeamType, is_white: bool, symbol: str, type: PieceType):
         """
@@ -39,6 +57,7 @@ class Piece(ABC):
         self._symbol = symbol
         self._type = type
         self._has_moved = False
+        self._board = None
 
     def __repr__(self):
         """
@@ -75,7 +94,10 @@ class Piece(ABC):
             raise TypeError("The x-coordinate must be an integer.")
         if not 0 <= value < 8:
             raise ValueError("The x-coordinate must be between 0 and 7.")
+        old_x = self._x
         self._x = value
+        if self._board is not None:
+            self._board._relocate(self, old_x, self._y)
 
     @y.setter
     def y(self, value: int):
@@ -89,7 +111,31 @@ class Piece(ABC):
             raise TypeError("The y-coordinate must be an integer.")
         if not 0 <= value < 8:
             raise ValueError("The y-coordinate must be between 0 and 7.")
+        old_y = self._y
         self._y = value
+        if self._board is not None:
+            self._board._relocate(self, self._x, old_y)
+
+    def _set_position(self, x: int, y: int):
+        """
+        Moves the piece to a new square without validating the coordinates, updating the board once.
+
+        This is the engine's path for its own moves, whose coordinates are known to be on the board.
+
+        Args:
+            x (int): The new x-coordinate.
+            y (int): The new y-coordinate.
+        """
+        old_x, old_y = self._x, self._y
+        self._x = x
+        self._y = y
+        if self._board is not None:
+            self._board._relocate(self, old_x, old_y)
+
+    @property
+    def board(self) -> 'Board' or None:
+        """Returns the board the piece is placed on, or None if it is not on a board."""
+        return self._board
 
     @property
     def team(self) -> TeamType:
@@ -155,16 +201,7 @@ class Piece(ABC):
         Returns:
             int: The material value of the piece.
         """
-        values = {
-            PieceType.PAWN: 10,
-            PieceType.KNIGHT: 30,
-            PieceType.BISHOP: 30,
-            PieceType.ROOK: 50,
-            PieceType.QUEEN: 90,
-            PieceType.KING: 900
-        }
-
-        base_value = values.get(self._type, 0)
+        base_value = PIECE_VALUES.get(self._type, 0)
         return base_value if self._is_white else -base_value
 
     @abstractmethod
@@ -190,6 +227,23 @@ class Piece(ABC):
         """
         raise NotImplementedError()
 
+    def pseudo_legal_moves(self, chess_game: 'ChessGame') -> list[tuple[int, int]]:
+        """
+        Generates the destination squares this piece can move to according to its own movement rules,
+        without checking whether the move would leave its King in check.
+
+        Every square returned satisfies ``legal_move``. This base implementation probes all 64 squares with
+        ``legal_move``; subclasses override it to only visit the squares the piece can actually reach.
+
+        Parameters:
+            chess_game (ChessGame): The chess game being played.
+
+        Returns:
+            list[tuple[int, int]]: The (x, y) destination squares.
+        """
+        return [(x, y) for x in range(8) for y in range(8)
+                if self.legal_move(px=self.x, py=self.y, x=x, y=y, chess_game=chess_game)]
+
     def is_controlled_square(self, current_x: int, current_y: int, target_x: int, target_y: int,
                              chess_game: 'ChessGame') -> bool:
         """
@@ -232,6 +286,34 @@ class Piece(ABC):
             return True
         return False
 
+    def _sliding_moves(self, board: 'Board', directions: tuple[tuple[int, int], ...]) -> list[tuple[int, int]]:
+        """
+        Generates the squares reached by sliding along the given directions, stopping at the first piece
+        in each direction (which is included if it can be captured).
+        This is intended for use by the Queen, Rook and Bishop subclasses.
+
+        Args:
+            board (Board): The game board.
+            directions (tuple[tuple[int, int], ...]): The (dx, dy) steps to slide along.
+
+        Returns:
+            list[tuple[int, int]]: The (x, y) destination squares.
+        """
+        moves = []
+        for dx, dy in directions:
+            x, y = self.x + dx, self.y + dy
+            while 0 <= x < 8 and 0 <= y < 8:
+                blocker = board.piece_at(x, y)
+                if blocker is None:
+                    moves.append((x, y))
+                else:
+                    if blocker.is_white != self.is_white:
+                        moves.append((x, y))
+                    break
+                x += dx
+                y += dy
+        return moves
+
     def _path_is_clear(self, px: int, py: int, x: int, y: int, board: 'Board', direction: str) -> bool:
         """
         Determines whether the path is clear in a specified direction (linear or diagonal).
@@ -1,4 +1,5 @@
 from pieces import Piece
+from pieces.piece import LINEAR_DIRECTIONS, DIAGONAL_DIRECTIONS
 from utils.type import PieceType, TeamType
 from typing import TYPE_CHECKING
 
@@ -20,6 +21,7 @@ class Queen(Piece):
         symbol (str): The character symbol representing the piece (e.g., 'Q', 'q').
         type (PieceType): The type of the piece (QUEEN).
     """
+    __slots__ = ()
 
     def __init__(self, x: int, y: int, team: TeamType, is_white: bool):
         """
@@ -57,3 +59,15 @@ class Queen(Piece):
             return self._path_is_clear(px, py, x, y, board=chess_game.board, direction='diagonal')
 
         return False
+
+    def pseudo_legal_moves(self, chess_game: 'ChessGame') -> list[tuple[int, int]]:
+        """
+        Generates the squares the Queen can move to by sliding in straight lines and diagonally.
+
+        Args:
+            chess_game (ChessGame): The chess game being played.
+
+        Returns:
+            list[tuple[int, int]]: The (x, y) destination squares.
+        """
+        return self._sliding_moves(chess_game.board, LINEAR_DIRECTIONS + DIAGONAL_DIRECTIONS)
@@ -1,3 +1,5 @@
 from players.player import Player
+from players.search_player import SearchPlayer, SearchInfo
+from players.parallel_search_player import ParallelSearchPlayer
 
-__all__ = ['Player']
+__all__ = ['Player', 'SearchPlayer', 'SearchInfo', 'ParallelSearchPlayer']
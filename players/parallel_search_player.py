@@ -0,0 +1,239 @@
+import os
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+from pieces import Piece
+from players.search_player import SearchPlayer, SearchInfo, MATE_THRESHOLD, PROMOTION_CLASSES
+from engine.transposition_table import TranspositionTable, unpack_move
+from utils import TeamType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from engine import ChessGame
+    from engine.opening_book import OpeningBook
+    from engine.tablebase import Tablebases
+
+_helper = None
+"""The search player of a helper process, searching into the shared transposition table."""
+
+_helper_memory = None
+"""The shared memory block of the transposition table, as attached by a helper process."""
+
+
+class _HelperSearchPlayer(SearchPlayer):
+    """
+    The search player of a helper process. It searches the root moves in a rotated order, so that helpers
+    explore different parts of the tree first and fill the shared transposition table with different results.
+
+    Attributes:
+        root_offset (int): How many places the ordered root moves are rotated by.
+    """
+
+    def __init__(self, transposition_table: TranspositionTable, stop_event):
+        """
+        Initializes a helper search player on the shared transposition table.
+
+        Args:
+            transposition_table (TranspositionTable): The shared transposition table.
+            stop_event (multiprocessing.Event): The event that stops the helpers.
+        """
+        super().__init__(name='helper', team=TeamType.ALLY, transposition_table=transposition_table,
+                         stop_event=stop_event)
+        self.root_offset = 0
+
+    def _root_moves(self) -> list[tuple]:
+        """
+        Generates the moves of the root position, ordered as usual and then rotated by ``root_offset``.
+        """
+        moves = super()._root_moves()
+        if moves:
+            offset = self.root_offset % len(moves)
+            moves = moves[offset:] + moves[:offset]
+        return moves
+
+
+def _start_helper(memory_name: str, stop_event):
+    """
+    Sets up a helper process: attaches the shared transposition table and creates the helper's search player.
+
+    Args:
+        memory_name (str): The name of the shared memory block of the transposition table.
+        stop_event (multiprocessing.Event): The event that stops the helpers.
+    """
+    global _helper, _helper_memory
+    _helper_memory = SharedMemory(name=memory_name)
+    _helper = _HelperSearchPlayer(TranspositionTable(buffer=_helper_memory.buf), stop_event)
+
+
+def _helper_search(fen: str, position_counts: dict[int, int], max_depth: int, time_limit: Optional[float],
+                   node_limit: Optional[int], root_offset: int) -> tuple[int, int, int]:
+    """
+    Searches a position in a helper process.
+
+    Args:
+        fen (str): The position, in Forsyth-Edwards Notation.
+        position_counts (dict[int, int]): How many times each position occurred in the game so far, keyed by
+                                          Zobrist key, so that the helper scores repetitions as draws too.
+        max_depth (int): The deepest iteration to search.
+        time_limit (float or None): The time budget, in seconds.
+        node_limit (int or None): The node budget.
+        root_offset (int): How many places the ordered root moves are rotated by.
+
+    Returns:
+        tuple[int, int, int]: The deepest completed iteration, its score, and its best move packed with
+        ``pack_move`` (0 if there is none).
+    """
+    from engine.chess_game import ChessGame  # Imported here, as engine.chess_game itself imports the players
+
+    game = ChessGame.from_fen(fen)
+    game.status.position_counts = position_counts
+    _helper.max_depth = max_depth
+    _helper.time_limit = time_limit
+    _helper.node_limit = node_limit
+    _helper.root_offset = root_offset
+    move = _helper.search(game)
+    info = _helper.last_search
+    return info.depth, info.score, _helper._pack(move) if move is not None and info.depth > 0 else 0
+
+
+class ParallelSearchPlayer(SearchPlayer):
+    """
+    A computer player that searches with several processes at once, in the "lazy SMP" style.
+
+    Helper processes search the same position as the player itself, all of them sharing a single transposition
+    table in shared memory. Half of the helpers search one iteration deeper than the player, and each one tries
+    the root moves in a different order, so they spread over the tree and keep filling the table with results
+    the others can use: cutoffs and move ordering for the player's own search. When the player's search ends,
+    the deeper helpers are given the rest of the time budget to finish their iteration, then all the helpers are
+    stopped, and the move of the deepest completed iteration among all of them is played. Without a time limit,
+    the helpers are stopped as soon as the player's search ends, so a deeper helper's move is rarely played:
+    the helpers then only serve to fill the table.
+
+    Helpers receive the position as a FEN string along with the position history of the game, so they score
+    repetitions as draws just like the player's own search does.
+
+    The helper processes are started with the player and kept between moves. Call ``close`` to stop them and
+    free the shared table.
+
+    Attributes:
+        workers (int): The number of processes searching, the player's own included.
+    """
+
+    def __init__(self, name: str, team: TeamType, workers: Optional[int] = None, max_depth: int = 4,
+                 time_limit: Optional[float] = 2.0, node_limit: Optional[int] = None, verbose: bool = False,
+                 hash_size_mb: float = 64, opening_book: Optional['OpeningBook'] = None,
+                 tablebases: Optional['Tablebases'] = None):
+        """
+        Initializes a ParallelSearchPlayer and starts its helper processes.
+
+        Args:
+            name (str): The name of the player.
+            team (TeamType): The team that the player belongs to.
+            workers (int, optional): The number of processes searching, the player's own included. Defaults to
+                                     the number of CPUs.
+            max_depth (int): The deepest iteration the player searches. Defaults to 4.
+            time_limit (float or None): The time budget per move, in seconds. Defaults to 2 seconds.
+            node_limit (int or None): The node budget per move and per process. Defaults to None (no limit).
+            verbose (bool): Whether to print the search statistics after each iteration. Defaults to False.
+            hash_size_mb (float): The memory cap of the shared transposition table, in megabytes. Defaults to 64.
+            opening_book (OpeningBook, optional): An opening book to play from before searching. Defaults to None.
+            tablebases (Tablebases, optional): Endgame tablebases to play and score positions from. Defaults to None.
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._memory = SharedMemory(create=True, size=TranspositionTable.bytes_needed(hash_size_mb))
+        context = multiprocessing.get_context()
+        self._helpers_stop = context.Event()
+        super().__init__(name=name, team=team, max_depth=max_depth, time_limit=time_limit, node_limit=node_limit,
+                         verbose=verbose, transposition_table=TranspositionTable(buffer=self._memory.buf),
+                         opening_book=opening_book, tablebases=tablebases)
+        self._executor = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers - 1, mp_context=context,
+                                                 initializer=_start_helper,
+                                                 initargs=(self._memory.name, self._helpers_stop))
+
+    def search(self, game: 'ChessGame') -> Optional[tuple[Piece, int, int, Optional[type[Piece]]]]:
+        """
+        Searches the current position of the game with the helper processes, and returns the best move found.
+        The game is searched in place and left exactly as it was.
+
+        Args:
+            game (ChessGame): The chess game being played.
+
+        Returns:
+            tuple or None: The best move as (piece, x, y, promotion class or None), or None if there is no legal move.
+        """
+        if self._executor is None:
+            return super().search(game)
+
+        fen = game.fen()
+        position_counts = dict(game.status.position_counts)
+        self._helpers_stop.clear()
+        helpers = [self._executor.submit(_helper_search, fen, position_counts, self.max_depth + helper % 2,
+                                         self.time_limit, self.node_limit, helper)
+                   for helper in range(1, self.workers)]
+        try:
+            best_move = super().search(game)
+            if best_move is not None and not self._stopped and abs(self.last_search.score) < MATE_THRESHOLD:
+                self._wait_for_deeper_helpers(helpers[::2])  # Helpers 1, 3, 5... search one iteration deeper
+        finally:
+            self._helpers_stop.set()
+        wait(helpers)
+        if best_move is None:
+            return None
+
+        # Play a helper's move if it completed a deeper iteration than the player's own search
+        info = self.last_search
+        nodes = info.nodes
+        for helper in helpers:
+            depth, score, packed_move = helper.result()
+            if depth > info.depth and packed_move:
+                from_square, to_square, promotion = unpack_move(packed_move)
+                piece = game.board.piece_at(from_square % 8, from_square // 8)
+                move = (piece, to_square % 8, to_square // 8, PROMOTION_CLASSES[promotion - 1] if promotion else None)
+                if piece is not None and move in self._legal_moves_of(game):
+                    best_move = move
+                    info = SearchInfo(depth=depth, score=score, best_move=self._move_name(move))
+        self.last_search = SearchInfo(depth=info.depth, nodes=nodes, elapsed=self.last_search.elapsed,
+                                      score=info.score, best_move=info.best_move)
+        return best_move
+
+    def _wait_for_deeper_helpers(self, helpers: list):
+        """
+        Waits for the helpers searching one iteration deeper than the player to finish, until the player's time
+        budget is spent or it is asked to stop. Without a time limit, doesn't wait at all.
+
+        Args:
+            helpers (list[Future]): The searches of the deeper helpers.
+        """
+        while self._deadline is not None and not (self.stop_event is not None and self.stop_event.is_set()):
+            remaining = self._deadline - time.perf_counter()
+            # The wait is cut into short slices, so that a request to stop is noticed quickly
+            if remaining <= 0 or not wait(helpers, timeout=min(remaining, 0.05)).not_done:
+                break
+
+    def _legal_moves_of(self, game: 'ChessGame') -> list[tuple]:
+        """
+        Generates the legal moves of the player to move in a game, with one move per promotion piece.
+        """
+        self._game = game
+        try:
+            return self._legal_moves()
+        finally:
+            self._game = None
+
+    def close(self):
+        """
+        Stops the helper processes and frees the shared transposition table. The player can't search afterwards.
+        """
+        if self._executor is not None:
+            self._helpers_stop.set()
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._memory is not None:
+            self.transposition_table = None  # Release the views of the shared memory before closing it
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
@@ -27,6 +27,9 @@ class Player:
         # Player is assumed to be human unless specified
         self._is_human = is_human
 
+        # An event that asks a computer player to stop thinking and move now, for players that can stop early
+        self.stop_event = None
+
     @property
     def is_human(self) -> bool:
         return self._is_human
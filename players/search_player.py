@@ -0,0 +1,530 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+from pieces import Piece, Pawn, Queen, Rook, Bishop, Knight
+from players.player import Player
+from engine.transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND, pack_move
+from engine.tablebase import is_win, is_loss
+from utils import TeamType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from engine import ChessGame
+    from engine.opening_book import OpeningBook
+    from engine.tablebase import Tablebases
+
+MATE_SCORE = 100000
+"""The score of checkmating the opponent. Mates found closer to the root score slightly higher."""
+
+MATE_THRESHOLD = MATE_SCORE - 1000
+"""Scores beyond this are mate scores, which are stored in the transposition table relative to the position."""
+
+QUIESCENCE_EVASION_PLIES = 2
+"""How many plies into the quiescence search a player in check searches its moves out of check. Deeper, long
+chains of checking captures would make the search explode: a player in check there is only tested for mate."""
+
+PROMOTION_CLASSES = (Queen, Knight, Rook, Bishop)
+"""The pieces a pawn can promote to, in the order the search tries them."""
+
+
+@dataclass
+class SearchInfo:
+    """
+    A class used to report the result and statistics of a search.
+
+    Attributes:
+        depth (int): The deepest iteration that was completed.
+        nodes (int): The number of positions searched.
+        elapsed (float): The time the search took, in seconds.
+        score (int): The score of the best move, from the point of view of the player to move.
+        best_move (str): The best move, in long algebraic notation (e.g. 'e2e4'), or '' if there is none.
+    """
+    depth: int = 0
+    nodes: int = 0
+    elapsed: float = 0.0
+    score: int = 0
+    best_move: str = ''
+
+    @property
+    def nps(self) -> float:
+        """Returns the number of positions searched per second."""
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        return f"depth {self.depth} score {self.score} nodes {self.nodes} " \
+               f"time {self.elapsed:.3f}s nps {self.nps:.0f} move {self.best_move}"
+
+
+class SearchPlayer(Player):
+    """
+    A computer player that chooses its moves with a negamax alpha-beta search.
+
+    The search deepens iteratively (depth 1, 2, ...) until the maximum depth, the time budget or the node
+    budget is reached, and plays the best move of the deepest completed iteration. Leaf positions are
+    resolved with a capture-only quiescence search and scored by the board's incremental evaluation.
+    Search results are kept in a transposition table, which cuts off transpositions and orders the best move
+    of a position first. Positions found in the opening book, if the player has one, are not searched at all:
+    one of their book moves is played instead. Likewise, with endgame tablebases, positions with few enough
+    pieces are played perfectly from the tables, and the search scores the positions it reaches in them exactly.
+
+    Attributes:
+        max_depth (int): The deepest iteration to search.
+        time_limit (float or None): The time budget per move, in seconds, or None for no limit.
+        node_limit (int or None): The node budget per move, or None for no limit.
+        verbose (bool): Whether to print the search statistics after each iteration.
+        last_search (SearchInfo): The statistics of the last search.
+        transposition_table (TranspositionTable): The table of search results, kept between moves.
+        opening_book (OpeningBook or None): The opening book to play from before searching, if any.
+        tablebases (Tablebases or None): The endgame tablebases to play and score positions from, if any.
+        stop_event (threading.Event or multiprocessing.Event or None): An event that stops the search as soon as
+        it is set, if any. The best move of the deepest completed iteration is still returned.
+    """
+
+    def __init__(self, name: str, team: TeamType, max_depth: int = 4, time_limit: Optional[float] = 2.0,
+                 node_limit: Optional[int] = None, verbose: bool = False, hash_size_mb: float = 16,
+                 transposition_table: Optional[TranspositionTable] = None,
+                 opening_book: Optional['OpeningBook'] = None, tablebases: Optional['Tablebases'] = None,
+                 stop_event=None):
+        """
+        Initializes a SearchPlayer with a name, a team and its search limits.
+
+        Args:
+            name (str): The name of the player.
+            team (TeamType): The team that the player belongs to.
+            max_depth (int): The deepest iteration to search. Defaults to 4.
+            time_limit (float or None): The time budget per move, in seconds. Defaults to 2 seconds.
+            node_limit (int or None): The node budget per move. Defaults to None (no limit).
+            verbose (bool): Whether to print the search statistics after each iteration. Defaults to False.
+            hash_size_mb (float): The memory cap of the transposition table, in megabytes. Defaults to 16.
+            transposition_table (TranspositionTable, optional): A table to use instead of creating one.
+            opening_book (OpeningBook, optional): An opening book to play from before searching. Defaults to None.
+            tablebases (Tablebases, optional): Endgame tablebases to play and score positions from. Defaults to None.
+            stop_event (threading.Event or multiprocessing.Event, optional): An event that stops the search when
+                                                                             set. Defaults to None.
+        """
+        super().__init__(name=name, team=team, is_human=False)
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.verbose = verbose
+        self.last_search = SearchInfo()
+        if transposition_table is None:
+            transposition_table = TranspositionTable(hash_size_mb)
+        self.transposition_table = transposition_table
+        self.opening_book = opening_book
+        self.tablebases = tablebases
+        self.stop_event = stop_event
+
+        self._game = None
+        self._nodes = 0
+        self._deadline = None
+        self._stopped = False
+        self._path = []
+        self._repetitions = 0
+
+    def ai_choose_move(self, game: 'ChessGame') -> tuple[Piece, int, int, Piece]:
+        """
+        Returns a move from the opening book or the tablebases if the position is in them, or else searches the
+        current position and returns the best move found.
+
+        Args:
+            game (ChessGame): The chess game being played.
+
+        Returns:
+            tuple[Piece, int, int, Piece]: The piece to move, the destination x and y coordinates, and the piece
+            to promote to (or None). Returns (None, -1, -1, None) if there is no legal move.
+        """
+        move = self.opening_book.choose_move(game) if self.opening_book is not None else None
+        if move is None and self.tablebases is not None and len(game.board.pieces) <= self.tablebases.max_pieces:
+            move = self.tablebases.best_move(game)
+        if move is not None:
+            self.last_search = SearchInfo(best_move=self._move_name(move))
+        else:
+            move = self.search(game)
+        if move is None:
+            return None, -1, -1, None
+
+        piece, x, y, promotion_class = move
+        promotion_piece = None
+        if promotion_class is not None:
+            promotion_piece = promotion_class(x=x, y=y, team=piece.team, is_white=piece.is_white)
+        return piece, x, y, promotion_piece
+
+    def search(self, game: 'ChessGame') -> Optional[tuple[Piece, int, int, Optional[type[Piece]]]]:
+        """
+        Runs the iterative deepening search on the current position of the game.
+        The game is searched in place and left exactly as it was.
+
+        Args:
+            game (ChessGame): The chess game being played.
+
+        Returns:
+            tuple or None: The best move as (piece, x, y, promotion class or None), or None if there is no legal move.
+        """
+        self._game = game
+        self._nodes = 0
+        self._stopped = False
+        self._path = []
+        self._repetitions = 0
+        start = time.perf_counter()
+        self._deadline = start + self.time_limit if self.time_limit is not None else None
+        self.last_search = SearchInfo()
+
+        root_moves = self._root_moves()
+        if not root_moves:
+            return None
+
+        best_move = root_moves[0]
+        for depth in range(1, self.max_depth + 1):
+            repetitions = self._repetitions
+            score, move = self._search_root(root_moves, depth)
+            if self._stopped:
+                break
+
+            best_move = move
+            # Search the best move first in the next iteration
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if self._repetitions == repetitions:
+                self.transposition_table.store(game.board.zobrist_key, depth, self._score_to_table(score, 0), EXACT,
+                                               self._pack(move))
+
+            self.last_search = SearchInfo(depth=depth, nodes=self._nodes, elapsed=time.perf_counter() - start,
+                                          score=score, best_move=self._move_name(move))
+            if self.verbose:
+                print(self.last_search)
+            if abs(score) >= MATE_SCORE - self.max_depth:
+                break  # A forced mate was found, searching deeper won't change the move
+
+        self.last_search.nodes = self._nodes
+        self.last_search.elapsed = time.perf_counter() - start
+        self._game = None
+        return best_move
+
+    def _root_moves(self) -> list[tuple]:
+        """
+        Generates the moves of the root position, in the order the first iteration searches them.
+
+        Returns:
+            list[tuple]: The moves as (piece, x, y, promotion class or None), best first.
+        """
+        entry = self.transposition_table.probe(self._game.board.zobrist_key)
+        return self._ordered_moves(self._legal_moves(), hash_move=entry[3] if entry else 0)
+
+    def _search_root(self, moves: list, depth: int) -> tuple[int, tuple]:
+        """
+        Searches every root move to the given depth.
+
+        Args:
+            moves (list): The ordered root moves.
+            depth (int): The depth to search.
+
+        Returns:
+            tuple[int, tuple]: The best score and the best move.
+        """
+        alpha, beta = -MATE_SCORE - 1, MATE_SCORE + 1
+        best_move = moves[0]
+        self._path.append(self._game.board.zobrist_key)
+        for move in moves:
+            score = -self._play_and_search(move, depth - 1, -beta, -alpha, 1)
+            if self._stopped:
+                break
+            if score > alpha:
+                alpha, best_move = score, move
+        self._path.pop()
+        return alpha, best_move
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Searches the current position with alpha-beta pruning.
+
+        Args:
+            depth (int): The remaining depth.
+            alpha (int): The lower bound of the search window.
+            beta (int): The upper bound of the search window.
+            ply (int): The distance from the root.
+
+        Returns:
+            int: The score of the position, from the point of view of the player to move.
+        """
+        key = self._game.board.zobrist_key
+        if key in self._path or self._game.status.position_counts.get(key, 0) >= 2:
+            self._repetitions += 1
+            return 0  # Repeating a position of the search, or a third occurrence in the game, is a draw
+        if self._game.status.is_insufficient_material():
+            return 0
+        score = self._probe_tablebases(ply)
+        if score is not None:
+            return score
+
+        if depth <= 0:
+            return self._quiescence(alpha, beta, ply, depth)
+
+        original_alpha = alpha
+        hash_move = 0
+        entry = self.transposition_table.probe(key)
+        if entry is not None:
+            entry_depth, entry_score, bound, hash_move = entry
+            if entry_depth >= depth:
+                score = self._score_from_table(entry_score, ply)
+                if bound == EXACT:
+                    return max(alpha, min(score, beta))
+                if bound == LOWER_BOUND and score >= beta:
+                    return beta
+                if bound == UPPER_BOUND and score <= alpha:
+                    return alpha
+
+        moves = self._legal_moves()
+        if not moves:
+            if self._game.status.is_in_check(self._game.current_player.team):
+                return -MATE_SCORE + ply
+            return 0
+        if self._game.status.is_fifty_move_rule():
+            return 0
+
+        best_move = 0
+        repetitions = self._repetitions
+        self._path.append(key)
+        for move in self._ordered_moves(moves, hash_move):
+            score = -self._play_and_search(move, depth - 1, -beta, -alpha, ply + 1)
+            if self._stopped:
+                break
+            if score >= beta:
+                alpha = beta
+                best_move = self._pack(move)
+                break
+            if score > alpha:
+                alpha = score
+                best_move = self._pack(move)
+        self._path.pop()
+
+        # A score that depends on a repetition depends on the path to the position, so it isn't stored
+        if not self._stopped and self._repetitions == repetitions:
+            if alpha >= beta:
+                bound = LOWER_BOUND
+            elif alpha > original_alpha:
+                bound = EXACT
+            else:
+                bound = UPPER_BOUND
+            self.transposition_table.store(key, depth, self._score_to_table(alpha, ply), bound, best_move)
+        return alpha
+
+    def _quiescence(self, alpha: int, beta: int, ply: int, depth: int = 0) -> int:
+        """
+        Searches captures and promotions only, until the position is quiet, so that leaf positions
+        aren't scored in the middle of an exchange.
+
+        A player in check can't stand pat on the static score: every move out of check is searched instead
+        (in the first ``QUIESCENCE_EVASION_PLIES`` plies), and a player with none is checkmated.
+
+        Args:
+            alpha (int): The lower bound of the search window.
+            beta (int): The upper bound of the search window.
+            ply (int): The distance from the root.
+            depth (int): The remaining depth, 0 or less: minus the number of plies searched in quiescence so far.
+
+        Returns:
+            int: The score of the position, from the point of view of the player to move.
+        """
+        score = self._probe_tablebases(ply)
+        if score is not None:
+            return score
+
+        game = self._game
+        team = game.current_player.team
+        in_check = game.move_generator.is_in_check(team)
+        if in_check and depth > -QUIESCENCE_EVASION_PLIES:
+            moves = self._legal_moves()
+            if not moves:
+                return -MATE_SCORE + ply
+        else:
+            if in_check and not game.move_generator.has_any_legal_move(team):
+                return -MATE_SCORE + ply
+            stand_pat = self._evaluate()
+            if stand_pat >= beta:
+                return beta
+            alpha = max(alpha, stand_pat)
+            moves = self._legal_moves(tactical_only=True)
+
+        for move in self._ordered_moves(moves):
+            score = -self._play_and_search(move, depth - 1, -beta, -alpha, ply + 1)
+            if self._stopped:
+                break
+            if score >= beta:
+                return beta
+            alpha = max(alpha, score)
+        return alpha
+
+    def _play_and_search(self, move: tuple, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Plays a move, searches the resulting position and takes the move back.
+
+        Args:
+            move (tuple): The move as (piece, x, y, promotion class or None).
+            depth (int): The remaining depth after the move.
+            alpha (int): The lower bound of the search window.
+            beta (int): The upper bound of the search window.
+            ply (int): The distance from the root after the move.
+
+        Returns:
+            int: The score of the resulting position, from the point of view of the player who moves next.
+        """
+        self._nodes += 1
+        if self._nodes & 255 == 0:
+            self._check_limits()
+
+        game = self._game
+        piece, x, y, promotion_class = move
+        promotion_piece = None
+        if promotion_class is not None:
+            promotion_piece = promotion_class(x=x, y=y, team=piece.team, is_white=piece.is_white)
+
+        record = game.engine.make_move(piece, x, y, promotion_piece)
+        game.switch_player()
+        score = self._negamax(depth, alpha, beta, ply) if depth > 0 else self._quiescence(alpha, beta, ply, depth)
+        game.switch_player()
+        game.engine.unmake_move(record)
+        return score
+
+    def _check_limits(self):
+        """
+        Stops the search once its time or node budget is spent, or when it is asked to stop.
+        """
+        if self.stop_event is not None and self.stop_event.is_set():
+            self._stopped = True
+        elif self.node_limit is not None and self._nodes >= self.node_limit:
+            self._stopped = True
+        elif self._deadline is not None and time.perf_counter() >= self._deadline:
+            self._stopped = True
+
+    def _legal_moves(self, tactical_only: bool = False) -> list[tuple]:
+        """
+        Generates the legal moves of the player to move, with one move per promotion piece.
+
+        Args:
+            tactical_only (bool): Whether to generate captures and promotions only. Defaults to False.
+
+        Returns:
+            list[tuple]: The moves as (piece, x, y, promotion class or None).
+        """
+        move_generator = self._game.move_generator
+        team = self._game.current_player.team
+        moves = []
+        for piece, (x, y) in (move_generator.tactical_moves(team) if tactical_only else
+                              move_generator.team_legal_moves(team)):
+            if isinstance(piece, Pawn) and y == (0 if piece.team == TeamType.ALLY else 7):
+                moves.extend((piece, x, y, promotion_class) for promotion_class in PROMOTION_CLASSES)
+            else:
+                moves.append((piece, x, y, None))
+        return moves
+
+    def _ordered_moves(self, moves: list[tuple], hash_move: int = 0) -> list[tuple]:
+        """
+        Orders moves so that the most promising are searched first: the best move stored in the transposition
+        table, promotions, then captures of the most valuable victim by the least valuable attacker, then
+        quiet moves.
+
+        Args:
+            moves (list[tuple]): The moves as (piece, x, y, promotion class or None).
+            hash_move (int): The packed best move from the transposition table, or 0 if there is none.
+
+        Returns:
+            list[tuple]: The ordered moves.
+        """
+        board = self._game.board
+
+        def priority(move: tuple) -> int:
+            piece, x, y, promotion_class = move
+            if hash_move and self._pack(move) == hash_move:
+                return 100000
+            score = 0
+            if promotion_class is Queen:
+                score += 10000
+            victim = board.piece_at(x, y)
+            if victim is not None:
+                score += 10 * abs(victim.value) - abs(piece.value)
+            return score
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def _evaluate(self) -> int:
+        """
+        Scores the current position by material and piece placement, tapered between the middlegame
+        and the endgame. The board keeps the evaluation up to date as moves are made, so this is constant time.
+
+        Returns:
+            int: The score in centipawns, from the point of view of the player to move.
+        """
+        score = self._game.board.evaluation.score
+        return score if self._game.current_player.team == TeamType.ALLY else -score
+
+    @staticmethod
+    def _pack(move: tuple) -> int:
+        """
+        Packs a move for the transposition table.
+
+        Args:
+            move (tuple): The move as (piece, x, y, promotion class or None).
+
+        Returns:
+            int: The packed move.
+        """
+        piece, x, y, promotion_class = move
+        promotion = PROMOTION_CLASSES.index(promotion_class) + 1 if promotion_class is not None else 0
+        return pack_move(piece.y * 8 + piece.x, y * 8 + x, promotion)
+
+    def _probe_tablebases(self, ply: int) -> Optional[int]:
+        """
+        Scores the current position from the tablebases, with the same mate scores as the search uses.
+
+        Args:
+            ply (int): The distance from the root.
+
+        Returns:
+            int or None: The score of the position, from the point of view of the player to move, or None if the
+            position isn't in the tablebases.
+        """
+        if self.tablebases is None or len(self._game.board.pieces) > self.tablebases.max_pieces:
+            return None
+        value = self.tablebases.probe(self._game)
+        if value is None:
+            return None
+        if is_win(value):
+            return MATE_SCORE - ply - (value - 1)
+        if is_loss(value):
+            return -MATE_SCORE + ply + (value - 1)
+        return 0
+
+    @staticmethod
+    def _score_to_table(score: int, ply: int) -> int:
+        """
+        Converts a mate score from "mate in n plies from the root" to "mate in n plies from this position",
+        so the stored score is valid wherever the position is reached.
+        """
+        if score > MATE_THRESHOLD:
+            return score + ply
+        if score < -MATE_THRESHOLD:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_table(score: int, ply: int) -> int:
+        """
+        Converts a mate score stored in the transposition table back to a score relative to the root.
+        """
+        if score > MATE_THRESHOLD:
+            return score - ply
+        if score < -MATE_THRESHOLD:
+            return score + ply
+        return score
+
+    @staticmethod
+    def _move_name(move: tuple) -> str:
+        """
+        Returns a move in long algebraic notation (e.g. 'e2e4', 'e7e8q').
+        """
+        piece, x, y, promotion_class = move
+        name = f"{chr(piece.x + 97)}{8 - piece.y}{chr(x + 97)}{8 - y}"
+        if promotion_class is not None:
+            name += {Queen: 'q', Rook: 'r', Bishop: 'b', Knight: 'n'}[promotion_class]
+        return name
@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from engine.chess_game import ChessGame
+
+
+def _random_game(fen: str, seed: str, plies: int = 60) -> ChessGame:
+    random.seed(seed)
+    chess_game = ChessGame.from_fen(fen)
+    for _ in range(plies):
+        moves = chess_game.move_generator.current_team_legal_moves()
+        if not moves:
+            break
+        piece, (x, y) = random.choice(moves)
+        chess_game.make_move(piece, x, y)
+        chess_game.switch_player()
+    return chess_game
+
+
+def _play(chess_game: ChessGame, *moves: str):
+    for move in moves:
+        piece = chess_game.board.piece_at(ord(move[0]) - 97, 8 - int(move[1]))
+        assert chess_game.make_move(piece, ord(move[2]) - 97, 8 - int(move[3]))
+        chess_game.switch_player()
+
+
+@pytest.fixture
+def play():
+    """Plays moves given as from and to squares, e.g. play(chess_game, 'e2e4', 'e7e5')."""
+    return _play
+
+
+@pytest.fixture
+def random_game():
+    """Plays random legal moves from a position, e.g. random_game(fen, seed='kiwipete', plies=60)."""
+    return _random_game
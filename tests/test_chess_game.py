@@ -0,0 +1,31 @@
+from engine.chess_game import ChessGame, START_FEN
+from players import SearchPlayer
+from utils.type import TeamType
+
+
+def test_play_ai_move_plays_a_move_chosen_on_a_copy():
+    chess_game = ChessGame.from_fen(START_FEN)
+    copy = chess_game.copy()
+    player = SearchPlayer('search', TeamType.ALLY, max_depth=2, time_limit=None)
+    piece, x, y, promotion_piece = move = player.ai_choose_move(copy)
+    assert piece is not chess_game.board.piece_at(piece.x, piece.y)  # The piece of the copy
+    start = (piece.x, piece.y)
+
+    assert chess_game.play_ai_move(move)
+    assert chess_game.board.piece_at(*start) is None
+    assert chess_game.board.piece_at(x, y) is not None
+    assert copy.fen() == START_FEN
+
+
+def test_play_ai_move_without_a_move():
+    chess_game = ChessGame.from_fen(START_FEN)
+    assert not chess_game.play_ai_move((None, -1, -1, None))
+    assert chess_game.fen() == START_FEN
+
+
+def test_play_ai_move_rejects_a_stale_move(play):
+    chess_game = ChessGame.from_fen(START_FEN)
+    copy = chess_game.copy()
+    play(chess_game, 'e2e4', 'e7e5')
+    pawn = copy.board.piece_at(4, 6)  # Still on e2 in the copy
+    assert not chess_game.play_ai_move((pawn, 4, 4, None))
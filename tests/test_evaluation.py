@@ -0,0 +1,59 @@
+import random
+
+from engine.chess_game import ChessGame
+from engine.evaluation import Evaluation
+from engine.perft import REFERENCE_POSITIONS
+from pieces import Bishop, Knight, Queen, Rook
+from utils.type import PieceType
+
+
+def evaluation_from_scratch(chess_game: ChessGame) -> tuple[int, int, int, int]:
+    evaluation = Evaluation()
+    for piece in chess_game.board.pieces:
+        evaluation.add(piece, piece.y * 8 + piece.x)
+    return evaluation.middlegame, evaluation.endgame, evaluation.phase, evaluation.score
+
+
+def incremental_evaluation(chess_game: ChessGame) -> tuple[int, int, int, int]:
+    evaluation = chess_game.board.evaluation
+    return evaluation.middlegame, evaluation.endgame, evaluation.phase, evaluation.score
+
+
+def test_incremental_evaluation_matches_evaluation_from_scratch():
+    random.seed('evaluation')
+    seen = set()
+    for fen, _ in REFERENCE_POSITIONS.values():
+        for _ in range(5):
+            chess_game = ChessGame.from_fen(fen)
+            engine = chess_game.engine
+            records = []
+            for _ in range(60):
+                moves = chess_game.move_generator.current_team_legal_moves()
+                if not moves:
+                    break
+                en_passant_captures = [(piece, (x, y)) for piece, (x, y) in moves
+                                       if piece.type == PieceType.PAWN and x != piece.x and
+                                       chess_game.board.piece_at(x, y) is None]
+                piece, (x, y) = random.choice(en_passant_captures or moves)  # En passant is rare otherwise
+                promotion = None
+                if piece.type == PieceType.PAWN:
+                    if y in (0, 7):
+                        promotion = random.choice([Queen, Rook, Bishop, Knight])(
+                            x=x, y=y, team=piece.team, is_white=piece.is_white)
+                        seen.add('promotion')
+                    elif x != piece.x and chess_game.board.piece_at(x, y) is None:
+                        seen.add('en passant')
+                if piece.type == PieceType.KING and abs(x - piece.x) == 2:
+                    seen.add('castling')
+                if chess_game.board.piece_at(x, y) is not None:
+                    seen.add('capture')
+                records.append(engine.make_move(piece, x, y, promotion))
+                chess_game.switch_player()
+                assert incremental_evaluation(chess_game) == evaluation_from_scratch(chess_game)
+
+            for record in reversed(records):
+                engine.unmake_move(record)
+                chess_game.switch_player()
+                assert incremental_evaluation(chess_game) == evaluation_from_scratch(chess_game)
+            assert chess_game.fen() == fen
+    assert seen == {'capture', 'castling', 'en passant', 'promotion'}
@@ -0,0 +1,36 @@
+import pytest
+
+from engine.chess_game import ChessGame, START_FEN
+from engine.perft import REFERENCE_POSITIONS
+
+FENS = [fen for fen, _ in REFERENCE_POSITIONS.values()] + [
+    'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1',
+    'rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 3',
+    '4k3/8/8/8/8/8/8/4K2R b K - 12 40',
+]
+
+
+@pytest.mark.parametrize('fen', FENS)
+def test_round_trip(fen):
+    assert ChessGame.from_fen(fen).fen() == fen
+
+
+def test_fen_follows_moves(play):
+    chess_game = ChessGame.from_fen(START_FEN)
+    play(chess_game, 'e2e4')
+    assert chess_game.fen() == 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1'
+    play(chess_game, 'g8f6', 'g1f3')
+    assert chess_game.fen() == 'rnbqkb1r/pppppppp/5n2/8/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 2 2'
+
+
+@pytest.mark.parametrize('fen', [
+    '8/8/8 w - - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1',
+    'rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+    'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e4 0 1',  # Not behind the pawn
+    'rnbqkbnr/pppppppp/8/8/4P3/4N3/PPPP1PPP/RNBQKB1R b KQkq e3 0 1',  # The square it skipped is taken
+    'rnbqkbnr/pppppppp/8/8/4P3/8/PPPPNPPP/RNBQKB1R b KQkq e3 0 1',  # Its starting square is taken
+])
+def test_invalid_fen_raises(fen):
+    with pytest.raises(ValueError):
+        ChessGame.from_fen(fen)
@@ -0,0 +1,61 @@
+import pytest
+
+from engine.chess_game import ChessGame
+from engine.game_event import GameEvent
+from utils.type import TeamType
+
+
+@pytest.mark.parametrize('fen, is_draw', [
+    ('k7/8/8/8/8/8/8/7K w - - 0 1', True),  # KvK
+    ('k7/8/8/8/8/8/8/5B1K w - - 0 1', True),  # KBvK
+    ('k7/8/8/8/8/8/8/6NK w - - 0 1', True),  # KNvK
+    ('k1b5/8/8/8/8/8/8/1B5K w - - 0 1', True),  # Bishops on light squares only
+    ('k1b5/8/8/8/8/8/8/2B4K w - - 0 1', False),  # Bishops on squares of both colors
+    ('k7/8/8/8/8/8/8/5NNK w - - 0 1', False),
+    ('k7/8/8/8/8/8/8/4B1NK w - - 0 1', False),
+    ('k7/8/8/8/8/8/7P/7K w - - 0 1', False),
+    ('k7/8/8/8/8/8/8/6RK w - - 0 1', False),
+])
+def test_insufficient_material(fen, is_draw):
+    assert ChessGame.from_fen(fen).status.is_insufficient_material() == is_draw
+
+
+@pytest.mark.parametrize('move, clock', [
+    ('b1c3', 11),  # A knight move
+    ('e2e4', 0),  # A pawn move
+    ('a1a8', 0),  # A capture
+])
+def test_halfmove_clock(move, clock):
+    fen = 'r3k3/8/8/8/8/8/4P3/RN2K3 w - - 10 20'
+    chess_game = ChessGame.from_fen(fen)
+    engine = chess_game.engine
+    piece = chess_game.board.piece_at(ord(move[0]) - 97, 8 - int(move[1]))
+    record = engine.make_move(piece, ord(move[2]) - 97, 8 - int(move[3]))
+    assert engine.halfmove_clock == clock
+    engine.unmake_move(record)
+    assert engine.halfmove_clock == 10
+    assert chess_game.fen() == fen
+
+
+def test_fifty_move_rule_ends_the_game(play):
+    chess_game = ChessGame.from_fen('k7/8/8/8/8/8/8/R6K w - - 98 80')
+    play(chess_game, 'a1a2')
+    assert not chess_game.is_game_over()
+    play(chess_game, 'a8b8')
+    assert chess_game.status.is_fifty_move_rule()
+    assert GameEvent.FIFTY_MOVE_RULE in chess_game.get_state(TeamType.OPPONENT)
+    assert chess_game.state == GameEvent.FIFTY_MOVE_RULE
+    assert chess_game.is_game_over()
+
+
+def test_checkmate_on_the_hundredth_ply_is_not_a_draw(play):
+    chess_game = ChessGame.from_fen('k7/8/1K6/8/8/8/8/7R w - - 99 80')
+    play(chess_game, 'h1h8')
+    assert chess_game.state == GameEvent.CHECKMATE
+
+
+def test_capturing_the_last_piece_ends_the_game(play):
+    chess_game = ChessGame.from_fen('k7/8/8/8/8/8/6r1/7K w - - 0 1')
+    play(chess_game, 'h1g2')
+    assert chess_game.state == GameEvent.INSUFFICIENT_MATERIAL
+    assert chess_game.is_game_over()
@@ -0,0 +1,50 @@
+import pytest
+
+from engine.chess_game import ChessGame, START_FEN
+from engine.opening_book import OpeningBook, build_book, decode_book_move
+
+GAMES = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 1-0
+
+[Result "0-1"]
+
+1. e4 c5 0-1
+
+[Result "1/2-1/2"]
+
+1. d4 d5 1/2-1/2
+"""
+
+
+@pytest.fixture
+def book(tmp_path):
+    pgn_path = tmp_path / 'games.pgn'
+    pgn_path.write_text(GAMES)
+    build_book([str(pgn_path)], str(tmp_path / 'book.bin'))
+    with OpeningBook(str(tmp_path / 'book.bin')) as book:
+        yield book
+
+
+def book_moves(book: OpeningBook, chess_game: ChessGame) -> dict[tuple[int, int, int, int], int]:
+    moves = {}
+    for entry in book.entries(chess_game.board.zobrist_key):
+        piece, x, y, _ = decode_book_move(chess_game, entry.move)
+        moves[piece.x, piece.y, x, y] = entry.weight
+    return moves
+
+
+def test_moves_are_weighted_by_results(book, play):
+    chess_game = ChessGame.from_fen(START_FEN)
+    assert book_moves(book, chess_game) == {(4, 6, 4, 4): 2, (3, 6, 3, 4): 1}
+    play(chess_game, 'e2e4')
+    assert book_moves(book, chess_game) == {(2, 1, 2, 3): 2}  # 1... e5 lost, so only 1... c5 is kept
+
+
+def test_choose_move(book, play):
+    chess_game = ChessGame.from_fen(START_FEN)
+    play(chess_game, 'e2e4', 'e7e5')
+    piece, x, y, promotion = book.choose_move(chess_game)
+    assert (piece.x, piece.y, x, y, promotion) == (6, 7, 5, 5, None)
+    play(chess_game, 'g1f3')
+    assert book.choose_move(chess_game) is None
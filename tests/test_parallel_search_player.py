@@ -0,0 +1,21 @@
+from engine.chess_game import ChessGame
+from engine.perft import REFERENCE_POSITIONS
+from players import ParallelSearchPlayer
+from players.search_player import MATE_SCORE
+
+
+def test_plays_a_legal_move_and_finds_mates():
+    chess_game = ChessGame.from_fen(REFERENCE_POSITIONS['kiwipete'][0])
+    player = ParallelSearchPlayer('parallel', chess_game.current_player.team, workers=3, max_depth=1,
+                                  time_limit=5, hash_size_mb=1)
+    try:
+        piece, x, y, _ = player.search(chess_game)
+        assert (x, y) in chess_game.move_generator.piece_legal_moves(piece)
+        assert player.last_search.depth >= 1
+
+        chess_game = ChessGame.from_fen('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+        player.search(chess_game)
+        assert player.last_search.best_move == 'a1a8'
+        assert player.last_search.score == MATE_SCORE - 1
+    finally:
+        player.close()
@@ -0,0 +1,53 @@
+import pytest
+
+from engine.bitboard import piece_set_index
+from engine.perft import REFERENCE_POSITIONS, new_game, perft
+
+
+@pytest.mark.parametrize('use_bitboards', [False, True], ids=['pieces', 'bitboards'])
+@pytest.mark.parametrize('name', list(REFERENCE_POSITIONS))
+def test_reference_positions_to_depth_2(name, use_bitboards):
+    fen, expected_counts = REFERENCE_POSITIONS[name]
+    chess_game = new_game(fen, use_bitboards)
+    assert [perft(chess_game, depth) for depth in (1, 2)] == expected_counts[:2]
+
+
+@pytest.mark.parametrize('use_bitboards', [False, True], ids=['pieces', 'bitboards'])
+@pytest.mark.parametrize('name', ['start', 'kiwipete'])
+def test_depth_3(name, use_bitboards):
+    fen, expected_counts = REFERENCE_POSITIONS[name]
+    chess_game = new_game(fen, use_bitboards)
+    assert perft(chess_game, 3) == expected_counts[2]
+    assert chess_game.fen() == fen  # Every move was taken back
+
+
+@pytest.mark.parametrize('name', list(REFERENCE_POSITIONS))
+def test_backends_generate_the_same_moves(name):
+    fen, _ = REFERENCE_POSITIONS[name]
+    moves = []
+    for use_bitboards in (False, True):
+        chess_game = new_game(fen, use_bitboards)
+        moves.append(sorted(((piece.x, piece.y), move)
+                            for piece, move in chess_game.move_generator.current_team_legal_moves()))
+    assert moves[0] == moves[1]
+
+
+@pytest.mark.parametrize('name', list(REFERENCE_POSITIONS))
+def test_board_piece_sets_follow_moves(name):
+    fen, _ = REFERENCE_POSITIONS[name]
+    chess_game = new_game(fen)
+    board, engine = chess_game.board, chess_game.engine
+
+    def expected_piece_sets():
+        piece_sets = [0] * 12
+        for piece in board.pieces:
+            piece_sets[piece_set_index(piece)] |= 1 << (piece.y * 8 + piece.x)
+        return piece_sets
+
+    original = list(board.piece_sets)
+    assert original == expected_piece_sets()
+    for piece, (x, y) in chess_game.move_generator.current_team_legal_moves():
+        record = engine.make_move(piece, x, y)
+        assert board.piece_sets == expected_piece_sets()
+        engine.unmake_move(record)
+        assert board.piece_sets == original
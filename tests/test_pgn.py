@@ -0,0 +1,32 @@
+import pytest
+
+from engine.chess_game import ChessGame, START_FEN
+from engine.perft import REFERENCE_POSITIONS
+from engine.pgn import read_games, replay_game, san_moves, write_game
+
+
+@pytest.mark.parametrize('name', list(REFERENCE_POSITIONS))
+@pytest.mark.parametrize('validate', [True, False])
+def test_round_trip(name, validate, random_game):
+    chess_game = random_game(REFERENCE_POSITIONS[name][0], name)
+    pgn_game, = read_games(write_game(chess_game).splitlines())
+    assert pgn_game.moves == san_moves(chess_game)
+    assert replay_game(pgn_game, validate).fen() == chess_game.fen()
+
+
+def test_scholars_mate(play):
+    chess_game = ChessGame.from_fen(START_FEN)
+    play(chess_game, 'e2e4', 'e7e5', 'f1c4', 'b8c6', 'd1h5', 'g8f6', 'h5f7')
+    pgn = write_game(chess_game, {'Event': 'Test'})
+    assert '[Event "Test"]' in pgn
+    assert '[Result "1-0"]' in pgn
+    assert pgn.endswith('1. e4 e5 2. Bc4 Nc6 3. Qh5 Nf6 4. Qxf7# 1-0\n\n')
+    pgn_game, = read_games(pgn.splitlines())
+    assert pgn_game.headers['Event'] == 'Test'
+    assert pgn_game.result == '1-0'
+
+
+def test_illegal_move_raises():
+    pgn_game, = read_games(['1. e4 e5 2. Ke3 *'])
+    with pytest.raises(ValueError):
+        replay_game(pgn_game)
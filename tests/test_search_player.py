@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from engine.chess_game import ChessGame
+from engine.perft import REFERENCE_POSITIONS, new_game
+from players.search_player import SearchPlayer, MATE_SCORE
+
+MATES_IN_ONE = {
+    'back rank': ('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1', 'a1a8'),
+    'rook and king': ('k7/8/1K6/8/8/8/8/7R w - - 0 1', 'h1h8'),
+    'black back rank': ('r5k1/8/8/8/8/8/5PPP/6K1 b - - 0 1', 'a8a1'),
+    'smothered': ('6rk/6pp/8/6N1/8/8/8/6K1 w - - 0 1', 'g5f7'),
+}
+
+
+@pytest.mark.parametrize('name', list(MATES_IN_ONE))
+def test_finds_mate_in_one_at_depth_1(name):
+    fen, mate = MATES_IN_ONE[name]
+    chess_game = ChessGame.from_fen(fen)
+    player = SearchPlayer('search', chess_game.current_player.team, max_depth=1, time_limit=None)
+    player.search(chess_game)
+    assert player.last_search.best_move == mate
+    assert player.last_search.score == MATE_SCORE - 1
+    assert chess_game.fen() == fen
+
+
+def test_search_leaves_the_game_unchanged():
+    fen = REFERENCE_POSITIONS['kiwipete'][0]
+    chess_game = ChessGame.from_fen(fen)
+    player = SearchPlayer('search', chess_game.current_player.team, max_depth=2, time_limit=None)
+    assert player.search(chess_game) is not None
+    assert chess_game.fen() == fen
+    assert player.last_search.depth == 2
+
+
+@pytest.mark.parametrize('use_bitboards', [False, True], ids=['pieces', 'bitboards'])
+@pytest.mark.parametrize('name', list(REFERENCE_POSITIONS))
+def test_tactical_moves_are_the_legal_captures_and_promotions(name, use_bitboards):
+    chess_game = new_game(REFERENCE_POSITIONS[name][0], use_bitboards)
+    move_generator = chess_game.move_generator
+    team = chess_game.current_player.team
+    expected = [(piece, move) for piece, move in move_generator.team_legal_moves(team)
+                if move_generator.is_tactical(piece, *move)]
+    assert sorted(((piece.x, piece.y), move) for piece, move in move_generator.tactical_moves(team)) == \
+        sorted(((piece.x, piece.y), move) for piece, move in expected)
+
+
+def test_stop_event_set_before_the_search():
+    fen = REFERENCE_POSITIONS['kiwipete'][0]
+    chess_game = ChessGame.from_fen(fen)
+    stop_event = threading.Event()
+    stop_event.set()
+    player = SearchPlayer('search', chess_game.current_player.team, max_depth=8, time_limit=None,
+                          stop_event=stop_event)
+    piece, x, y, _ = player.ai_choose_move(chess_game)
+    assert (x, y) in chess_game.move_generator.piece_legal_moves(piece)
+    assert player.last_search.depth == 0
+    assert chess_game.fen() == fen
+
+
+# After 1. Qc6 Kb4 2. Qa6, black's only move Kc5 repeats the starting position
+REPETITION_FEN = '8/8/Q7/2k5/8/8/1K6/8 w - - 0 1'
+REPETITION_CYCLE = ('a6c6', 'c5b4', 'c6a6', 'b4c5')
+
+
+def test_position_seen_once_before_is_not_a_draw(play):
+    chess_game = ChessGame.from_fen(REPETITION_FEN)
+    play(chess_game, *REPETITION_CYCLE[:3])
+    player = SearchPlayer('search', chess_game.current_player.team, max_depth=2, time_limit=None)
+    player.search(chess_game)
+    assert player.last_search.score < -500  # Black is a queen down, not drawing
+
+
+def test_third_occurrence_is_a_draw(play):
+    chess_game = ChessGame.from_fen(REPETITION_FEN)
+    play(chess_game, *REPETITION_CYCLE, *REPETITION_CYCLE[:3])
+    player = SearchPlayer('search', chess_game.current_player.team, max_depth=2, time_limit=None)
+    player.search(chess_game)
+    assert player.last_search.score == 0
+
+
+def test_repetition_scores_are_not_stored(play):
+    chess_game = ChessGame.from_fen(REPETITION_FEN)
+    play(chess_game, 'a6a8', 'c5d4', 'a8a6', 'd4c5')  # The starting position occurs twice, by another route
+    play(chess_game, *REPETITION_CYCLE[:2])
+    player = SearchPlayer('search', chess_game.current_player.team, max_depth=3, time_limit=None)
+    player.search(chess_game)
+    play(chess_game, REPETITION_CYCLE[2])
+    # The third iteration searched this position to depth 2, where its only move repeats the starting position
+    # a third time: a draw on this path only. The first two iterations reached it with less depth left.
+    entry = player.transposition_table.probe(chess_game.board.zobrist_key)
+    assert entry is None or entry[0] < 2
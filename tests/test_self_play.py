@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from engine.pgn import read_games, replay_game
+from engine.self_play import make_player, play_game, run
+from players import SearchPlayer
+from utils.type import TeamType
+
+SEARCH = 'search:depth=1,time=none'
+
+
+def test_same_seed_plays_the_same_game():
+    first = play_game(0, 'random', SEARCH, seed=7, max_plies=30)
+    second = play_game(0, 'random', SEARCH, seed=7, max_plies=30)
+    assert first['pgn'] == second['pgn']
+    assert play_game(0, 'random', SEARCH, seed=8, max_plies=30)['pgn'] != first['pgn']
+
+
+def test_move_cap():
+    record = play_game(0, 'random', 'random', seed=0, max_plies=12)
+    assert record['termination'] == 'move cap'
+    assert record['plies'] == 12
+    assert record['result'] == '*'
+    assert len(record['move_times']) == 12
+
+
+def test_make_player():
+    player = make_player('search:depth=2,time=none,nodes=500', 'black', TeamType.OPPONENT)
+    assert isinstance(player, SearchPlayer)
+    assert (player.max_depth, player.time_limit) == (2, None)
+    with pytest.raises(ValueError):
+        make_player('search:speed=3', 'white', TeamType.ALLY)
+    with pytest.raises(ValueError):
+        make_player('minimax', 'white', TeamType.ALLY)
+
+
+def test_run_streams_records_and_games(tmp_path):
+    output, pgn_output = tmp_path / 'games.jsonl', tmp_path / 'games.pgn'
+    results = run(3, 'random', SEARCH, str(output), workers=1, seed=5, max_plies=16, pgn_output=str(pgn_output))
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(record['game'] for record in records) == [0, 1, 2]
+    assert [record['seed'] for record in records] == [5 + record['game'] for record in records]
+    assert sum(results.values()) == 3
+
+    pgn_games = list(read_games(str(pgn_output)))
+    assert [pgn_game.headers['Round'] for pgn_game in pgn_games] == [str(record['game'] + 1) for record in records]
+    for pgn_game, record in zip(pgn_games, records):
+        assert len(pgn_game.moves) == record['plies']
+        assert pgn_game.result == record['result']
+        assert len(replay_game(pgn_game).move_history) == record['plies']
@@ -0,0 +1,27 @@
+import sys
+
+import pytest
+
+from engine.game_event import GameEvent
+
+pytest.importorskip('tkinter')  # The ui package loads tkinter
+from ui.sound_player import NullSoundPlayer, create_sound_player  # noqa: E402
+
+
+def test_disabled_sound_never_loads_pygame(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'pygame', raising=False)
+    monkeypatch.delitem(sys.modules, 'pygame.mixer', raising=False)
+    sound_player = create_sound_player(enabled=False)
+    assert isinstance(sound_player, NullSoundPlayer)
+    sound_player.handle_event(GameEvent.MOVE)
+    assert 'pygame' not in sys.modules
+
+
+def test_missing_pygame_falls_back_to_no_sound(monkeypatch, capsys):
+    # A None entry makes the import raise ImportError, as if pygame wasn't installed
+    monkeypatch.setitem(sys.modules, 'pygame', None)
+    monkeypatch.setitem(sys.modules, 'pygame.mixer', None)
+    sound_player = create_sound_player()
+    assert isinstance(sound_player, NullSoundPlayer)
+    assert capsys.readouterr().out.startswith('Sound disabled:')
+    sound_player.handle_event(GameEvent.CHECKMATE)
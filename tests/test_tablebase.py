@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from engine.chess_game import ChessGame
+from engine.tablebase import DRAW, ILLEGAL, Tablebases, generate, is_loss, is_win, parse_signature
+from players.search_player import SearchPlayer, MATE_SCORE
+from pieces import Bishop, Knight, Queen, Rook
+from utils.type import PieceType
+
+LETTERS = 'pnbrqk'
+SAMPLED_SIGNATURES = ['KQvK', 'KRvK', 'KPvK']
+
+
+@pytest.fixture(scope='module')
+def directory(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('tablebases'))
+    generate(SAMPLED_SIGNATURES, directory)
+    return directory
+
+
+@pytest.fixture(scope='module')
+def tablebases(directory):
+    return Tablebases(directory)
+
+
+def read_table(directory: str, signature: str) -> bytes:
+    with open(f"{directory}/{signature}.tb", 'rb') as file:
+        return file.read()
+
+
+def table_fen(signature: str, index: int) -> str:
+    pieces = parse_signature(signature)
+    board = [['1'] * 8 for _ in range(8)]
+    for color, kind in reversed(pieces):
+        index, square = divmod(index, 64)
+        letter = LETTERS[kind]
+        board[square // 8][square % 8] = letter if color else letter.upper()
+    placement = '/'.join(''.join(rank) for rank in board)
+    for run in range(8, 1, -1):
+        placement = placement.replace('1' * run, str(run))
+    return f"{placement} {'b' if index else 'w'} - - 0 1"
+
+
+def sample(table: bytes, count: int, seed: str, values=None) -> list[int]:
+    random.seed(seed)
+    indexes = [index for index, value in enumerate(table)
+               if value != ILLEGAL and (values is None or value in values)]
+    return random.sample(indexes, min(count, len(indexes)))
+
+
+def value_from_moves(tablebases: Tablebases, chess_game: ChessGame) -> int:
+    """Works the value of a position out from the values of the positions its legal moves lead to."""
+    analysis = chess_game.status.analyze(chess_game.current_player.team)
+    if not analysis.legal_moves:
+        return 1 if analysis.is_in_check else DRAW
+    engine = chess_game.engine
+    values = []
+    for piece, (x, y) in analysis.legal_moves:
+        promotions = [Queen, Rook, Bishop, Knight] if piece.type == PieceType.PAWN and y in (0, 7) else [None]
+        for promotion in promotions:
+            promotion_piece = promotion(x=x, y=y, team=piece.team, is_white=piece.is_white) if promotion else None
+            record = engine.make_move(piece, x, y, promotion_piece)
+            chess_game.switch_player()
+            value = tablebases.probe(chess_game)
+            if value is None:  # After a double pawn push, which a lone king can't capture en passant
+                fields = chess_game.fen().split()
+                fields[3] = '-'
+                value = tablebases.probe(ChessGame.from_fen(' '.join(fields)))
+            values.append(value)
+            chess_game.switch_player()
+            engine.unmake_move(record)
+    losses = [value for value in values if is_loss(value)]
+    if losses:
+        return min(losses) + 1
+    if all(is_win(value) for value in values):
+        return max(values) + 1
+    return DRAW
+
+
+def test_kqvk_longest_mate_is_20_plies(directory):
+    table = read_table(directory, 'KQvK')
+    assert max(value - 1 for value in table if is_win(value)) == 19
+    assert max(value - 1 for value in table if is_loss(value)) == 20
+
+
+@pytest.mark.parametrize('signature', SAMPLED_SIGNATURES)
+def test_sampled_entries_agree_with_the_game_rules(directory, tablebases, signature):
+    table = read_table(directory, signature)
+    for index in sample(table, 200, signature):
+        chess_game = ChessGame.from_fen(table_fen(signature, index))
+        analysis = chess_game.status.analyze(chess_game.current_player.team)
+        assert tablebases.probe(chess_game) == table[index]
+        assert analysis.is_checkmate == (table[index] == 1)
+        if analysis.is_stalemate:
+            assert table[index] == DRAW
+        assert value_from_moves(tablebases, chess_game) == table[index], chess_game.fen()
+
+
+@pytest.mark.parametrize('signature', SAMPLED_SIGNATURES)
+def test_sampled_mates_agree_with_the_search(directory, signature):
+    table = read_table(directory, signature)
+    for index in sample(table, 10, signature, values=(2, 3, 4)):
+        chess_game = ChessGame.from_fen(table_fen(signature, index))
+        plies = table[index] - 1
+        player = SearchPlayer('search', chess_game.current_player.team, max_depth=plies, time_limit=None)
+        player.search(chess_game)
+        expected = MATE_SCORE - plies if is_win(table[index]) else -MATE_SCORE + plies
+        assert player.last_search.score == expected, chess_game.fen()
+
+
+def test_probe_checkmate(tablebases):
+    chess_game = ChessGame.from_fen('k7/1Q6/1K6/8/8/8/8/8 b - - 0 1')
+    assert tablebases.probe(chess_game) == 1
+
+
+def test_best_move_mates_in_one(tablebases):
+    chess_game = ChessGame.from_fen('k7/8/1K6/8/8/8/8/2Q5 w - - 0 1')
+    assert tablebases.probe(chess_game) == 2
+    piece, x, y, _ = tablebases.best_move(chess_game)
+    assert chess_game.make_move(piece, x, y)
+    chess_game.switch_player()
+    assert tablebases.probe(chess_game) == 1
+
+
+def test_probe_ignores_positions_without_a_table(tablebases):
+    assert tablebases.probe(ChessGame.from_fen('k7/8/1K6/8/8/8/r7/2Q5 w - - 0 1')) is None
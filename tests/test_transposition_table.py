@@ -0,0 +1,86 @@
+import pytest
+
+from engine.transposition_table import (BUCKET_WORDS, EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable,
+                                        pack_move, unpack_move)
+
+NUM_BUCKETS = 4
+KEY = 0x123456789ABCDEF0
+"""A position key; KEY + n * NUM_BUCKETS falls into the same bucket."""
+
+
+@pytest.fixture
+def buffer():
+    return bytearray(NUM_BUCKETS * BUCKET_WORDS * 8)
+
+
+@pytest.fixture
+def table(buffer):
+    return TranspositionTable(buffer=buffer)
+
+
+def test_size():
+    assert TranspositionTable(size_mb=1).num_buckets == 1024 * 1024 // (BUCKET_WORDS * 8)
+    assert TranspositionTable.bytes_needed(1) == 1024 * 1024
+    with pytest.raises(ValueError):
+        TranspositionTable(buffer=bytearray(8))
+
+
+def test_pack_move():
+    assert unpack_move(pack_move(52, 36)) == (52, 36, 0)
+    assert unpack_move(pack_move(8, 0, 4)) == (8, 0, 4)
+
+
+def test_store_and_probe(table):
+    table.store(KEY, 5, -123, LOWER_BOUND, pack_move(52, 36))
+    assert table.probe(KEY) == (5, -123, LOWER_BOUND, pack_move(52, 36))
+    table.store(KEY, 2, 40, UPPER_BOUND)
+    assert table.probe(KEY) == (2, 40, UPPER_BOUND, 0)  # The same position is always replaced
+
+
+def test_shallower_entry_goes_to_the_always_replace_slot(table):
+    deep, shallow, newer = KEY, KEY + NUM_BUCKETS, KEY + 2 * NUM_BUCKETS
+    table.store(deep, 6, 10, EXACT)
+    table.store(shallow, 2, 20, EXACT)
+    assert table.probe(deep) == (6, 10, EXACT, 0)
+    assert table.probe(shallow) == (2, 20, EXACT, 0)
+    table.store(newer, 1, 30, EXACT)  # Replaces the shallow entry, never the deep one
+    assert table.probe(deep) == (6, 10, EXACT, 0)
+    assert table.probe(shallow) is None
+    assert table.probe(newer) == (1, 30, EXACT, 0)
+
+
+def test_deeper_entry_moves_the_evicted_entry_to_the_always_replace_slot(table):
+    table.store(KEY, 3, 10, EXACT)
+    table.store(KEY + NUM_BUCKETS, 4, 20, EXACT)
+    assert table.probe(KEY) == (3, 10, EXACT, 0)
+    assert table.probe(KEY + NUM_BUCKETS) == (4, 20, EXACT, 0)
+
+
+def test_corrupted_entry_is_rejected(buffer, table):
+    table.store(KEY, 5, 10, EXACT)
+    words = memoryview(buffer).cast('Q')
+    index = (KEY % NUM_BUCKETS) * BUCKET_WORDS
+    words[index + 1] ^= 1  # The data word of a torn write, which no longer matches the key word
+    assert table.probe(KEY) is None
+
+
+def test_colliding_key_is_rejected(table):
+    table.store(KEY, 5, 10, EXACT)
+    assert table.probe(KEY + NUM_BUCKETS) is None
+    assert table.probe(KEY ^ 1 << 40) is None
+
+
+def test_counters(table):
+    assert table.probe(KEY) is None
+    assert (table.hits, table.misses, table.collisions) == (0, 1, 0)
+    table.store(KEY, 5, 10, EXACT)
+    table.probe(KEY)
+    assert (table.hits, table.misses, table.collisions) == (1, 1, 0)
+    table.probe(KEY + NUM_BUCKETS)  # A miss in a bucket holding another position
+    assert (table.hits, table.misses, table.collisions) == (1, 2, 1)
+    table.probe(KEY + 1)  # A miss in an empty bucket
+    assert (table.hits, table.misses, table.collisions) == (1, 3, 1)
+    table.clear()
+    assert (table.hits, table.misses, table.collisions) == (0, 0, 0)
+    assert table.probe(KEY) is None
+    assert table.hashfull() == 0
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from engine.chess_game import ChessGame, START_FEN
+from engine.game_event import GameEvent
+from engine.perft import REFERENCE_POSITIONS
+from engine.zobrist import position_key
+from utils.type import TeamType
+
+
+def key_from_scratch(chess_game: ChessGame) -> int:
+    return position_key(chess_game.board, chess_game.engine.last_move,
+                        chess_game.current_player.team == TeamType.ALLY)
+
+
+@pytest.mark.parametrize('name', list(REFERENCE_POSITIONS))
+def test_incremental_key_matches_key_from_scratch(name):
+    random.seed(name)
+    chess_game = ChessGame.from_fen(REFERENCE_POSITIONS[name][0])
+    for _ in range(40):
+        moves = chess_game.move_generator.current_team_legal_moves()
+        if not moves:
+            break
+        piece, (x, y) = random.choice(moves)
+        chess_game.make_move(piece, x, y)
+        chess_game.switch_player()
+        assert chess_game.board.zobrist_key == key_from_scratch(chess_game)
+
+
+def test_double_push_without_en_passant_capture_keeps_the_key(play):
+    chess_game = ChessGame.from_fen(START_FEN)
+    play(chess_game, 'e2e4')
+    without_en_passant = ChessGame.from_fen('rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1')
+    assert chess_game.board.zobrist_key == without_en_passant.board.zobrist_key
+
+
+def test_possible_en_passant_capture_changes_the_key():
+    with_en_passant = ChessGame.from_fen('rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3')
+    without_en_passant = ChessGame.from_fen('rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq - 0 3')
+    assert with_en_passant.board.zobrist_key != without_en_passant.board.zobrist_key
+
+
+def test_illegal_en_passant_capture_keeps_the_key():
+    # Taking on c6 would leave the white king on a5 in check from the rook on h5
+    pinned = ChessGame.from_fen('8/8/8/KPp4r/8/8/8/7k w - c6 0 1')
+    without_en_passant = ChessGame.from_fen('8/8/8/KPp4r/8/8/8/7k w - - 0 1')
+    assert pinned.board.zobrist_key == without_en_passant.board.zobrist_key
+
+
+def test_repetition_after_a_double_push_is_detected(play):
+    chess_game = ChessGame.from_fen(START_FEN)
+    play(chess_game, 'e2e4', 'g8f6', 'g1f3', 'f6g8', 'f3g1', 'g8f6', 'g1f3', 'f6g8')
+    assert chess_game.state == GameEvent.ONGOING
+    play(chess_game, 'f3g1')
+    assert chess_game.state == GameEvent.THREEFOLD_REPETITION
@@ -1,6 +1,6 @@
 from ui.chess_ui import ChessUI
 from ui.click_handler import ClickHandler
 from ui.promotion_ui import PromotionUI
-from ui.sound_player import SoundPlayer
+from ui.sound_player import SoundPlayer, NullSoundPlayer, create_sound_player
 
-__all__ = ['ChessUI', 'ClickHandler', 'PromotionUI', 'SoundPlayer']
+__all__ = ['ChessUI', 'ClickHandler', 'PromotionUI', 'SoundPlayer', 'NullSoundPlayer', 'create_sound_player']
@@ -1,4 +1,6 @@
+import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from pieces import Piece
 from ui.click_handler import ClickHandler
 from typing import TYPE_CHECKING
@@ -9,6 +11,9 @@ if TYPE_CHECKING:
 WHITE_IMAGES = 'images/white/'
 BLACK_IMAGES = 'images/black/'
 SCREEN_WIDTH = 900
+STATUS_BAR_HEIGHT = 40
+AI_POLL_INTERVAL = 50
+"""How often the window checks whether the computer player has found its move, in milliseconds."""
 
 
 class ChessUI:
@@ -21,27 +26,43 @@ class ChessUI:
         root (Tk): The root Tkinter instance.
         canvas (Canvas): The Tkinter canvas to draw the game on.
         images (dict): Dictionary mapping piece symbols to their corresponding image files.
+        sound (bool): Whether the game plays sound effects.
         first_click (tuple): The coordinates of the first click, or None if no click has been made yet.
         selected_piece (Piece): The currently selected chess piece, or None if no piece is selected.
         legal_moves (list): List of all current legal moves.
         click_handler (ClickHandler): Instance of the click handler to manage click events.
+        promotion_ui (PromotionUI): The promotion piece selection in progress, or None.
+        status_label (Label): The status bar text, showing when the computer player is thinking.
+        move_now_button (Button): The status bar button that makes the computer player move right away.
+        ai_stop_event (threading.Event): The event that stops the computer player's current turn, or None if the
+                                         computer player isn't thinking.
     """
 
-    def __init__(self, chess_game: 'ChessGame'):
+    def __init__(self, chess_game: 'ChessGame', sound: bool = True):
         """
         Initializes the ChessUI with a given chess game, sets up the game window,
         and binds mouse click events to the click handler.
 
         Args:
             chess_game (ChessGame): The chess game being played.
+            sound (bool): Whether to play sound effects. Defaults to True.
         """
         self.game = chess_game
+        self.sound = sound
 
         # Initialize screen
         self.root = tk.Tk()
         self.canvas = tk.Canvas(self.root, width=SCREEN_WIDTH, height=SCREEN_WIDTH)
         self.canvas.pack()
 
+        # Status bar, showing when the computer player is thinking
+        status_bar = tk.Frame(self.root, height=STATUS_BAR_HEIGHT)
+        status_bar.pack(fill=tk.X)
+        self.status_label = tk.Label(status_bar, text="")
+        self.status_label.pack(side=tk.LEFT, padx=50)
+        self.move_now_button = tk.Button(status_bar, text="Move now", state=tk.DISABLED, command=self.move_now)
+        self.move_now_button.pack(side=tk.RIGHT, padx=50)
+
         # Set the window icon and title
         self.root.iconbitmap('images/ico/chess-icon.ico')
         self.root.title("Chess")
@@ -52,13 +73,75 @@ class ChessUI:
         # Load images
         self.images = self.__load_images()
 
+        # The canvas items of the board, created once and then updated in place
+        self._squares = {}
+        self._highlighted = set()
+        self._piece_items = {}
+        self.draw_labels()
+
         # Event handling
         self.first_click = None
         self.selected_piece = None
         self.legal_moves = []
+        self.promotion_ui = None
         self.click_handler = ClickHandler(self)
         self.canvas.bind("<Button-1>", self.click_handler.handle_click)
 
+        # Computer players think in a background thread, so that the window stays responsive meanwhile
+        self.ai_stop_event = None
+        self._ai_executor = ThreadPoolExecutor(max_workers=1)
+        self._ai_move = None
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+    @property
+    def is_ai_thinking(self) -> bool:
+        """
+        Whether a computer player is currently choosing its move.
+        """
+        return self._ai_move is not None
+
+    def start_ai_turn(self):
+        """
+        Starts the turn of the computer player to move. The player chooses its move on a copy of the game, in a
+        background thread, while the window shows that it is thinking and offers to make it move right away.
+        The move is played once found, from the Tkinter event loop (see ``wait_for_ai_move``).
+        """
+        player = self.game.current_player
+        self.ai_stop_event = threading.Event()
+        player.stop_event = self.ai_stop_event
+        self._ai_move = self._ai_executor.submit(player.ai_choose_move, self.game.copy())
+
+        self.status_label.config(text=f"{player.name} is thinking...")
+        self.move_now_button.config(state=tk.NORMAL)
+        self.root.after(AI_POLL_INTERVAL, self.wait_for_ai_move)
+
+    def wait_for_ai_move(self):
+        """
+        Continually check if the computer player has found its move. Once it has, play it and pass the turn on,
+        otherwise, check again after ``AI_POLL_INTERVAL`` milliseconds.
+        """
+        if not self._ai_move.done():
+            self.root.after(AI_POLL_INTERVAL, self.wait_for_ai_move)
+            return
+
+        move = self._ai_move.result()
+        self._ai_move = None
+        self.ai_stop_event = None
+        self.status_label.config(text="")
+        self.move_now_button.config(state=tk.DISABLED)
+
+        if self.game.play_ai_move(move):
+            self.game.next_turn()
+        else:
+            self.game.announce_result()
+
+    def move_now(self):
+        """
+        Makes the thinking computer player stop and play the best move it has found so far.
+        """
+        if self.ai_stop_event is not None:
+            self.ai_stop_event.set()
+
     def calculate_legal_moves(self, piece: Piece):
         """
         Calculates the legal moves for a given piece and updates the game board accordingly.
@@ -92,37 +175,80 @@ class ChessUI:
             images[symbol.lower()] = tk.PhotoImage(file=f'{BLACK_IMAGES}{piece}.png')
         return images
 
+    @staticmethod
+    def square_color(x: int, y: int, highlighted: bool = False) -> str:
+        """
+        Returns the color of a board square.
+
+        Args:
+            x (int): The x-coordinate of the square.
+            y (int): The y-coordinate of the square.
+            highlighted (bool): Whether the square is highlighted as a legal move. Defaults to False.
+
+        Returns:
+            str: The color of the square.
+        """
+        if highlighted:
+            return "#00ff00"  # Highlight with green color for legal moves
+        return "#deb887" if (x + y) % 2 == 0 else "#4d3222"
+
     def draw_board(self):
         """
-        Draws the chess board on the canvas, alternating the square colors.
-        If there are any legal moves for a selected piece, the squares of these moves are highlighted green.
+        Draws the chess board on the canvas, alternating the square colors, and highlights the squares of the
+        legal moves of the selected piece green.
+
+        The squares are only created on the first call. Afterwards, only the squares whose highlight changed
+        since the last call are recolored.
         """
-        for i in range(8):
-            for j in range(8):
-                x1 = i * 100 + 50
-                y1 = j * 100 + 50
-                x2 = x1 + 100
-                y2 = y1 + 100
-                color = "#deb887" if (i + j) % 2 == 0 else "#4d3222"
-                if (i, j) in self.legal_moves:
-                    color = "#00ff00"  # Highlight with green color for legal moves
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color)
+        if not self._squares:
+            for i in range(8):
+                for j in range(8):
+                    x1 = i * 100 + 50
+                    y1 = j * 100 + 50
+                    x2 = x1 + 100
+                    y2 = y1 + 100
+                    self._squares[(i, j)] = self.canvas.create_rectangle(x1, y1, x2, y2,
+                                                                         fill=self.square_color(i, j))
+
+        highlighted = set(self.legal_moves)
+        for square in highlighted ^ self._highlighted:
+            self.canvas.itemconfig(self._squares[square], fill=self.square_color(*square, square in highlighted))
+        self._highlighted = highlighted
 
     def draw_pieces(self):
         """
-        Iterates through all chess pieces on the game board and draws them on the canvas at their respective locations.
+        Brings the piece images on the canvas in line with the pieces on the game board.
+
+        Every piece keeps its canvas image between calls: the image of a piece that moved is moved, the image
+        of a piece that left the board is deleted, and only pieces new to the board (after a promotion or a new
+        position) get a new image.
         """
+        drawn = self._piece_items
+        self._piece_items = {}
         for piece in self.game.board:
-            if piece is not None:
-                x = (piece.x + 0.5) * 100 + 50
-                y = (piece.y + 0.5) * 100 + 50
-                image = self.images.get(piece.symbol)
-                if image is not None:
-                    self.canvas.create_image(x, y, image=image, anchor=tk.CENTER)
+            image = self.images.get(piece.symbol)
+            if image is None:
+                continue
+            x = (piece.x + 0.5) * 100 + 50
+            y = (piece.y + 0.5) * 100 + 50
+            entry = drawn.pop(id(piece), None)
+            if entry is None:
+                item = self.canvas.create_image(x, y, image=image, anchor=tk.CENTER)
+            else:
+                _, item, drawn_x, drawn_y = entry
+                if (drawn_x, drawn_y) != (x, y):
+                    self.canvas.coords(item, x, y)
+            # The piece is kept with its image, so that its id can't be reused by a new piece meanwhile
+            self._piece_items[id(piece)] = (piece, item, x, y)
+
+        # The pieces left over are no longer on the board
+        for _, item, _, _ in drawn.values():
+            self.canvas.delete(item)
 
     def draw_labels(self):
         """
-        Draws labels for the chess board columns (A-H) and rows (1-8) on the canvas.
+        Draws labels for the chess board columns (A-H) and rows (1-8) on the canvas. The labels never change,
+        so they are only drawn once, with the window.
         """
         labels = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
         for i in range(8):
@@ -148,21 +274,29 @@ class ChessUI:
         x_coordinate = (screen_width / 2) - (SCREEN_WIDTH / 2)
         y_coordinate = (screen_height / 2) - (SCREEN_WIDTH / 1.95)
 
-        self.root.geometry("%dx%d+%d+%d" % (SCREEN_WIDTH, SCREEN_WIDTH, x_coordinate, y_coordinate))
+        self.root.geometry("%dx%d+%d+%d" % (SCREEN_WIDTH, SCREEN_WIDTH + STATUS_BAR_HEIGHT, x_coordinate, y_coordinate))
 
     def update(self):
         """
-        Updates the chess board and pieces by deleting all canvas content and redrawing the board,
-        pieces, and labels.
+        Updates the chess board and pieces on the canvas. Only what changed since the last update is redrawn:
+        the highlighted squares and the pieces that moved, left or joined the board.
         """
-        self.canvas.delete("all")
         self.draw_board()
         self.draw_pieces()
-        self.draw_labels()
 
     def run(self):
         """
         Starts the Tkinter event loop, which waits for user interaction until the game window is closed.
         """
         self.update()
+        if not self.game.current_player.is_human:
+            self.root.after_idle(self.start_ai_turn)  # The computer player plays first
         self.root.mainloop()
+
+    def close(self):
+        """
+        Closes the game window, stopping the computer player if it is thinking.
+        """
+        self.move_now()
+        self._ai_executor.shutdown(wait=False)
+        self.root.destroy()
@@ -1,6 +1,6 @@
 import tkinter as tk
 from ui.promotion_ui import PromotionUI
-from ui.sound_player import SoundPlayer
+from ui.sound_player import create_sound_player
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -30,7 +30,7 @@ class ClickHandler:
         self.notifier = chess_ui.game.game_event_notifier
 
         # Create and subscribe a sound player to the notifier
-        sound_player = SoundPlayer()
+        sound_player = create_sound_player(chess_ui.sound)
         self.notifier.subscribe(sound_player)
 
     def handle_click(self, event: tk.Event):
@@ -46,6 +46,11 @@ class ClickHandler:
         """
         chess_ui = self.chess_ui
 
+        # Ignore clicks while a promotion piece is being chosen or a computer player is to move (it is thinking
+        # in the background)
+        if chess_ui.promotion_ui is not None or not chess_ui.game.current_player.is_human:
+            return
+
         if chess_ui.first_click is None:
             x = (event.x - 50) // 100
             y = (event.y - 50) // 100
@@ -72,16 +77,17 @@ class ClickHandler:
                 # Notifies subscribers of the most important game event
                 self.notifier.notify(main_event)
 
-                # Handle promotion selection with UI display if the current player is human
-                if chess_ui.game.status.was_pawn_recently_promoted() and player_moved.is_human:
-                    PromotionUI(chess_ui=chess_ui, pawn=piece)
-
                 chess_ui.selected_piece = None
                 chess_ui.legal_moves = []
                 chess_ui.update()
-                
-                # After human player makes a move, call next_turn to update the current player and handle subsequent actions.
-                chess_ui.game.next_turn()
+
+                # Handle promotion selection with UI display if the current player is human: the turn is passed
+                # on once the piece has been chosen
+                if chess_ui.game.status.was_pawn_recently_promoted() and player_moved.is_human:
+                    chess_ui.promotion_ui = PromotionUI(chess_ui=chess_ui, pawn=piece)
+                else:
+                    # After human player makes a move, call next_turn to update the current player and handle subsequent actions.
+                    chess_ui.game.next_turn()
             else:
                 # Deselect the piece if the clicked square is not a legal move
                 chess_ui.selected_piece = None
@@ -107,7 +107,7 @@ class PromotionUI:
         """
         Continually check if a promotion selection has been made.
 
-        If a selection is made, promote the pawn and update the game status,
+        If a selection is made, promote the pawn, update the game status and pass the turn on,
         otherwise, continue checking every 100ms.
 
         Args:
@@ -122,3 +122,5 @@ class PromotionUI:
             self.chess_ui.game.engine.promote_from_ui(pawn, promotion_piece)  # promote the pawn
             self.notifier.notify(GameEvent.PROMOTION)  # promotion event notification
             self.chess_ui.update()  # update immediately after promotion
+            self.chess_ui.promotion_ui = None
+            self.chess_ui.game.next_turn()  # the turn ends once the promotion piece is chosen
@@ -1,17 +1,35 @@
-from pygame import mixer
+from typing import Union
 from engine.game_event import GameEvent
 
 
 class SoundPlayer:
     """
     Plays sound effects corresponding to different events in the chess game.
+
+    Every sound effect is decoded once, when the sound player is created, and has a mixer channel of its own:
+    playing a sound doesn't read or decode anything and doesn't block, and different sounds can overlap
+    without cutting each other off.
+
+    pygame is only imported and initialized when a sound player is created. Use ``NullSoundPlayer`` (or
+    ``create_sound_player``) to run the game without sound.
     """
 
     def __init__(self):
         """
-        Initialize the sound player by starting the pygame mixer.
+        Initialize the sound player by starting the pygame mixer, loading every sound effect and reserving a
+        mixer channel for each of them.
+
+        Raises:
+            pygame.error: If the mixer can't be started, e.g. on a machine without an audio device.
         """
+        from pygame import mixer
+
         mixer.init()
+        sound_paths = sorted({self.get_sound_path(event) for event in GameEvent})
+        mixer.set_num_channels(max(mixer.get_num_channels(), len(sound_paths)))
+        mixer.set_reserved(len(sound_paths))  # Keep the channels of the sound effects for them alone
+        self._sounds = {path: mixer.Sound(path) for path in sound_paths}
+        self._channels = {path: mixer.Channel(channel) for channel, path in enumerate(sound_paths)}
 
     def handle_event(self, event):
         """
@@ -58,16 +76,52 @@ class SoundPlayer:
                 return "sounds/check.mp3"
             case GameEvent.CHECKMATE:
                 return "sounds/checkmate.mp3"
+            case GameEvent.STALEMATE | GameEvent.THREEFOLD_REPETITION | GameEvent.FIFTY_MOVE_RULE | \
+                    GameEvent.INSUFFICIENT_MATERIAL:
+                return "sounds/stalemate.mp3"
             case _:
                 return "sounds/move.mp3"
 
-    @staticmethod
-    def play_sound(sound_path: str):
+    def play_sound(self, sound_path: str):
+        """
+        Play a sound effect on its own channel, without waiting for it to finish. A sound effect played again
+        while it is still playing starts over.
+
+        Args:
+            sound_path (str): The path to the sound file, as returned by ``get_sound_path``.
+        """
+        self._channels[sound_path].play(self._sounds[sound_path])
+
+
+class NullSoundPlayer:
+    """
+    A sound player that plays nothing, for games without sound (e.g. headless or test runs). It never imports
+    or initializes pygame.
+    """
+
+    def handle_event(self, event):
         """
-        Load and play a sound from the provided file path.
+        Ignore a game event.
 
         Args:
-            sound_path (str): The path to the sound file.
+            event (GameEvent): The game event.
         """
-        mixer.music.load(sound_path)
-        mixer.music.play()
+
+
+def create_sound_player(enabled: bool = True) -> Union[SoundPlayer, NullSoundPlayer]:
+    """
+    Creates the sound player of a game.
+
+    Args:
+        enabled (bool): Whether the game plays sound effects. Defaults to True.
+
+    Returns:
+        SoundPlayer or NullSoundPlayer: A sound player, or a null sound player if sound is disabled, pygame isn't
+        installed or no audio device could be opened.
+    """
+    if enabled:
+        try:
+            return SoundPlayer()
+        except (ImportError, RuntimeError) as error:  # pygame.error is raised when the mixer can't be started
+            print(f"Sound disabled: {error}")
+    return NullSoundPlayer()